@@ -1,13 +1,64 @@
 # Local
 from .config import (
+    ASYNC_DB,
+    BATCH_MAX_WORKERS,
+    BREEDING_MAX_ROWS,
+    BULK_LOAD_THRESHOLD,
+    CACHE_ENABLED,
+    CACHE_MAX_BYTES,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL,
+    CATALOG_REFRESH,
+    CATALOG_TTL,
+    COMPACT_DTYPES,
+    CONVERSION_ENGINE,
+    CONVERSION_MAX_CONCURRENT,
+    CONVERSION_MAX_QUEUED,
+    EXTRACT_CHUNK_SIZE,
+    JOB_HEARTBEAT_TTL,
+    JOB_TTL,
+    JOB_WORKERS,
+    LOAD_CHUNK_SIZE,
+    LOG_CONSOLE_LEVEL,
+    LOG_FILE_LEVEL,
+    LOG_LEVEL,
+    LOG_QUEUE_SIZE,
+    MAX_BIND_PARAMS,
+    MEMORY_BUDGET_ROWS,
+    PARTITIONED,
+    PIPELINE_CHUNK_BREEDINGS,
+    PIPELINE_SAVE_QUEUE,
+    PIPELINE_TRANSFORM_QUEUE,
     POSTGRES_DATABASE,
+    POSTGRES_MAX_OVERFLOW,
     POSTGRES_PASSWORD,
+    POSTGRES_POOL_PRE_PING,
+    POSTGRES_POOL_RECYCLE,
+    POSTGRES_POOL_SIZE,
+    POSTGRES_POOL_TIMEOUT,
     POSTGRES_SERVER,
     POSTGRES_USER,
     PROJECT_NAME,
+    REDIS_URL,
+    RESPONSE_CHUNK_SIZE,
+    SAVE_MODE,
+    SHARD_COUNT,
+    SHARD_LEASE_TTL,
+    SHARD_WAIT,
+    SLOW_QUERY_LOG_SIZE,
+    SLOW_QUERY_MS,
+    SPILL_DIR,
+    SPILL_PARTITION_ROWS,
+    SQL_ECHO,
+    TRANSFORM_PROFILE,
+    TRANSFORM_STREAMING_ROWS,
     VERSION,
+    WEIGHTS_VIEW_ENABLED,
+    WEIGHTS_VIEW_MAX_AGE,
+    WEIGHTS_VIEW_REFRESH,
+    WEIGHTS_VIEW_TENANTS,
 )
-from .logger import LOGGER_NAME, create_logger
+from .logger import LOGGER_NAME, create_logger, get_dropped_logs
 
 
 LOGGER = create_logger(logger_name=LOGGER_NAME, handlers=["console", "file"])
@@ -16,10 +67,62 @@ __all__ = [
     "LOGGER",
     "LOGGER_NAME",
     "create_logger",
+    "get_dropped_logs",
+    "ASYNC_DB",
+    "BATCH_MAX_WORKERS",
+    "BREEDING_MAX_ROWS",
+    "BULK_LOAD_THRESHOLD",
+    "CACHE_ENABLED",
+    "CACHE_MAX_BYTES",
+    "CACHE_MAX_ENTRIES",
+    "CACHE_TTL",
+    "CATALOG_REFRESH",
+    "CATALOG_TTL",
+    "COMPACT_DTYPES",
+    "CONVERSION_ENGINE",
+    "CONVERSION_MAX_CONCURRENT",
+    "CONVERSION_MAX_QUEUED",
+    "EXTRACT_CHUNK_SIZE",
+    "JOB_HEARTBEAT_TTL",
+    "JOB_TTL",
+    "JOB_WORKERS",
+    "LOAD_CHUNK_SIZE",
+    "LOG_CONSOLE_LEVEL",
+    "LOG_FILE_LEVEL",
+    "LOG_LEVEL",
+    "LOG_QUEUE_SIZE",
+    "MAX_BIND_PARAMS",
+    "MEMORY_BUDGET_ROWS",
+    "PARTITIONED",
+    "PIPELINE_CHUNK_BREEDINGS",
+    "PIPELINE_SAVE_QUEUE",
+    "PIPELINE_TRANSFORM_QUEUE",
     "POSTGRES_DATABASE",
+    "POSTGRES_MAX_OVERFLOW",
     "POSTGRES_PASSWORD",
+    "POSTGRES_POOL_PRE_PING",
+    "POSTGRES_POOL_RECYCLE",
+    "POSTGRES_POOL_SIZE",
+    "POSTGRES_POOL_TIMEOUT",
     "POSTGRES_SERVER",
     "POSTGRES_USER",
     "PROJECT_NAME",
+    "REDIS_URL",
+    "RESPONSE_CHUNK_SIZE",
+    "SAVE_MODE",
+    "SHARD_COUNT",
+    "SHARD_LEASE_TTL",
+    "SHARD_WAIT",
+    "SLOW_QUERY_LOG_SIZE",
+    "SLOW_QUERY_MS",
+    "SPILL_DIR",
+    "SPILL_PARTITION_ROWS",
+    "SQL_ECHO",
+    "TRANSFORM_PROFILE",
+    "TRANSFORM_STREAMING_ROWS",
     "VERSION",
+    "WEIGHTS_VIEW_ENABLED",
+    "WEIGHTS_VIEW_MAX_AGE",
+    "WEIGHTS_VIEW_REFRESH",
+    "WEIGHTS_VIEW_TENANTS",
 ]
@@ -8,6 +8,93 @@ POSTGRES_USER = os.getenv("POSTGRES_USER")
 POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
 POSTGRES_DATABASE = os.getenv("POSTGRES_DATABASE")
 
+# Connection pool configuration
+POSTGRES_POOL_SIZE = int(os.getenv("POSTGRES_POOL_SIZE", "5"))
+POSTGRES_MAX_OVERFLOW = int(os.getenv("POSTGRES_MAX_OVERFLOW", "10"))
+POSTGRES_POOL_TIMEOUT = int(os.getenv("POSTGRES_POOL_TIMEOUT", "30"))
+POSTGRES_POOL_RECYCLE = int(os.getenv("POSTGRES_POOL_RECYCLE", "1800"))
+POSTGRES_POOL_PRE_PING = os.getenv("POSTGRES_POOL_PRE_PING", "true").lower() == "true"
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() == "true"
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "1000"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+ASYNC_DB = os.getenv("ASYNC_DB", "false").lower() == "true"
+
+# Logging configuration
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()
+LOG_CONSOLE_LEVEL = os.getenv("LOG_CONSOLE_LEVEL", "INFO").upper()
+LOG_FILE_LEVEL = os.getenv("LOG_FILE_LEVEL", "DEBUG").upper()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Breeding catalog configuration
+CATALOG_TTL = int(os.getenv("CATALOG_TTL", "3600"))
+CATALOG_REFRESH = int(os.getenv("CATALOG_REFRESH", "60"))
+
+# Weights view configuration
+WEIGHTS_VIEW_ENABLED = os.getenv("WEIGHTS_VIEW_ENABLED", "false").lower() == "true"
+WEIGHTS_VIEW_REFRESH = int(os.getenv("WEIGHTS_VIEW_REFRESH", "300"))
+WEIGHTS_VIEW_MAX_AGE = int(os.getenv("WEIGHTS_VIEW_MAX_AGE", "900"))
+WEIGHTS_VIEW_TENANTS = [
+    tenant.strip() for tenant in os.getenv("WEIGHTS_VIEW_TENANTS", "").split(",") if tenant.strip()
+]
+
+# Extraction configuration
+EXTRACT_CHUNK_SIZE = int(os.getenv("EXTRACT_CHUNK_SIZE", "10000"))
+
+# Transform configuration
+# "sql" keeps the standard in a per-connection temp table: needs session pooling, not
+# PgBouncer transaction mode
+CONVERSION_ENGINE = os.getenv("CONVERSION_ENGINE", "polars")
+TRANSFORM_STREAMING_ROWS = int(os.getenv("TRANSFORM_STREAMING_ROWS", "1000000"))
+TRANSFORM_PROFILE = os.getenv("TRANSFORM_PROFILE", "off")
+COMPACT_DTYPES = os.getenv("COMPACT_DTYPES", "false").lower() == "true"
+
+# Out-of-core configuration
+MEMORY_BUDGET_ROWS = int(os.getenv("MEMORY_BUDGET_ROWS", "5000000"))
+BREEDING_MAX_ROWS = int(os.getenv("BREEDING_MAX_ROWS", "1000"))
+SPILL_PARTITION_ROWS = int(os.getenv("SPILL_PARTITION_ROWS", "500000"))
+SPILL_DIR = os.getenv("SPILL_DIR", "/tmp/conversion-spill")
+
+# Pipeline configuration
+PIPELINE_CHUNK_BREEDINGS = int(os.getenv("PIPELINE_CHUNK_BREEDINGS", "0"))
+PIPELINE_TRANSFORM_QUEUE = int(os.getenv("PIPELINE_TRANSFORM_QUEUE", "2"))
+PIPELINE_SAVE_QUEUE = int(os.getenv("PIPELINE_SAVE_QUEUE", "2"))
+
+# Load configuration
+BULK_LOAD_THRESHOLD = int(os.getenv("BULK_LOAD_THRESHOLD", "5000"))
+LOAD_CHUNK_SIZE = int(os.getenv("LOAD_CHUNK_SIZE", "50000"))
+MAX_BIND_PARAMS = 65535
+SAVE_MODE = os.getenv("SAVE_MODE", "upsert")
+
+# Response configuration
+RESPONSE_CHUNK_SIZE = int(os.getenv("RESPONSE_CHUNK_SIZE", "50000"))
+
+# Batch configuration
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+
+# Request coalescing configuration
+CONVERSION_MAX_CONCURRENT = int(os.getenv("CONVERSION_MAX_CONCURRENT", "2"))
+CONVERSION_MAX_QUEUED = int(os.getenv("CONVERSION_MAX_QUEUED", "4"))
+
+# Partitioned execution configuration
+PARTITIONED = os.getenv("PARTITIONED", "false").lower() == "true"
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "16"))
+SHARD_LEASE_TTL = int(os.getenv("SHARD_LEASE_TTL", "300"))
+SHARD_WAIT = float(os.getenv("SHARD_WAIT", "30"))
+
+# Redis configuration
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Result cache configuration
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "64"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", "67108864"))
+
+# Background job configuration
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_TTL = int(os.getenv("JOB_TTL", "86400"))
+JOB_HEARTBEAT_TTL = int(os.getenv("JOB_HEARTBEAT_TTL", "60"))
+
 # Project configuration
 PROJECT_NAME = "conversion"
 
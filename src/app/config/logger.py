@@ -1,7 +1,14 @@
 # Standard Library
+import atexit
+import json
 import logging
 import os
+import queue
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+
+# Local
+from .config import LOG_CONSOLE_LEVEL, LOG_FILE_LEVEL, LOG_LEVEL, LOG_QUEUE_SIZE
 
 
 LOG_FOLDER = "./logs"
@@ -12,23 +19,63 @@ if not os.path.isdir(LOG_FOLDER):
 LOGGER_NAME = "msw-conversion-m"
 
 
-def get_format(logger_name: str) -> str:
-    return (
-        '{"time": "%(asctime)s", "level": "%(levelname)s", '
-        + '"thread": "%(threadName)s", "component": "%(module)s",'
-        + f'"service": "{logger_name}", "payload": %(message)s}}'
-    )
+class JsonFormatter(logging.Formatter):
+    def __init__(self, service: str, datefmt: str | None = None) -> None:
+        super().__init__(datefmt=datefmt)
+        ## El campo fijo se serializa una sola vez
+        self.service = json.dumps(service, ensure_ascii=False)
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload = f"{payload}\n{record.exc_text}"
+        return (
+            f'{{"time": "{self.formatTime(record, self.datefmt)}", '
+            f'"level": "{record.levelname}", '
+            f'"thread": {json.dumps(record.threadName, ensure_ascii=False)}, '
+            f'"component": {json.dumps(record.module, ensure_ascii=False)}, '
+            f'"service": {self.service}, '
+            f'"payload": {json.dumps(payload, ensure_ascii=False)}}}'
+        )
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    def __init__(self, *args, **kw) -> None:
+        super().__init__(*args, **kw)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        ## El logger sólo tiene este handler: se resuelve el mensaje sin copiar el registro
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        ## Con la cola llena se descarta el registro en vez de bloquear la solicitud
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
 
 
 def get_config(logger_name: str, handlers: list[str] = ["file"]) -> dict:
-    log_format = get_format(logger_name=logger_name)
     return {
         "version": 1,
         "disable_existing_loggers": False,
         "formatters": {
             "default": {
-                "class": "logging.Formatter",
-                "format": log_format,
+                "()": JsonFormatter,
+                "service": logger_name,
                 "datefmt": "%Y-%m-%d %H:%M:%S",
             },
         },
@@ -36,24 +83,31 @@ def get_config(logger_name: str, handlers: list[str] = ["file"]) -> dict:
             "console": {
                 "class": "logging.StreamHandler",
                 "formatter": "default",
-                "level": logging.INFO,
+                "level": LOG_CONSOLE_LEVEL,
                 "stream": "ext://sys.stdout",
             },
             "file": {
                 "class": "logging.handlers.RotatingFileHandler",
                 "formatter": "default",
-                "level": logging.DEBUG,
+                "level": LOG_FILE_LEVEL,
                 "filename": f"{LOG_FOLDER}/{logger_name}.log",
                 "mode": "a",
                 "encoding": "utf-8",
                 "maxBytes": 10_000_000,
                 "backupCount": 4,
             },
+            "queue": {
+                "class": NonBlockingQueueHandler,
+                "queue": {"()": "queue.Queue", "maxsize": LOG_QUEUE_SIZE},
+                "listener": DrainingQueueListener,
+                "handlers": handlers,
+                "respect_handler_level": True,
+            },
         },
         "loggers": {
             logger_name: {
-                "handlers": handlers,
-                "level": logging.DEBUG,
+                "handlers": ["queue"],
+                "level": LOG_LEVEL,
                 "propagate": False,
             },
         },
@@ -63,4 +117,13 @@ def get_config(logger_name: str, handlers: list[str] = ["file"]) -> dict:
 def create_logger(logger_name: str, handlers: list[str] = ["file"]) -> logging.Logger:
     config = get_config(logger_name=logger_name, handlers=handlers)
     dictConfig(config)
+    ## Un hilo de fondo escribe en consola y archivo; la solicitud sólo encola
+    listener = logging.getHandlerByName("queue").listener
+    listener.start()
+    atexit.register(listener.stop)
     return logging.getLogger(logger_name)
+
+
+def get_dropped_logs() -> int:
+    handler = logging.getHandlerByName("queue")
+    return handler.dropped if isinstance(handler, NonBlockingQueueHandler) else 0
@@ -1,22 +1,111 @@
-# SQL Database exports
 # Project
+from app.db.redis import (
+    RESULT_CACHE,
+    MemoryResultCache,
+    RedisResultCache,
+    get_redis,
+    get_result_cache,
+)
+
+# SQL Database exports
 from app.db.sql import (
+    ASYNC_DATABASE_URL,
     DATABASE_URL,
+    EXPLAIN_OPTION,
+    QUERY_STATS,
+    QueryStats,
+    async_engine,
+    clear_conversion_standard,
+    compile_statement,
+    conversion_stage,
+    conversion_standard,
+    copy_conversion_stage,
+    copy_conversion_standard,
+    count_weights_view,
+    create_conversion_stage,
+    create_conversion_standard,
+    create_weights_view,
     engine,
+    get_async_db,
+    get_async_session,
     get_db,
+    get_pool_stats,
     get_session,
+    get_tenant,
+    get_tenant_async_engine,
+    get_tenant_engine,
+    install_query_hooks,
+    merge_conversion_rows,
+    merge_conversion_stage,
+    record_weights_view_refresh,
+    refresh_weights_view,
+    select_breeding_catalog,
+    select_breeding_changes,
+    select_breeding_row_counts,
     select_breeding_weights_consumption_data,
+    select_conversion_rows,
     select_init_params,
+    select_refresh_start,
+    select_source_stats,
+    select_stored_conversion,
+    select_weights_view_data,
+    select_weights_view_refresh,
+    select_weights_view_state,
+    try_lock_weights_view,
     upsert_animalshed_conversion,
+    weights_consumption_view,
 )
 
 
 __all__ = [
+    "RESULT_CACHE",
+    "MemoryResultCache",
+    "RedisResultCache",
+    "ASYNC_DATABASE_URL",
     "DATABASE_URL",
+    "async_engine",
     "engine",
+    "get_async_db",
+    "get_async_session",
     "get_db",
+    "get_pool_stats",
+    "get_redis",
+    "get_result_cache",
     "get_session",
+    "get_tenant",
+    "get_tenant_async_engine",
+    "get_tenant_engine",
+    "EXPLAIN_OPTION",
+    "QUERY_STATS",
+    "QueryStats",
+    "compile_statement",
+    "install_query_hooks",
+    "conversion_stage",
+    "conversion_standard",
+    "clear_conversion_standard",
+    "copy_conversion_stage",
+    "copy_conversion_standard",
+    "create_conversion_stage",
+    "create_conversion_standard",
+    "merge_conversion_rows",
+    "merge_conversion_stage",
+    "select_breeding_catalog",
+    "select_breeding_changes",
+    "select_breeding_row_counts",
     "select_breeding_weights_consumption_data",
+    "select_conversion_rows",
     "select_init_params",
+    "select_refresh_start",
+    "select_source_stats",
+    "select_stored_conversion",
+    "count_weights_view",
+    "create_weights_view",
+    "record_weights_view_refresh",
+    "refresh_weights_view",
+    "select_weights_view_data",
+    "select_weights_view_refresh",
+    "select_weights_view_state",
+    "try_lock_weights_view",
+    "weights_consumption_view",
     "upsert_animalshed_conversion",
 ]
@@ -0,0 +1,13 @@
+# Redis client
+# Project
+from app.db.redis.cache import RESULT_CACHE, MemoryResultCache, RedisResultCache, get_result_cache
+from app.db.redis.client import get_redis
+
+
+__all__ = [
+    "RESULT_CACHE",
+    "MemoryResultCache",
+    "RedisResultCache",
+    "get_redis",
+    "get_result_cache",
+]
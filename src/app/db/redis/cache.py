@@ -0,0 +1,112 @@
+# Standard Library
+import threading
+import time
+from collections import OrderedDict
+
+# External
+from redis import Redis
+
+# Project
+from app.config import CACHE_MAX_ENTRIES, CACHE_TTL
+
+# Local
+from .client import get_redis
+
+
+CACHE_PREFIX = "conversion:result:"
+CACHE_STATS_KEY = "conversion:cache:stats"
+
+
+class MemoryResultCache:
+    def __init__(
+        self, ttl: int = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES, prefix: str = CACHE_PREFIX
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(self.prefix + key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(self.prefix + key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(self.prefix + key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._entries[self.prefix + key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(self.prefix + key)
+            ## Desalojo LRU sobre max_entries
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, prefix: str = "") -> int:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(self.prefix + prefix)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+
+class RedisResultCache:
+    def __init__(
+        self,
+        client: Redis,
+        ttl: int = CACHE_TTL,
+        prefix: str = CACHE_PREFIX,
+        stats_key: str = CACHE_STATS_KEY,
+    ) -> None:
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.stats_key = stats_key
+
+    def get(self, key: str) -> bytes | None:
+        value = self.client.get(self.prefix + key)
+        ## Contadores compartidos por todas las replicas
+        self.client.hincrby(self.stats_key, "hits" if value is not None else "misses", 1)
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        self.client.set(self.prefix + key, value, ex=self.ttl)
+
+    def invalidate(self, prefix: str = "") -> int:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}{prefix}*", count=500))
+        return self.client.delete(*keys) if keys else 0
+
+    def stats(self) -> dict:
+        counters = self.client.hgetall(self.stats_key)
+        return {
+            "backend": "redis",
+            "hits": int(counters.get(b"hits", 0)),
+            "misses": int(counters.get(b"misses", 0)),
+            "ttl": self.ttl,
+        }
+
+
+def get_result_cache() -> MemoryResultCache | RedisResultCache:
+    ## Resultados binarios (Parquet): cliente sin decodificar respuestas
+    client = get_redis(decode_responses=False)
+    return RedisResultCache(client) if client is not None else MemoryResultCache()
+
+
+RESULT_CACHE = get_result_cache()
@@ -0,0 +1,16 @@
+# Standard Library
+from functools import lru_cache
+
+# External
+from redis import Redis
+
+# Project
+from app.config import REDIS_URL
+
+
+@lru_cache(maxsize=2)
+def get_redis(decode_responses: bool = True) -> Redis | None:
+    ## Sin REDIS_URL se usan las alternativas en proceso
+    if not REDIS_URL:
+        return None
+    return Redis.from_url(REDIS_URL, decode_responses=decode_responses)
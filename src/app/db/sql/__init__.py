@@ -1,21 +1,106 @@
 # Database connection and session management
 # Project
-from app.db.sql.database import DATABASE_URL, engine, get_db, get_session
+from app.db.sql.database import (
+    ASYNC_DATABASE_URL,
+    DATABASE_URL,
+    async_engine,
+    engine,
+    get_async_db,
+    get_async_session,
+    get_db,
+    get_pool_stats,
+    get_session,
+    get_tenant,
+    get_tenant_async_engine,
+    get_tenant_engine,
+)
+
+# Query monitoring
+from app.db.sql.monitor import (
+    EXPLAIN_OPTION,
+    QUERY_STATS,
+    QueryStats,
+    compile_statement,
+    install_query_hooks,
+)
 
 # Query functions
 from app.db.sql.queries import (
+    clear_conversion_standard,
+    conversion_stage,
+    conversion_standard,
+    copy_conversion_stage,
+    copy_conversion_standard,
+    count_weights_view,
+    create_conversion_stage,
+    create_conversion_standard,
+    create_weights_view,
+    merge_conversion_rows,
+    merge_conversion_stage,
+    record_weights_view_refresh,
+    refresh_weights_view,
+    select_breeding_catalog,
+    select_breeding_changes,
+    select_breeding_row_counts,
     select_breeding_weights_consumption_data,
+    select_conversion_rows,
     select_init_params,
+    select_refresh_start,
+    select_source_stats,
+    select_stored_conversion,
+    select_weights_view_data,
+    select_weights_view_refresh,
+    select_weights_view_state,
+    try_lock_weights_view,
     upsert_animalshed_conversion,
+    weights_consumption_view,
 )
 
 
 __all__ = [
+    "ASYNC_DATABASE_URL",
     "DATABASE_URL",
+    "async_engine",
     "engine",
+    "get_async_db",
+    "get_async_session",
     "get_db",
+    "get_pool_stats",
     "get_session",
+    "get_tenant",
+    "get_tenant_async_engine",
+    "get_tenant_engine",
+    "EXPLAIN_OPTION",
+    "QUERY_STATS",
+    "QueryStats",
+    "compile_statement",
+    "install_query_hooks",
+    "conversion_stage",
+    "conversion_standard",
+    "clear_conversion_standard",
+    "copy_conversion_stage",
+    "copy_conversion_standard",
+    "create_conversion_stage",
+    "create_conversion_standard",
+    "merge_conversion_rows",
+    "merge_conversion_stage",
+    "select_breeding_catalog",
+    "select_breeding_changes",
+    "select_breeding_row_counts",
     "select_breeding_weights_consumption_data",
+    "select_conversion_rows",
     "select_init_params",
+    "select_refresh_start",
+    "select_source_stats",
+    "select_stored_conversion",
+    "count_weights_view",
+    "create_weights_view",
+    "record_weights_view_refresh",
+    "refresh_weights_view",
+    "select_weights_view_data",
+    "select_weights_view_refresh",
+    "select_weights_view_state",
+    "try_lock_weights_view",
+    "weights_consumption_view",
     "upsert_animalshed_conversion",
 ]
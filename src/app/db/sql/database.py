@@ -1,36 +1,105 @@
 # Standard Library
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
 from typing import AsyncGenerator, Generator
 
 # External
 from fastapi import HTTPException, Request, status
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # Project
 from app.config import (
     POSTGRES_DATABASE,
+    POSTGRES_MAX_OVERFLOW,
     POSTGRES_PASSWORD,
+    POSTGRES_POOL_PRE_PING,
+    POSTGRES_POOL_RECYCLE,
+    POSTGRES_POOL_SIZE,
+    POSTGRES_POOL_TIMEOUT,
     POSTGRES_SERVER,
     POSTGRES_USER,
     PROJECT_NAME,
+    SQL_ECHO,
 )
 
+# Local
+from .monitor import install_query_hooks
+
+
 DATABASE_URL = f"postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}/{POSTGRES_DATABASE}?application_name={PROJECT_NAME}"
-engine = create_engine(DATABASE_URL, echo=True)
+engine = create_engine(
+    DATABASE_URL,
+    echo=SQL_ECHO,
+    pool_size=POSTGRES_POOL_SIZE,
+    max_overflow=POSTGRES_MAX_OVERFLOW,
+    pool_timeout=POSTGRES_POOL_TIMEOUT,
+    pool_recycle=POSTGRES_POOL_RECYCLE,
+    pool_pre_ping=POSTGRES_POOL_PRE_PING,
+)
+
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}/{POSTGRES_DATABASE}"
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=SQL_ECHO,
+    pool_size=POSTGRES_POOL_SIZE,
+    max_overflow=POSTGRES_MAX_OVERFLOW,
+    pool_timeout=POSTGRES_POOL_TIMEOUT,
+    pool_recycle=POSTGRES_POOL_RECYCLE,
+    pool_pre_ping=POSTGRES_POOL_PRE_PING,
+    connect_args={"server_settings": {"application_name": PROJECT_NAME}},
+)
+
+install_query_hooks(engine)
+install_query_hooks(async_engine.sync_engine)
+
+
+@lru_cache(maxsize=256)
+def get_tenant_engine(tenant_schema: str) -> Engine:
+    ## Comparte el pool del engine global; sólo agrega el schema_translate_map del tenant
+    return engine.execution_options(schema_translate_map={None: tenant_schema})
+
+
+@lru_cache(maxsize=256)
+def get_tenant_async_engine(tenant_schema: str) -> AsyncEngine:
+    return async_engine.execution_options(schema_translate_map={None: tenant_schema})
+
+
+def get_pool_stats() -> dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": POSTGRES_MAX_OVERFLOW,
+        "tenant_engines": get_tenant_engine.cache_info().currsize,
+    }
 
 
 @contextmanager
 def get_session(tenant_schema: str) -> Generator[Session, None, None]:
-    session = engine.execution_options(schema_translate_map={None: tenant_schema})
-
+    session = Session(autocommit=False, autoflush=False, bind=get_tenant_engine(tenant_schema))
     try:
-        session = Session(autocommit=False, autoflush=False, bind=session)
         yield session
     finally:
         session.close()
 
 
-async def get_db(req: Request) -> AsyncGenerator[Session, None]:
+@asynccontextmanager
+async def get_async_session(tenant_schema: str) -> AsyncGenerator[AsyncSession, None]:
+    session = AsyncSession(
+        autoflush=False, bind=get_tenant_async_engine(tenant_schema), expire_on_commit=False
+    )
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def get_tenant(req: Request) -> str:
     try:
         body = await req.json()
     except Exception:
@@ -44,6 +113,16 @@ async def get_db(req: Request) -> AsyncGenerator[Session, None]:
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Missing 'client' key in request body",
         )
-    tenant = body["client"]
+    return body["client"]
+
+
+async def get_db(req: Request) -> AsyncGenerator[Session, None]:
+    tenant = await get_tenant(req)
     with get_session(tenant) as db:
         yield db
+
+
+async def get_async_db(req: Request) -> AsyncGenerator[AsyncSession, None]:
+    tenant = await get_tenant(req)
+    async with get_async_session(tenant) as db:
+        yield db
@@ -0,0 +1,126 @@
+# Standard Library
+import datetime as dt
+import re
+import threading
+import time
+from collections import deque
+from typing import Any
+
+# External
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql import Executable
+
+# Project
+from app.config import LOGGER, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_MS
+
+
+EXPLAIN_OPTION = "explain_analyze"
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+
+## Las listas IN expandidas (psycopg2 y asyncpg) se colapsan para agrupar por sentencia
+IN_LIST = re.compile(r"\((?:\s*(?:%\(\w+\)s|\$\d+)\s*,)+\s*(?:%\(\w+\)s|\$\d+)\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    return WHITESPACE.sub(" ", IN_LIST.sub("(...)", statement)).strip()
+
+
+def compile_statement(statement: Executable, bind: Engine | AsyncEngine) -> str:
+    ## Mismo texto que ve el hook: dialecto y schema del tenant del engine
+    translate_map = bind.get_execution_options().get("schema_translate_map")
+    return str(
+        statement.compile(
+            dialect=bind.dialect,
+            schema_translate_map=translate_map,
+            render_schema_translate=translate_map is not None,
+        )
+    )
+
+
+def statement_tenant(context: Any) -> str:
+    translate_map = context.execution_options.get("schema_translate_map") or {}
+    return translate_map.get(None) or ""
+
+
+class QueryStats:
+    def __init__(
+        self, slow_ms: float = SLOW_QUERY_MS, slow_log_size: int = SLOW_QUERY_LOG_SIZE
+    ) -> None:
+        self.slow_ms = slow_ms
+        self._statements: dict[str, dict] = {}
+        self._slow: deque[dict] = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, tenant: str, duration: float, rows: int) -> None:
+        key = normalize_statement(statement)
+        with self._lock:
+            stats = self._statements.setdefault(
+                key, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "slow": 0}
+            )
+            stats["calls"] += 1
+            stats["total_ms"] += duration * 1000
+            stats["max_ms"] = max(stats["max_ms"], duration * 1000)
+            stats["rows"] += max(rows, 0)
+            if duration * 1000 < self.slow_ms:
+                return
+            stats["slow"] += 1
+            self._slow.append(
+                {
+                    "at": dt.datetime.now(dt.timezone.utc).isoformat(),
+                    "tenant": tenant,
+                    "duration_ms": round(duration * 1000, 3),
+                    "rows": rows,
+                    "statement": key,
+                }
+            )
+        LOGGER.warning(
+            f"Slow query on {tenant or 'default'}: {duration * 1000:.1f} ms, {rows} rows: "
+            f"{key[:200]}"
+        )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            statements = sorted(
+                (
+                    {
+                        "statement": statement,
+                        **stats,
+                        "avg_ms": stats["total_ms"] / stats["calls"],
+                    }
+                    for statement, stats in self._statements.items()
+                ),
+                key=lambda stats: stats["total_ms"],
+                reverse=True,
+            )
+            return {"slow_ms": self.slow_ms, "statements": statements, "slow": list(self._slow)}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self._slow.clear()
+
+
+QUERY_STATS = QueryStats()
+
+
+def install_query_hooks(engine: Engine, stats: QueryStats = QUERY_STATS) -> None:
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+        if context.execution_options.get(EXPLAIN_OPTION):
+            statement = EXPLAIN_PREFIX + statement
+        return statement, parameters
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_query_start", None)
+        if start is None or context.execution_options.get(EXPLAIN_OPTION):
+            return
+        ## Con cursor del lado del servidor la consulta corre al recorrerlo: la registra quien lo lee
+        if context.execution_options.get("stream_results"):
+            return
+        stats.record(
+            statement, statement_tenant(context), time.perf_counter() - start, cursor.rowcount
+        )
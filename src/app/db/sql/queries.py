@@ -1,8 +1,39 @@
+# Standard Library
+import datetime as dt
+
 # External
-from sqlalchemy import BigInteger, String, and_, cast, literal_column, select
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    and_,
+    case,
+    cast,
+    column,
+    delete,
+    func,
+    literal,
+    literal_column,
+    null,
+    or_,
+    select,
+    union,
+    union_all,
+    values,
+)
 from sqlalchemy.dialects.mysql import Insert as InsertMySQL
+from sqlalchemy.dialects.postgresql import Insert
 from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlalchemy.sql import Select, and_, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateIndex, CreateTable, DDLElement
+from sqlalchemy.sql import ColumnElement, CompoundSelect, Delete, Select, and_, select
 
 # Project
 from app.models import (
@@ -16,49 +47,117 @@ from app.models import (
 )
 
 
-def select_init_params() -> Select:
+def active_breeding_filter() -> ColumnElement[bool]:
+    return and_(
+        Breedings.end_date.is_(None),
+        Entities.parent_id.is_not(None),
+        Entities.id_stage == 1,
+        ## Ensure not None
+        Breedings.start_date.is_not(None),
+        BreedingData.initial_age.is_not(None),
+        BreedingData.initial_weight_avg.is_not(None),
+        BreedingData.sex.is_not(None),
+    )
+
+
+def init_params_columns() -> list:
+    return [
+        cast(Breedings.idta, BigInteger),
+        cast(Entities.parent_id, BigInteger),
+        Breedings.breeding_code,
+        literal_column("'ROSS - 2020'", String).label("geneticaPredominante"),
+        BreedingData.sex,
+        Breedings.id_breeding,
+        Entities.id_stage,
+    ]
+
+
+def select_init_params(
+    id_breeding: list[int] | None = None, id_stage: int | None = None, sex: str | None = None
+) -> Select:
+    statement = (
+        select(*init_params_columns())
+        .join(Entities, Entities.idta == Breedings.idta)
+        .join(BreedingData, BreedingData.id_breeding == Breedings.id_breeding)
+        .filter(active_breeding_filter())
+    )
+    if id_breeding is not None:
+        statement = statement.filter(Breedings.id_breeding.in_(id_breeding))
+    if id_stage is not None:
+        statement = statement.filter(Entities.id_stage == id_stage)
+    if sex is not None:
+        statement = statement.filter(BreedingData.sex == sex)
+    return statement
+
+
+def select_breeding_catalog(changed_since: dt.datetime | None = None) -> Select:
+    changed_at = func.greatest(
+        Breedings.createdAt,
+        Breedings.updatedAt,
+        Entities.created_at,
+        Entities.updated_at,
+        BreedingData.created_at,
+        BreedingData.updated_at,
+    ).label("changed_at")
+    if changed_since is None:
+        return select_init_params().add_columns(changed_at)
+
+    ## Incremental: todas las filas de las crianzas con cambios, activas o no, para reemplazarlas.
+    ## Un filtro por tabla y columna (no greatest() sobre el join) permite usar sus indices
+    changed = union(
+        select(Breedings.id_breeding).filter(
+            or_(Breedings.createdAt >= changed_since, Breedings.updatedAt >= changed_since)
+        ),
+        select(Breedings.id_breeding)
+        .join(Entities, Entities.idta == Breedings.idta)
+        .filter(or_(Entities.created_at >= changed_since, Entities.updated_at >= changed_since)),
+        select(BreedingData.id_breeding).filter(
+            or_(
+                BreedingData.created_at >= changed_since,
+                BreedingData.updated_at >= changed_since,
+            )
+        ),
+    )
     return (
         select(
-            cast(Breedings.idta, BigInteger),
-            cast(Entities.parent_id, BigInteger),
-            Breedings.breeding_code,
-            literal_column("'ROSS - 2020'", String).label("geneticaPredominante"),
-            BreedingData.sex,
-            Breedings.id_breeding,
-            Entities.id_stage,
+            *init_params_columns(),
+            func.coalesce(active_breeding_filter(), False).label("active"),
+            changed_at,
         )
         .join(Entities, Entities.idta == Breedings.idta)
         .join(BreedingData, BreedingData.id_breeding == Breedings.id_breeding)
-        .filter(
-            and_(
-                Breedings.end_date.is_(None),
-                Entities.parent_id.is_not(None),
-                Entities.id_stage == 1,
-                ## Ensure not None
-                Breedings.start_date.is_not(None),
-                BreedingData.initial_age.is_not(None),
-                BreedingData.initial_weight_avg.is_not(None),
-                BreedingData.sex.is_not(None),
-            )
-        )
+        .filter(Breedings.id_breeding.in_(changed))
     )
 
 
-def select_breeding_weights_consumption_data(id_breeding: list[int]) -> Select:
+def weights_consumption_columns() -> list:
+    return [
+        AnimalWeights.measured_weight,
+        AnimalWeights.animals_age,
+        AnimalWeights.date,
+        FoodConsumption.entity_accumulated_consumption,
+        FoodConsumption.animal_accumulated_consumption,
+        Mortality.stock,
+        BreedingData.initial_weight_avg,
+        BreedingData.initial_age,
+        BreedingData.initial_total_quantity,
+        BreedingData.id_breeding,
+        func.greatest(
+            AnimalWeights.created_at,
+            AnimalWeights.updated_at,
+            FoodConsumption.created_at,
+            FoodConsumption.updated_at,
+            Mortality.created_at,
+            Mortality.updated_at,
+            BreedingData.created_at,
+            BreedingData.updated_at,
+        ).label("changed_at"),
+    ]
+
+
+def join_weights_consumption(statement: Select) -> Select:
     return (
-        select(
-            AnimalWeights.measured_weight,
-            AnimalWeights.animals_age,
-            AnimalWeights.date,
-            FoodConsumption.entity_accumulated_consumption,
-            FoodConsumption.animal_accumulated_consumption,
-            Mortality.stock,
-            BreedingData.initial_weight_avg,
-            BreedingData.initial_age,
-            BreedingData.initial_total_quantity,
-            BreedingData.id_breeding,
-        )
-        .join(
+        statement.join(
             FoodConsumption,
             (FoodConsumption.id_breeding == AnimalWeights.id_breeding)
             & (FoodConsumption.date == AnimalWeights.date)
@@ -71,21 +170,482 @@ def select_breeding_weights_consumption_data(id_breeding: list[int]) -> Select:
             & (Mortality.date_mortality == AnimalWeights.date),
         )
         .outerjoin(Breedings, Breedings.id_breeding == AnimalWeights.id_breeding)
-        .filter(and_(Breedings.id_breeding.in_(id_breeding)))
     )
 
 
-def upsert_animalshed_conversion(
-    data: list[dict], constraint_name: str = "animal_conversion_unique"
-) -> InsertMySQL:
-    statement = pg_insert(AnimalConversion).values(data)
+def select_breeding_weights_consumption_data(id_breeding: list[int]) -> Select:
+    return join_weights_consumption(
+        select(*weights_consumption_columns()).select_from(AnimalWeights)
+    ).filter(and_(Breedings.id_breeding.in_(id_breeding)))
+
+
+def select_breeding_changes(id_breeding: list[int]) -> Select:
+    changes = union_all(
+        *[
+            select(
+                model.id_breeding,
+                func.max(func.greatest(model.created_at, model.updated_at)).label("changed_at"),
+            )
+            .filter(model.id_breeding.in_(id_breeding))
+            .group_by(model.id_breeding)
+            for model in (AnimalWeights, FoodConsumption, Mortality, BreedingData)
+        ]
+    ).subquery()
+
+    return select(
+        changes.c.id_breeding, func.max(changes.c.changed_at).label("changed_at")
+    ).group_by(changes.c.id_breeding)
+
+
+def select_breeding_row_counts(id_breeding: list[int]) -> Select:
+    ## Estimacion de filas a extraer por crianza: el join parte de animal_weights
+    return (
+        select(AnimalWeights.id_breeding, func.count().label("rows"))
+        .filter(AnimalWeights.id_breeding.in_(id_breeding))
+        .group_by(AnimalWeights.id_breeding)
+    )
 
-    update_dict = {
+
+def select_source_stats(id_breeding: list[int]) -> CompoundSelect:
+    return union_all(
+        *[
+            select(
+                literal(model.__tablename__).label("source"),
+                func.count().label("rows"),
+                func.max(func.greatest(model.created_at, model.updated_at)).label("changed_at"),
+            ).filter(model.id_breeding.in_(id_breeding))
+            for model in (AnimalWeights, FoodConsumption, Mortality, BreedingData)
+        ]
+    )
+
+
+def select_stored_conversion(id_breeding: list[int]) -> Select:
+    return select(
+        AnimalConversion.id_breeding,
+        AnimalConversion.date,
+        AnimalConversion.animal_accumulated_conversion,
+        AnimalConversion.entity_accumulated_conversion,
+        AnimalConversion.accumulated_standard_conversion,
+        AnimalConversion.calculation_formula_version,
+    ).filter(AnimalConversion.id_breeding.in_(id_breeding))
+
+
+## Tabla temporal de carga masiva; vive en pg_temp y se descarta al hacer commit
+conversion_stage = Table(
+    "animal_conversion_stage",
+    MetaData(),
+    Column("id_breeding", BigInteger),
+    Column("date", Date),
+    Column("animals_age", Integer),
+    Column("entity_accumulated_conversion", Float),
+    Column("animal_accumulated_conversion", Float),
+    Column("accumulated_standard_conversion", Float),
+    Column("calculation_formula_version", String),
+    schema="pg_temp",
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+def conversion_update_set(statement: InsertMySQL) -> dict:
+    return {
         c.name: getattr(statement.excluded, c.name)
         for c in statement.table.columns
         if not c.primary_key
     }
 
+
+def upsert_animalshed_conversion(
+    data: list[dict], constraint_name: str = "animal_conversion_unique"
+) -> InsertMySQL:
+    statement = pg_insert(AnimalConversion).values(data)
+    update_dict = conversion_update_set(statement)
     statement = statement.on_conflict_do_update(constraint=constraint_name, set_=update_dict)
 
     return statement
+
+
+def create_conversion_stage() -> CreateTable:
+    return CreateTable(conversion_stage, if_not_exists=True)
+
+
+def copy_conversion_stage(columns: list[str]) -> str:
+    return (
+        f"COPY {conversion_stage.schema}.{conversion_stage.name} ({', '.join(columns)})"
+        " FROM STDIN WITH (FORMAT csv)"
+    )
+
+
+def merge_conversion_stage(
+    columns: list[str], constraint_name: str = "animal_conversion_unique"
+) -> InsertMySQL:
+    statement = pg_insert(AnimalConversion).from_select(
+        columns, select(*[conversion_stage.c[column] for column in columns])
+    )
+    update_dict = conversion_update_set(statement)
+    statement = statement.on_conflict_do_update(constraint=constraint_name, set_=update_dict)
+
+    return statement
+
+
+## Estandar genetico para el motor SQL; tabla temporal que vive con la conexion del pool y se
+## recarga solo cuando cambia el digest de los CSV
+conversion_standard = Table(
+    "conversion_standard",
+    MetaData(),
+    Column("id_stage", Integer),
+    Column("sex", String),
+    Column("animals_age", Integer),
+    Column("animal_accumulated_standard_conversion", Float),
+    schema="pg_temp",
+    prefixes=["TEMPORARY"],
+)
+
+
+def create_conversion_standard() -> CreateTable:
+    return CreateTable(conversion_standard, if_not_exists=True)
+
+
+def clear_conversion_standard() -> Delete:
+    return delete(conversion_standard)
+
+
+def copy_conversion_standard(columns: list[str]) -> str:
+    return (
+        f"COPY {conversion_standard.schema}.{conversion_standard.name} ({', '.join(columns)})"
+        " FROM STDIN WITH (FORMAT csv)"
+    )
+
+
+def conversion_ratio(numerator, denominator):
+    ## Semantica de Polars: x/0 es infinito (se anula a 0), 0/0 es NaN y null/0 es null;
+    ## negativos a 0
+    ## round(numeric) lleva los empates lejos de cero; round(float8) (rint) los lleva al par,
+    ## como round(6) de Polars: se escala en float8 para obtener el mismo valor
+    scale = literal_column("1000000::float8")
+    ratio = func.round(cast(numerator / func.nullif(denominator, 0), Float) * scale) / scale
+    return case(
+        (
+            denominator == 0,
+            case(
+                (numerator.is_(None), null()),
+                (numerator == 0, literal_column("'NaN'::float8")),
+                else_=0.0,
+            ),
+        ),
+        (ratio < 0, 0.0),
+        else_=ratio,
+    )
+
+
+def select_conversion_rows(
+    id_breeding: list[int],
+    watermarks: dict | None = None,
+    version: str = "",
+    date_from: dt.date | None = None,
+    date_to: dt.date | None = None,
+) -> Select:
+    source = select_breeding_weights_consumption_data(id_breeding).subquery("source")
+
+    known = select(
+        *[c for c in source.c if c.name != "stock"],
+        case(
+            (source.c.animals_age == source.c.initial_age, source.c.initial_total_quantity),
+            else_=source.c.stock,
+        ).label("stock"),
+    ).subquery("known")
+    by_breeding = {"partition_by": known.c.id_breeding}
+
+    ## Por crianza: ultimo stock conocido (ordenado por fecha) y stock inicial como respaldo
+    carried = select(
+        known,
+        func.bool_or(known.c.stock.is_(None)).over(**by_breeding).label("stock_imputed"),
+        func.first_value(known.c.stock)
+        .over(**by_breeding, order_by=[known.c.stock.is_(None), known.c.date.desc()])
+        .label("latest_stock"),
+        func.max(known.c.initial_total_quantity).over(**by_breeding).label("initial_stock"),
+    ).subquery("carried")
+
+    imputed = select(
+        *[c for c in carried.c if c.name not in ("stock", "latest_stock", "initial_stock")],
+        case(
+            (~carried.c.stock_imputed, carried.c.stock),
+            (carried.c.latest_stock.is_not(None), carried.c.latest_stock),
+            (
+                carried.c.initial_stock.is_not(None) & (carried.c.initial_stock != 0),
+                carried.c.initial_total_quantity,
+            ),
+        ).label("stock"),
+    ).subquery("imputed")
+
+    ## Crianzas sin stock imputable se descartan
+    flagged = select(
+        imputed,
+        func.bool_or(imputed.c.stock_imputed & imputed.c.stock.is_(None))
+        .over(partition_by=imputed.c.id_breeding)
+        .label("dropped"),
+    ).subquery("flagged")
+
+    init_params = select_init_params(id_breeding).subquery("init_params")
+    statement = (
+        select(
+            flagged.c.id_breeding,
+            flagged.c.animals_age,
+            cast(flagged.c.date, Date).label("date"),
+            conversion_ratio(
+                flagged.c.animal_accumulated_consumption,
+                flagged.c.measured_weight - flagged.c.initial_weight_avg,
+            ).label("animal_accumulated_conversion"),
+            conversion_standard.c.animal_accumulated_standard_conversion.label(
+                "accumulated_standard_conversion"
+            ),
+            conversion_ratio(
+                flagged.c.entity_accumulated_consumption,
+                flagged.c.measured_weight * flagged.c.stock
+                - flagged.c.initial_weight_avg * flagged.c.initial_total_quantity,
+            ).label("entity_accumulated_conversion"),
+            literal(version, String).label("calculation_formula_version"),
+        )
+        .outerjoin(init_params, init_params.c.id_breeding == flagged.c.id_breeding)
+        .outerjoin(
+            conversion_standard,
+            (conversion_standard.c.id_stage == init_params.c.id_stage)
+            & (conversion_standard.c.sex == init_params.c.sex)
+            & (conversion_standard.c.animals_age == flagged.c.animals_age),
+        )
+        .filter(~flagged.c.dropped)
+    )
+    ## La ventana de fechas se aplica despues de imputar: el stock usa toda la crianza
+    if date_from is not None:
+        statement = statement.filter(cast(flagged.c.date, Date) >= date_from)
+    if date_to is not None:
+        statement = statement.filter(cast(flagged.c.date, Date) <= date_to)
+
+    if watermarks:
+        ## Si el stock fue imputado, cualquier cambio en la crianza altera todas sus filas
+        watermark_values = values(
+            column("id_breeding", BigInteger), column("watermark", DateTime), name="watermarks"
+        ).data(list(watermarks.items()))
+        statement = statement.outerjoin(
+            watermark_values, watermark_values.c.id_breeding == flagged.c.id_breeding
+        ).filter(
+            watermark_values.c.watermark.is_(None)
+            | (flagged.c.changed_at > watermark_values.c.watermark)
+            | flagged.c.stock_imputed
+        )
+
+    return statement
+
+
+def merge_conversion_rows(
+    id_breeding: list[int],
+    watermarks: dict | None = None,
+    version: str = "",
+    distinct_columns: list[str] | None = None,
+    constraint_name: str = "animal_conversion_unique",
+    date_from: dt.date | None = None,
+    date_to: dt.date | None = None,
+) -> Select:
+    rows = select_conversion_rows(
+        id_breeding, watermarks, version, date_from=date_from, date_to=date_to
+    ).cte("conversion_rows")
+    columns = [c.name for c in rows.c]
+    statement = pg_insert(AnimalConversion).from_select(
+        columns, select(*[rows.c[column] for column in columns])
+    )
+    ## En modo diff sólo se actualizan las filas cuyo valor cambio
+    where = (
+        or_(
+            *[
+                AnimalConversion.__table__.c[column].is_distinct_from(statement.excluded[column])
+                for column in distinct_columns
+            ]
+        )
+        if distinct_columns
+        else None
+    )
+    statement = statement.on_conflict_do_update(
+        constraint=constraint_name, set_=conversion_update_set(statement), where=where
+    )
+    upserted = statement.returning(literal_column("xmax = 0").label("inserted")).cte("upserted")
+
+    return select(
+        select(func.count()).select_from(rows).scalar_subquery().label("rows"),
+        func.count().filter(upserted.c.inserted).label("inserted"),
+        func.count().label("written"),
+    ).select_from(upserted)
+
+
+class CreateMaterializedView(DDLElement):
+    def __init__(self, table: Table, selectable: Select) -> None:
+        self.table = table
+        self.selectable = selectable
+
+
+class RefreshMaterializedView(DDLElement):
+    def __init__(self, table: Table, concurrently: bool = True) -> None:
+        self.table = table
+        self.concurrently = concurrently
+
+
+@compiles(CreateMaterializedView)
+def compile_create_materialized_view(element, compiler, **kw) -> str:
+    selectable = compiler.sql_compiler.process(element.selectable, literal_binds=True)
+    return (
+        f"CREATE MATERIALIZED VIEW IF NOT EXISTS {compiler.preparer.format_table(element.table)}"
+        f" AS {selectable}"
+    )
+
+
+@compiles(RefreshMaterializedView)
+def compile_refresh_materialized_view(element, compiler, **kw) -> str:
+    concurrently = " CONCURRENTLY" if element.concurrently else ""
+    return (
+        f"REFRESH MATERIALIZED VIEW{concurrently} {compiler.preparer.format_table(element.table)}"
+    )
+
+
+## Vista materializada del join de pesajes, consumos, mortalidades y datos de crianza activas
+weights_consumption_view = Table(
+    "breeding_weights_consumption",
+    MetaData(),
+    Column("id_animal_weight", BigInteger),
+    Column("id_food_consumption", BigInteger),
+    Column("id_mortality", BigInteger),
+    Column("id_breeding_data", BigInteger),
+    Column("measured_weight", Float),
+    Column("animals_age", Integer),
+    Column("date", DateTime),
+    Column("entity_accumulated_consumption", Float),
+    Column("animal_accumulated_consumption", Float),
+    Column("stock", Integer),
+    Column("initial_weight_avg", Float),
+    Column("initial_age", Integer),
+    Column("initial_total_quantity", Integer),
+    Column("id_breeding", BigInteger),
+    Column("changed_at", DateTime),
+)
+## REFRESH CONCURRENTLY exige un indice unico sobre columnas sin expresiones ni NULL
+Index(
+    "breeding_weights_consumption_key",
+    weights_consumption_view.c.id_animal_weight,
+    weights_consumption_view.c.id_food_consumption,
+    weights_consumption_view.c.id_mortality,
+    weights_consumption_view.c.id_breeding_data,
+    unique=True,
+)
+Index("breeding_weights_consumption_breeding", weights_consumption_view.c.id_breeding)
+
+view_refresh = Table(
+    "conversion_view_refresh",
+    MetaData(),
+    Column("view_name", String, primary_key=True),
+    Column("refreshed_at", DateTime),
+    Column("rows", Integer),
+    Column("duration_ms", Float),
+)
+
+
+def select_weights_view_source() -> Select:
+    active = select_init_params().with_only_columns(Breedings.id_breeding)
+    return join_weights_consumption(
+        select(
+            AnimalWeights.id_animal_weight,
+            FoodConsumption.id_food_consumption,
+            func.coalesce(Mortality.id_mortality, 0).label("id_mortality"),
+            func.coalesce(BreedingData.id_breeding_data, 0).label("id_breeding_data"),
+            *weights_consumption_columns(),
+        ).select_from(AnimalWeights)
+    ).filter(AnimalWeights.id_breeding.in_(active))
+
+
+def create_weights_view() -> list[DDLElement]:
+    return [
+        CreateMaterializedView(weights_consumption_view, select_weights_view_source()),
+        *[CreateIndex(index, if_not_exists=True) for index in weights_consumption_view.indexes],
+        CreateTable(view_refresh, if_not_exists=True),
+    ]
+
+
+def refresh_weights_view(concurrently: bool = True) -> RefreshMaterializedView:
+    return RefreshMaterializedView(weights_consumption_view, concurrently=concurrently)
+
+
+def try_lock_weights_view(tenant: str) -> Select:
+    ## Lock de la transaccion: una sola replica refresca la vista de cada tenant a la vez
+    return select(
+        func.pg_try_advisory_xact_lock(func.hashtext(f"{tenant}.{weights_consumption_view.name}"))
+    )
+
+
+def select_refresh_start() -> Select:
+    ## Reloj real y no localtimestamp (inicio de la transaccion): lo que cambie despues de este
+    ## instante puede no estar en la vista
+    return select(cast(func.clock_timestamp(), DateTime))
+
+
+def record_weights_view_refresh(rows: int, duration_ms: float, refreshed_at: dt.datetime) -> Insert:
+    statement = pg_insert(view_refresh).values(
+        view_name=weights_consumption_view.name,
+        refreshed_at=refreshed_at,
+        rows=rows,
+        duration_ms=duration_ms,
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[view_refresh.c.view_name],
+        set_={
+            "refreshed_at": statement.excluded.refreshed_at,
+            "rows": statement.excluded.rows,
+            "duration_ms": statement.excluded.duration_ms,
+        },
+    )
+
+
+def count_weights_view() -> Select:
+    return select(func.count()).select_from(weights_consumption_view)
+
+
+def select_weights_view_refresh() -> Select:
+    return select(
+        view_refresh.c.refreshed_at,
+        view_refresh.c.rows,
+        view_refresh.c.duration_ms,
+        (func.localtimestamp() - view_refresh.c.refreshed_at).label("age"),
+    ).filter(view_refresh.c.view_name == weights_consumption_view.name)
+
+
+def select_weights_view_state(id_breeding: list[int]) -> Select:
+    ## Crianzas presentes en la vista, momento del ultimo refresco (sin zona y con la zona de la
+    ## sesion, para comparar con origenes timestamp o timestamptz) y su antiguedad
+    refreshed_at = (
+        select(view_refresh.c.refreshed_at)
+        .filter(view_refresh.c.view_name == weights_consumption_view.name)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            weights_consumption_view.c.id_breeding,
+            refreshed_at.label("refreshed_at"),
+            cast(refreshed_at, DateTime(timezone=True)).label("refreshed_at_tz"),
+            (func.localtimestamp() - refreshed_at).label("age"),
+        )
+        .filter(weights_consumption_view.c.id_breeding.in_(id_breeding))
+        .distinct()
+    )
+
+
+def select_weights_view_data(id_breeding: list[int]) -> Select:
+    view = weights_consumption_view.c
+    return select(
+        view.measured_weight,
+        view.animals_age,
+        view.date,
+        view.entity_accumulated_consumption,
+        view.animal_accumulated_consumption,
+        view.stock,
+        view.initial_weight_avg,
+        view.initial_age,
+        view.initial_total_quantity,
+        view.id_breeding,
+        view.changed_at,
+    ).filter(view.id_breeding.in_(id_breeding))
@@ -1,9 +1,13 @@
 # Local
 from .conversion import conversion_router
+from .diagnostics import diagnostics_router
+from .metrics import metrics_router
 
 
 ROUTERS = [
     conversion_router,
+    diagnostics_router,
+    metrics_router,
 ]
 
 __all__ = [
@@ -1,39 +1,329 @@
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+# Standard Library
+import io
+import time
+
+# External
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # Project
-from app.db import get_db
-from app.services import get_conversion
+from app.config import ASYNC_DB, CONVERSION_ENGINE, PARTITIONED, RESPONSE_CHUNK_SIZE, SAVE_MODE
+from app.db import get_async_db, get_db
+from app.schemas import (
+    BatchConversionRequest,
+    ConversionJob,
+    ConversionRequest,
+    ConversionScope,
+    TenantSummary,
+)
+from app.services import (
+    FLIGHTS,
+    ConversionResult,
+    TenantBusy,
+    aio_get_conversion,
+    aio_get_partitioned_conversion,
+    flight_key,
+    get_batch_conversion,
+    get_conversion,
+    get_conversion_job,
+    get_partitioned_conversion,
+    invalidate_breeding_catalog,
+    invalidate_cached_results,
+    submit_conversion_job,
+)
+
 
 conversion_router = APIRouter(prefix="/conversion", tags=["Conversion"])
 
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+RETRY_AFTER = 5
+CONVERSION_RESPONSES = {
+    200: {
+        "content": {JSON: {}, NDJSON: {}, ARROW_STREAM: {}},
+        "model": list[dict],
+        "description": (
+            "Converted rows in the negotiated format. With summary_only, or when the run went out"
+            " of core (over MEMORY_BUDGET_ROWS), a JSON TenantSummary instead; out-of-core"
+            " summaries carry out_of_core: true and the X-Out-Of-Core header."
+        ),
+    },
+    202: {
+        "content": {JSON: {}, NDJSON: {}, ARROW_STREAM: {}},
+        "description": (
+            "Partitioned run that is not complete: some shards were still held by other workers"
+            " after SHARD_WAIT seconds. The body holds only the claimed shards; the missing ones"
+            " are listed in X-Shards-Pending (and shards_pending in the summary). Retry later."
+        ),
+    },
+}
 
-@conversion_router.post("", status_code=status.HTTP_200_OK)
-def calculate_conversion(
-    payload: dict = Body(..., example={"client": "tecnoandina"}),
-    session: Session = Depends(get_db),
-) -> list[dict]:
-    try:
-        result = get_conversion(session)
-        return result
-    except OperationalError as e:
-        raise HTTPException(
+
+def conversion_error(e: Exception) -> HTTPException:
+    if isinstance(e, TenantBusy):
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(RETRY_AFTER)},
+        )
+    if isinstance(e, OperationalError):
+        return HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Database connection error: {str(e)}",
         )
-    except SQLAlchemyError as e:
-        raise HTTPException(
+    if isinstance(e, SQLAlchemyError):
+        return HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error: {str(e)}",
         )
-    except ValueError as e:
-        raise HTTPException(
+    if isinstance(e, ValueError):
+        return HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"Data validation error: {str(e)}",
         )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Unexpected error: {str(e)}",
+    )
+
+
+def request_scope(payload: ConversionRequest) -> ConversionScope | None:
+    scope = ConversionScope(**payload.model_dump(include=set(ConversionScope.model_fields)))
+    return scope if scope.model_dump(exclude_none=True) else None
+
+
+def negotiate_media_type(accept: str | None) -> str:
+    ## Primer tipo soportado en el orden de Accept; JSON por defecto
+    for media_type in (part.split(";")[0].strip() for part in (accept or "").split(",")):
+        if media_type in (JSON, NDJSON, ARROW_STREAM):
+            return media_type
+    return JSON
+
+
+def conversion_headers(result: ConversionResult) -> dict[str, str]:
+    headers = {
+        "X-Cache": "HIT" if result.cached else "MISS",
+        "X-Rows-Written": str(result.saved.written),
+    }
+    for count in ("inserted", "updated", "unchanged"):
+        if getattr(result.saved, count) is not None:
+            headers[f"X-Rows-{count.capitalize()}"] = str(getattr(result.saved, count))
+    if result.out_of_core:
+        headers["X-Out-Of-Core"] = "true"
+    if result.claimed is not None:
+        headers["X-Shards-Claimed"] = ",".join(map(str, result.claimed))
+        headers["X-Shards-Skipped"] = ",".join(map(str, result.skipped))
+        headers["X-Shards-Pending"] = ",".join(map(str, result.pending or []))
+    return headers
+
+
+def conversion_response(
+    payload: ConversionRequest, result: ConversionResult, accept: str | None, duration: float
+) -> Response:
+    headers = conversion_headers(result)
+    ## Shards aun tomados por otras replicas: el resultado esta incompleto
+    status_code = status.HTTP_202_ACCEPTED if result.pending else status.HTTP_200_OK
+    ## Fuera de memoria las filas ya se guardaron por rangos y no vuelven en la respuesta
+    if payload.summary_only or result.summary_only:
+        summary = TenantSummary(
+            client=payload.client,
+            rows=result.rows,
+            duration=round(duration, 3),
+            saved=result.saved,
+            cached=result.cached,
+            shards_claimed=result.claimed,
+            shards_skipped=result.skipped,
+            shards_pending=result.pending,
+            out_of_core=result.out_of_core,
+        )
+        return Response(
+            summary.model_dump_json(), status_code=status_code, media_type=JSON, headers=headers
+        )
+
+    ## Serializacion columnar desde Polars, sin objetos Python por fila
+    media_type = negotiate_media_type(accept)
+    if media_type == NDJSON:
+        return StreamingResponse(
+            (
+                chunk.write_ndjson().encode()
+                for chunk in result.data.iter_slices(n_rows=RESPONSE_CHUNK_SIZE)
+            ),
+            status_code=status_code,
+            media_type=NDJSON,
+            headers=headers,
+        )
+    if media_type == ARROW_STREAM:
+        buffer = io.BytesIO()
+        result.data.write_ipc_stream(buffer)
+        return Response(
+            buffer.getvalue(), status_code=status_code, media_type=ARROW_STREAM, headers=headers
+        )
+    return Response(
+        result.data.write_json(), status_code=status_code, media_type=JSON, headers=headers
+    )
+
+
+if ASYNC_DB:
+
+    @conversion_router.post(
+        "", status_code=status.HTTP_200_OK, response_class=Response, responses=CONVERSION_RESPONSES
+    )
+    async def calculate_conversion(
+        payload: ConversionRequest = Body(
+            ..., example={"client": "tecnoandina", "full_rebuild": False}
+        ),
+        accept: str | None = Header(None),
+        session: AsyncSession = Depends(get_async_db),
+    ) -> Response:
+        ts = time.perf_counter()
+        try:
+            partitioned = PARTITIONED if payload.partitioned is None else payload.partitioned
+            save_mode = payload.save_mode or SAVE_MODE
+            engine = payload.engine or CONVERSION_ENGINE
+            scope = request_scope(payload)
+            run = aio_get_partitioned_conversion if partitioned else aio_get_conversion
+            result = await FLIGHTS.aio_run(
+                payload.client,
+                flight_key(
+                    payload.client,
+                    payload.full_rebuild,
+                    save_mode,
+                    engine,
+                    scope,
+                    partitioned,
+                    payload.summary_only,
+                ),
+                lambda: run(
+                    session,
+                    tenant=payload.client,
+                    full_rebuild=payload.full_rebuild,
+                    save_mode=save_mode,
+                    engine=engine,
+                    scope=scope,
+                    summary_only=payload.summary_only,
+                ),
+            )
+            return conversion_response(payload, result, accept, time.perf_counter() - ts)
+        except Exception as e:
+            raise conversion_error(e)
+
+else:
+
+    @conversion_router.post(
+        "", status_code=status.HTTP_200_OK, response_class=Response, responses=CONVERSION_RESPONSES
+    )
+    def calculate_conversion(
+        payload: ConversionRequest = Body(
+            ..., example={"client": "tecnoandina", "full_rebuild": False}
+        ),
+        accept: str | None = Header(None),
+        session: Session = Depends(get_db),
+    ) -> Response:
+        ts = time.perf_counter()
+        try:
+            partitioned = PARTITIONED if payload.partitioned is None else payload.partitioned
+            save_mode = payload.save_mode or SAVE_MODE
+            engine = payload.engine or CONVERSION_ENGINE
+            scope = request_scope(payload)
+            run = get_partitioned_conversion if partitioned else get_conversion
+            result = FLIGHTS.run(
+                payload.client,
+                flight_key(
+                    payload.client,
+                    payload.full_rebuild,
+                    save_mode,
+                    engine,
+                    scope,
+                    partitioned,
+                    payload.summary_only,
+                ),
+                lambda: run(
+                    session,
+                    tenant=payload.client,
+                    full_rebuild=payload.full_rebuild,
+                    save_mode=save_mode,
+                    engine=engine,
+                    scope=scope,
+                    summary_only=payload.summary_only,
+                ),
+            )
+            return conversion_response(payload, result, accept, time.perf_counter() - ts)
+        except Exception as e:
+            raise conversion_error(e)
+
+
+@conversion_router.post("/batch", status_code=status.HTTP_200_OK)
+def calculate_batch_conversion(
+    payload: BatchConversionRequest = Body(
+        ..., example={"clients": ["tecnoandina"], "full_rebuild": False}
+    ),
+) -> list[TenantSummary]:
+    return get_batch_conversion(
+        payload.clients,
+        full_rebuild=payload.full_rebuild,
+        save_mode=payload.save_mode or SAVE_MODE,
+        engine=payload.engine or CONVERSION_ENGINE,
+        partitioned=PARTITIONED if payload.partitioned is None else payload.partitioned,
+    )
+
+
+@conversion_router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+def create_conversion_job(
+    payload: ConversionRequest = Body(
+        ..., example={"client": "tecnoandina", "full_rebuild": False}
+    ),
+) -> ConversionJob:
+    try:
+        return submit_conversion_job(
+            payload.client,
+            full_rebuild=payload.full_rebuild,
+            save_mode=payload.save_mode or SAVE_MODE,
+            engine=payload.engine or CONVERSION_ENGINE,
+            scope=request_scope(payload),
+            partitioned=PARTITIONED if payload.partitioned is None else payload.partitioned,
+        )
     except Exception as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Unexpected error: {str(e)}",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Job queue error: {str(e)}",
+        )
+
+
+@conversion_router.get("/jobs/{job_id}", status_code=status.HTTP_200_OK)
+def conversion_job_status(job_id: str) -> ConversionJob:
+    try:
+        job = get_conversion_job(job_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Job queue error: {str(e)}",
+        )
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+    return job
+
+
+@conversion_router.delete("/cache", status_code=status.HTTP_200_OK)
+def invalidate_conversion_cache(client: str | None = None) -> dict:
+    try:
+        return {"client": client, "invalidated": invalidate_cached_results(client)}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Result cache error: {str(e)}",
+        )
+
+
+@conversion_router.delete("/catalog", status_code=status.HTTP_200_OK)
+def invalidate_conversion_catalog(client: str | None = None) -> dict:
+    try:
+        return {"client": client, "invalidated": invalidate_breeding_catalog(client)}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Breeding catalog error: {str(e)}",
         )
@@ -0,0 +1,105 @@
+# External
+from fastapi import APIRouter, HTTPException, Query, status
+
+# Project
+from app.db import QUERY_STATS, get_pool_stats
+from app.services import (
+    EXPLAIN_QUERIES,
+    explain_extraction,
+    get_cache_stats,
+    get_catalog_stats,
+    get_flight_stats,
+    get_memory_report,
+    get_shard_leases,
+    get_view_stats,
+    refresh_tenant_view,
+)
+
+
+diagnostics_router = APIRouter(prefix="/diagnostics", tags=["Diagnostics"])
+
+
+@diagnostics_router.get("/pool", status_code=status.HTTP_200_OK)
+def pool_stats() -> dict:
+    return get_pool_stats()
+
+
+@diagnostics_router.get("/cache", status_code=status.HTTP_200_OK)
+def cache_stats() -> dict:
+    return get_cache_stats()
+
+
+@diagnostics_router.get("/catalog", status_code=status.HTTP_200_OK)
+def catalog_stats() -> dict:
+    return get_catalog_stats()
+
+
+@diagnostics_router.get("/flights", status_code=status.HTTP_200_OK)
+def flight_stats() -> dict:
+    return get_flight_stats()
+
+
+@diagnostics_router.get("/leases", status_code=status.HTTP_200_OK)
+def shard_leases(client: str | None = None) -> dict:
+    try:
+        return get_shard_leases(client)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Lease store error: {str(e)}",
+        )
+
+
+@diagnostics_router.get("/memory", status_code=status.HTTP_200_OK)
+def memory_report() -> dict:
+    return get_memory_report()
+
+
+@diagnostics_router.get("/queries", status_code=status.HTTP_200_OK)
+def query_stats() -> dict:
+    return QUERY_STATS.snapshot()
+
+
+@diagnostics_router.delete("/queries", status_code=status.HTTP_200_OK)
+def reset_query_stats() -> dict:
+    QUERY_STATS.reset()
+    return {"reset": True}
+
+
+@diagnostics_router.get("/explain", status_code=status.HTTP_200_OK)
+def explain_queries(client: str, query: list[str] | None = Query(default=None)) -> dict:
+    unknown = set(query or []) - set(EXPLAIN_QUERIES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown queries {sorted(unknown)}; expected any of {list(EXPLAIN_QUERIES)}",
+        )
+    try:
+        return explain_extraction(client, query)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error explaining queries for {client}: {str(e)}",
+        )
+
+
+@diagnostics_router.get("/views", status_code=status.HTTP_200_OK)
+def view_stats(client: str) -> dict:
+    try:
+        return get_view_stats(client)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error reading weights view state for {client}: {str(e)}",
+        )
+
+
+@diagnostics_router.post("/views/refresh", status_code=status.HTTP_200_OK)
+def refresh_view(client: str) -> dict:
+    try:
+        return refresh_tenant_view(client)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error refreshing weights view for {client}: {str(e)}",
+        )
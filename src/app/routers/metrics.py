@@ -0,0 +1,14 @@
+# External
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+
+# Project
+from app.services import get_metrics
+
+
+metrics_router = APIRouter(tags=["Metrics"])
+
+
+@metrics_router.get("/metrics", status_code=status.HTTP_200_OK, response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(get_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,10 +1,36 @@
 # from .conversion import ConversionRequest
 # Local
-from .conversion import ConversionRequest
-from .polars import weight_consumption_schema
+from .conversion import (
+    BatchConversionRequest,
+    ConversionJob,
+    ConversionRequest,
+    ConversionScope,
+    SaveSummary,
+    TenantSummary,
+)
+from .polars import (
+    compact_init_params_schema,
+    compact_standard_schema,
+    compact_weight_consumption_schema,
+    conversion_schema,
+    init_params_schema,
+    stored_conversion_schema,
+    weight_consumption_schema,
+)
 
 
 __all__ = [
+    "BatchConversionRequest",
+    "ConversionJob",
     "ConversionRequest",
+    "ConversionScope",
+    "SaveSummary",
+    "TenantSummary",
+    "compact_init_params_schema",
+    "compact_standard_schema",
+    "compact_weight_consumption_schema",
+    "conversion_schema",
+    "init_params_schema",
+    "stored_conversion_schema",
     "weight_consumption_schema",
 ]
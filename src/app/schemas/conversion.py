@@ -1,7 +1,82 @@
 # Standard Library
+import datetime as dt
+from typing import Literal
 
 # External
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
-class ConversionRequest(BaseModel): ...
+class ConversionScope(BaseModel):
+    id_breeding: list[int] | None = Field(None, min_length=1)
+    date_from: dt.date | None = None
+    date_to: dt.date | None = None
+    id_stage: int | None = None
+    sex: str | None = None
+
+    @model_validator(mode="after")
+    def check_dates(self) -> "ConversionScope":
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError(f"date_from {self.date_from} is after date_to {self.date_to}")
+        return self
+
+
+class ConversionRequest(ConversionScope):
+    client: str
+    full_rebuild: bool = False
+    save_mode: Literal["upsert", "diff"] | None = None
+    engine: Literal["polars", "sql"] | None = None
+    partitioned: bool | None = None
+    summary_only: bool = Field(
+        False,
+        description=(
+            "Return only row and save counts instead of the converted rows. Pipelined runs"
+            " (PIPELINE_CHUNK_BREEDINGS) then drop each chunk's rows once saved. Out-of-core"
+            " runs (over MEMORY_BUDGET_ROWS) always return the summary, with out_of_core set."
+        ),
+    )
+
+
+class SaveSummary(BaseModel):
+    mode: Literal["upsert", "diff"]
+    written: int = 0
+    inserted: int | None = None
+    updated: int | None = None
+    unchanged: int | None = None
+
+
+class BatchConversionRequest(BaseModel):
+    clients: list[str] = Field(..., min_length=1)
+    full_rebuild: bool = False
+    save_mode: Literal["upsert", "diff"] | None = None
+    engine: Literal["polars", "sql"] | None = None
+    partitioned: bool | None = None
+
+
+class TenantSummary(BaseModel):
+    client: str
+    rows: int = 0
+    duration: float = 0.0
+    saved: SaveSummary | None = None
+    cached: bool = False
+    shards_claimed: list[int] | None = None
+    shards_skipped: list[int] | None = None
+    shards_pending: list[int] | None = None
+    out_of_core: bool = False
+    error: str | None = None
+
+
+class ConversionJob(BaseModel):
+    id: str
+    client: str
+    full_rebuild: bool = False
+    save_mode: Literal["upsert", "diff"]
+    engine: Literal["polars", "sql"] = "polars"
+    scope: ConversionScope | None = None
+    partitioned: bool = False
+    status: Literal["queued", "running", "done", "failed"] = "queued"
+    stage: str | None = None
+    rows_processed: int = 0
+    created_at: dt.datetime
+    updated_at: dt.datetime
+    summary: TenantSummary | None = None
+    error: str | None = None
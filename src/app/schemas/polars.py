@@ -13,4 +13,64 @@ weight_consumption_schema = {
     "initial_age": pl.Int64,
     "initial_total_quantity": pl.Int64,
     "id_breeding": pl.Int64,
+    "changed_at": pl.Datetime,
+}
+
+## Tipos compactos (COMPACT_DTYPES): cada columna sólo se reduce si el valor vuelve intacto
+compact_weight_consumption_schema = {
+    "measured_weight": pl.Float32,
+    "animals_age": pl.UInt16,
+    "date": pl.Date,
+    "entity_accumulated_consumption": pl.Float32,
+    "animal_accumulated_consumption": pl.Float32,
+    "stock": pl.Int32,
+    "initial_weight_avg": pl.Float32,
+    "initial_age": pl.UInt16,
+    "initial_total_quantity": pl.Int32,
+    "id_breeding": pl.Int32,
+}
+
+init_params_schema = {
+    "idta": pl.Int64,
+    "parent_id": pl.Int64,
+    "breeding_code": pl.String,
+    "geneticaPredominante": pl.String,
+    "sex": pl.String,
+    "id_breeding": pl.Int64,
+    "id_stage": pl.Int64,
+}
+
+compact_init_params_schema = {
+    "idta": pl.Int32,
+    "parent_id": pl.Int32,
+    "geneticaPredominante": pl.Categorical,
+    "sex": pl.Categorical,
+    "id_breeding": pl.Int32,
+    "id_stage": pl.UInt16,
+}
+
+compact_standard_schema = {
+    "animals_age": pl.UInt16,
+    "sex": pl.Categorical,
+    "nombreGenetica": pl.Categorical,
+    "id_stage": pl.UInt16,
+}
+
+conversion_schema = {
+    "id_breeding": pl.Int64,
+    "animals_age": pl.Int64,
+    "date": pl.Date,
+    "animal_accumulated_conversion": pl.Float64,
+    "accumulated_standard_conversion": pl.Float64,
+    "entity_accumulated_conversion": pl.Float64,
+    "calculation_formula_version": pl.String,
+}
+
+stored_conversion_schema = {
+    "id_breeding": pl.Int64,
+    "date": pl.Date,
+    "animal_accumulated_conversion": pl.Float64,
+    "entity_accumulated_conversion": pl.Float64,
+    "accumulated_standard_conversion": pl.Float64,
+    "calculation_formula_version": pl.String,
 }
@@ -1,7 +1,65 @@
 # Local
-from .conversion import get_conversion
+from .batch import get_batch_conversion, run_tenant_conversion
+from .cache import (
+    get_cache_stats,
+    get_catalog_stats,
+    invalidate_breeding_catalog,
+    invalidate_cached_results,
+)
+from .conversion import (
+    ConversionResult,
+    aio_compute_conversion,
+    aio_get_conversion,
+    compute_conversion,
+    get_conversion,
+    transform_conversion,
+)
+from .diagnostics import EXPLAIN_QUERIES, explain_extraction, summarize_plan
+from .flights import FLIGHTS, SingleFlight, TenantBusy, flight_key, get_flight_stats
+from .jobs import JOB_RUNNER, JobRunner, get_conversion_job, submit_conversion_job
+from .metrics import get_memory_report, get_metrics
+from .partition import (
+    aio_get_partitioned_conversion,
+    get_partitioned_conversion,
+    get_shard_leases,
+    partition_breedings,
+)
+from .views import VIEW_REFRESHER, ViewRefresher, get_view_stats, refresh_tenant_view
 
 
 __all__ = [
+    "ConversionResult",
+    "EXPLAIN_QUERIES",
+    "FLIGHTS",
+    "JOB_RUNNER",
+    "JobRunner",
+    "SingleFlight",
+    "TenantBusy",
+    "VIEW_REFRESHER",
+    "ViewRefresher",
+    "aio_compute_conversion",
+    "aio_get_conversion",
+    "aio_get_partitioned_conversion",
+    "compute_conversion",
+    "explain_extraction",
+    "flight_key",
+    "get_batch_conversion",
+    "get_cache_stats",
+    "get_catalog_stats",
+    "get_conversion_job",
+    "get_flight_stats",
+    "get_memory_report",
+    "get_metrics",
+    "get_partitioned_conversion",
+    "get_shard_leases",
+    "get_view_stats",
+    "refresh_tenant_view",
+    "run_tenant_conversion",
     "get_conversion",
+    "invalidate_breeding_catalog",
+    "invalidate_cached_results",
+    "partition_breedings",
+    "submit_conversion_job",
+    "summarize_plan",
+    "transform_conversion",
 ]
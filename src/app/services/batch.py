@@ -0,0 +1,107 @@
+# Standard Library
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+# Project
+from app.config import BATCH_MAX_WORKERS, CONVERSION_ENGINE, LOGGER, PARTITIONED, SAVE_MODE
+from app.db import get_session
+from app.schemas import ConversionScope, TenantSummary
+
+# Local
+from .conversion import ConversionResult, get_conversion
+from .flights import FLIGHTS, flight_key
+from .partition import get_partitioned_conversion
+
+
+def convert_tenant(
+    tenant: str,
+    full_rebuild: bool = False,
+    save_mode: str = SAVE_MODE,
+    progress: Callable[[str, int], None] | None = None,
+    engine: str = CONVERSION_ENGINE,
+    scope: ConversionScope | None = None,
+    partitioned: bool = PARTITIONED,
+) -> ConversionResult:
+    ## Lotes y trabajos sólo informan conteos: el calculo no acumula filas
+    with get_session(tenant) as session:
+        return (get_partitioned_conversion if partitioned else get_conversion)(
+            session,
+            tenant=tenant,
+            full_rebuild=full_rebuild,
+            save_mode=save_mode,
+            progress=progress,
+            engine=engine,
+            scope=scope,
+            summary_only=True,
+        )
+
+
+def run_tenant_conversion(
+    tenant: str,
+    full_rebuild: bool = False,
+    save_mode: str = SAVE_MODE,
+    progress: Callable[[str, int], None] | None = None,
+    engine: str = CONVERSION_ENGINE,
+    scope: ConversionScope | None = None,
+    partitioned: bool = PARTITIONED,
+) -> TenantSummary:
+    ts = time.perf_counter()
+    try:
+        ## Mismo limite por tenant y coalescencia que POST /conversion: lotes y trabajos no
+        ## apilan calculos pesados sobre un tenant ocupado (TenantBusy queda como error)
+        result = FLIGHTS.run(
+            tenant,
+            flight_key(tenant, full_rebuild, save_mode, engine, scope, partitioned, True),
+            lambda: convert_tenant(
+                tenant,
+                full_rebuild=full_rebuild,
+                save_mode=save_mode,
+                progress=progress,
+                engine=engine,
+                scope=scope,
+                partitioned=partitioned,
+            ),
+        )
+        return TenantSummary(
+            client=tenant,
+            rows=result.rows,
+            duration=round(time.perf_counter() - ts, 3),
+            saved=result.saved,
+            cached=result.cached,
+            shards_claimed=result.claimed,
+            shards_skipped=result.skipped,
+            shards_pending=result.pending,
+            out_of_core=result.out_of_core,
+        )
+    except Exception as e:
+        LOGGER.error(f"Error computing conversion for tenant {tenant}: {e}")
+        return TenantSummary(
+            client=tenant, duration=round(time.perf_counter() - ts, 3), error=str(e)
+        )
+
+
+def get_batch_conversion(
+    tenants: list[str],
+    full_rebuild: bool = False,
+    save_mode: str = SAVE_MODE,
+    max_workers: int = BATCH_MAX_WORKERS,
+    engine: str = CONVERSION_ENGINE,
+    partitioned: bool = PARTITIONED,
+) -> list[TenantSummary]:
+    tenants = list(dict.fromkeys(tenants))
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(tenants))), thread_name_prefix="batch"
+    ) as executor:
+        futures = [
+            executor.submit(
+                run_tenant_conversion,
+                tenant,
+                full_rebuild=full_rebuild,
+                save_mode=save_mode,
+                engine=engine,
+                partitioned=partitioned,
+            )
+            for tenant in tenants
+        ]
+        return [future.result() for future in futures]
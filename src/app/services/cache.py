@@ -0,0 +1,91 @@
+# Standard Library
+import hashlib
+import io
+from typing import Any
+
+# External
+import polars as pl
+
+# Project
+from app.config import CACHE_ENABLED, CACHE_MAX_BYTES, CONVERSION_ENGINE, LOGGER, SAVE_MODE, VERSION
+from app.db import RESULT_CACHE
+from app.schemas import ConversionScope, SaveSummary
+from app.utilities import CATALOG, STANDARDS
+
+
+SAVED_KEY = "saved"
+
+
+def source_fingerprint(
+    stats: list[Any],
+    engine: str = CONVERSION_ENGINE,
+    scope: ConversionScope | None = None,
+    save_mode: str = SAVE_MODE,
+) -> str:
+    ## Filas y ultimo cambio por tabla fuente, version de la formula, hash del estandar, motor y
+    ## modo de guardado: el resumen de upsert y el de diff no son intercambiables
+    digest = hashlib.sha256()
+    for source, rows, changed_at in sorted(stats, key=lambda row: row[0]):
+        digest.update(f"{source}:{rows}:{changed_at.isoformat() if changed_at else ''};".encode())
+    digest.update(f"{VERSION}:{STANDARDS.load().digest}:{engine}:{save_mode}".encode())
+    if scope is not None:
+        digest.update(scope.model_dump_json().encode())
+    return digest.hexdigest()
+
+
+def dump_result(data: pl.DataFrame, saved: SaveSummary) -> bytes:
+    buffer = io.BytesIO()
+    data.write_parquet(buffer, metadata={SAVED_KEY: saved.model_dump_json()})
+    return buffer.getvalue()
+
+
+def load_result(raw: bytes) -> tuple[pl.DataFrame, SaveSummary]:
+    metadata = pl.read_parquet_metadata(io.BytesIO(raw))
+    return pl.read_parquet(io.BytesIO(raw)), SaveSummary.model_validate_json(metadata[SAVED_KEY])
+
+
+def get_cached_result(tenant: str, fingerprint: str) -> tuple[pl.DataFrame, SaveSummary] | None:
+    if not CACHE_ENABLED:
+        return None
+    try:
+        raw = RESULT_CACHE.get(f"{tenant}:{fingerprint}")
+        return load_result(raw) if raw is not None else None
+    except Exception as e:
+        LOGGER.warning(f"Result cache lookup failed for {tenant}: {e}")
+        return None
+
+
+def set_cached_result(
+    tenant: str, fingerprint: str, data: pl.DataFrame, saved: SaveSummary
+) -> None:
+    if not CACHE_ENABLED:
+        return
+    try:
+        raw = dump_result(data, saved)
+        ## Un resultado grande desplazaria al resto de la cache (o superaria el limite de Redis)
+        if len(raw) > CACHE_MAX_BYTES:
+            LOGGER.info(
+                f"Result for {tenant} not cached: {len(raw)} bytes over the {CACHE_MAX_BYTES} limit"
+            )
+            return
+        RESULT_CACHE.set(f"{tenant}:{fingerprint}", raw)
+    except Exception as e:
+        LOGGER.warning(f"Result cache store failed for {tenant}: {e}")
+
+
+def invalidate_cached_results(tenant: str | None = None) -> int:
+    invalidated = RESULT_CACHE.invalidate(f"{tenant}:" if tenant else "")
+    LOGGER.info(f"Result cache invalidated for {tenant or 'all tenants'}: {invalidated} entries")
+    return invalidated
+
+
+def get_cache_stats() -> dict:
+    return {"enabled": CACHE_ENABLED, **RESULT_CACHE.stats()}
+
+
+def invalidate_breeding_catalog(tenant: str | None = None) -> int:
+    return CATALOG.invalidate(tenant)
+
+
+def get_catalog_stats() -> dict:
+    return CATALOG.stats()
@@ -1,78 +1,239 @@
+# Standard Library
+import asyncio
+import datetime as dt
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Iterator
+
 # External
 import polars as pl
 
 ###################
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # Project
-from app.config import LOGGER, VERSION
-from app.schemas import weight_consumption_schema
-from app.utilities import get_init_params, get_standard, get_weights_consumptions, save_conversion
-
-def get_conversion(session: Session) -> list[dict]:
-    init_params = get_init_params(session)
-    init_params
-
-    id_breeding_list = list(set([i.id_breeding for i in init_params]))
-    convert_data_df = get_weights_consumptions(session, id_breeding_list)
+from app.config import (
+    BREEDING_MAX_ROWS,
+    COMPACT_DTYPES,
+    CONVERSION_ENGINE,
+    LOGGER,
+    MEMORY_BUDGET_ROWS,
+    PIPELINE_CHUNK_BREEDINGS,
+    PIPELINE_SAVE_QUEUE,
+    PIPELINE_TRANSFORM_QUEUE,
+    SAVE_MODE,
+    SPILL_PARTITION_ROWS,
+    TRANSFORM_PROFILE,
+    TRANSFORM_STREAMING_ROWS,
+    VERSION,
+)
+from app.db import get_async_session, get_session
+from app.schemas import ConversionScope, SaveSummary, conversion_schema
+from app.utilities import (
+    STANDARDS,
+    TENANT,
+    WATERMARKS,
+    CatalogEntry,
+    aio_ctx_timer,
+    aio_get_breeding_catalog,
+    aio_get_breeding_changes,
+    aio_get_breeding_row_counts,
+    aio_get_source_stats,
+    aio_get_weights_consumptions,
+    aio_iter_breeding_groups,
+    aio_merge_conversion_in_db,
+    aio_run_pipeline,
+    aio_save_conversion,
+    aio_spill_weights_consumptions,
+    ctx_timer,
+    get_breeding_catalog,
+    get_breeding_changes,
+    get_breeding_row_counts,
+    get_source_stats,
+    get_weights_consumptions,
+    iter_breeding_groups,
+    merge_conversion_in_db,
+    peak_rss,
+    run_pipeline,
+    save_conversion,
+    scan_spill,
+    spill_folder,
+    spill_weights_consumptions,
+    watermark_generation,
+    widen_floats,
+)
 
-    init_df = pl.DataFrame(data=init_params)
-    convert_data_df = pl.DataFrame(
-        data=convert_data_df, orient="row", schema=weight_consumption_schema
-    )
+# Local
+from .cache import get_cached_result, set_cached_result, source_fingerprint
 
-    if convert_data_df.is_empty():
-        LOGGER.warning("No conversion data found for the breeding list. Returning empty result.")
-        return []
 
-    standard_df = get_standard()
-    if init_df.is_empty():
-        LOGGER.warning("No initial parameters found. Returning empty result.")
-        return []
-
-    convert_data_df = convert_data_df.with_columns(
+def impute_stock(convert_data: pl.LazyFrame) -> pl.LazyFrame:
+    convert_data = convert_data.with_columns(
         stock=pl.when(pl.col("animals_age") == pl.col("initial_age"))
         .then(pl.col("initial_total_quantity"))
         .otherwise(pl.col("stock"))
     )
-    prodhouse_del = (
-        convert_data_df.filter(pl.col("stock").is_null())["id_breeding"].unique().to_list()
+
+    ## Por crianza: ultimo stock conocido (ordenado por fecha) y stock inicial como respaldo
+    convert_data = convert_data.with_columns(
+        stock_imputed=pl.col("stock").is_null().any().over("id_breeding"),
+        _latest_stock=pl.col("stock")
+        .sort_by("date", maintain_order=True)
+        .drop_nulls()
+        .last()
+        .over("id_breeding"),
+        _initial_stock=pl.col("initial_total_quantity").first().over("id_breeding"),
     )
+    has_initial_stock = pl.col("_initial_stock").is_not_null() & (pl.col("_initial_stock") != 0)
+    convert_data = convert_data.with_columns(
+        stock=pl.when(~pl.col("stock_imputed"))
+        .then(pl.col("stock"))
+        .when(pl.col("_latest_stock").is_not_null())
+        .then(pl.col("_latest_stock"))
+        .when(has_initial_stock)
+        .then(pl.col("initial_total_quantity"))
+    )
+
+    ## Crianzas sin stock imputable quedan marcadas para descartarse
+    return convert_data.with_columns(
+        _dropped=(pl.col("stock_imputed") & pl.col("stock").is_null()).any().over("id_breeding")
+    ).drop("_latest_stock", "_initial_stock")
+
+
+def imputation_stats(imputed: pl.LazyFrame) -> pl.LazyFrame:
+    return imputed.select(
+        rows_in=pl.len(),
+        rows_out=(~pl.col("_dropped")).sum(),
+        imputed=pl.col("id_breeding")
+        .filter(pl.col("stock_imputed") & ~pl.col("_dropped"))
+        .n_unique(),
+        dropped=pl.col("id_breeding").filter(pl.col("_dropped")).unique().sort().implode(),
+    )
+
 
-    for idbreeding_i in prodhouse_del:
-        clean_df = convert_data_df.filter(pl.col("id_breeding") == idbreeding_i).drop_nulls(
-            subset=pl.col("stock")
+def log_imputation(stats: pl.DataFrame) -> None:
+    stats = stats.row(0, named=True)
+    ## Un solo registro por lote en lugar de uno por crianza descartada
+    if stats["dropped"]:
+        LOGGER.warning(
+            f"No stock values for breedings {stats['dropped']}. Impossible to replace or impute."
         )
-        initial_stock = (
-            convert_data_df.filter(pl.col("id_breeding") == idbreeding_i)["initial_total_quantity"]
-            .unique()
-            .item()
+    LOGGER.info(
+        f"Stock imputation: {stats['rows_in']} rows in, {stats['rows_out']} rows out, "
+        f"{stats['imputed']} breedings imputed, {len(stats['dropped'])} dropped"
+    )
+
+
+def get_changed_breedings(
+    id_breeding_list: list[int],
+    changes: dict[int, dt.datetime],
+    watermarks: dict[int, dt.datetime],
+) -> list[int]:
+    return [
+        id_breeding
+        for id_breeding in id_breeding_list
+        if id_breeding not in watermarks
+        or (changes.get(id_breeding) is not None and changes[id_breeding] > watermarks[id_breeding])
+    ]
+
+
+def scope_breedings(init_df: pl.DataFrame, scope: ConversionScope | None) -> pl.DataFrame:
+    if scope is None:
+        return init_df
+    predicates = []
+    if scope.id_breeding is not None:
+        predicates.append(pl.col("id_breeding").is_in(scope.id_breeding))
+    if scope.id_stage is not None:
+        predicates.append(pl.col("id_stage") == scope.id_stage)
+    if scope.sex is not None:
+        predicates.append(pl.col("sex") == scope.sex)
+    return init_df.filter(*predicates) if predicates else init_df
+
+
+def filter_date_window(convert_data: pl.LazyFrame, scope: ConversionScope | None) -> pl.LazyFrame:
+    ## Despues de imputar: el stock de la ventana depende de toda la historia de la crianza
+    if scope is not None and scope.date_from is not None:
+        convert_data = convert_data.filter(pl.col("date").dt.date() >= scope.date_from)
+    if scope is not None and scope.date_to is not None:
+        convert_data = convert_data.filter(pl.col("date").dt.date() <= scope.date_to)
+    return convert_data
+
+
+def update_watermarks(
+    tenant: str,
+    id_breeding_list: list[int],
+    changes: dict[int, dt.datetime],
+    active_breeding_list: list[int],
+    scope: ConversionScope | None = None,
+) -> None:
+    ## Con ventana de fechas sólo se escribe parte de cada crianza: su marca no avanza
+    if scope is not None and (scope.date_from is not None or scope.date_to is not None):
+        return
+    WATERMARKS.update(
+        tenant,
+        watermark_generation(),
+        {i: changes[i] for i in id_breeding_list if changes.get(i) is not None},
+        active=active_breeding_list,
+    )
+
+
+def match_key(other: pl.LazyFrame, convert_data: pl.LazyFrame) -> pl.LazyFrame:
+    ## Con tipos compactos la clave del lado pequeño toma el tipo de las filas extraidas
+    dtype = convert_data.collect_schema()["id_breeding"]
+    return other.with_columns(pl.col("id_breeding").cast(dtype, strict=False))
+
+
+def filter_changed_rows(
+    convert_data: pl.LazyFrame, watermarks: dict[int, dt.datetime]
+) -> pl.LazyFrame:
+    if not watermarks:
+        return convert_data
+
+    watermark_df = pl.LazyFrame(
+        {"id_breeding": list(watermarks), "watermark": list(watermarks.values())},
+        schema={"id_breeding": pl.Int64, "watermark": pl.Datetime},
+    ).pipe(match_key, convert_data)
+    ## Si el stock fue imputado, cualquier cambio en la crianza altera todas sus filas
+    return (
+        convert_data.join(watermark_df, on="id_breeding", how="left")
+        .filter(
+            pl.col("watermark").is_null()
+            | (pl.col("changed_at") > pl.col("watermark"))
+            | pl.col("stock_imputed")
         )
+        .drop("watermark")
+    )
 
-        if clean_df.is_empty() and initial_stock:
-            convert_data_df = convert_data_df.with_columns(
-                stock=pl.when(pl.col("id_breeding") == idbreeding_i)
-                .then(pl.col("initial_total_quantity"))
-                .otherwise(pl.col("stock"))
-            )
-        elif not clean_df.is_empty():
-            ## Imputar stocks por ultimo valor disponible
-            latest_stock = (
-                clean_df.filter(pl.col("id_breeding") == idbreeding_i)
-                .sort("date")
-                .tail(n=1)["stock"]
-                .item()
-            )
-            convert_data_df = convert_data_df.with_columns(
-                stock=pl.when(pl.col("id_breeding") == idbreeding_i)
-                .then(pl.lit(latest_stock))
-                .otherwise(pl.col("stock"))
-            )
-        else:
-            convert_data_df = convert_data_df.remove((pl.col("id_breeding") == idbreeding_i))
-            LOGGER.warning(f"No stock values for {idbreeding_i}. Impossible to replace or impute.")
 
-    convert_data_df = convert_data_df.with_columns(
+@dataclass
+class ConversionResult:
+    data: pl.DataFrame
+    saved: SaveSummary
+    cached: bool = False
+    claimed: list[int] | None = None
+    skipped: list[int] | None = None
+    pending: list[int] | None = None
+    rows: int | None = None
+    summary_only: bool = False
+    out_of_core: bool = False
+
+    def __post_init__(self) -> None:
+        if self.rows is None:
+            self.rows = self.data.height
+
+
+def conversion_plan(
+    imputed: pl.LazyFrame,
+    init_df: pl.LazyFrame,
+    watermarks: dict[int, dt.datetime] | None = None,
+    scope: ConversionScope | None = None,
+) -> pl.LazyFrame:
+    convert_data = filter_date_window(imputed.filter(~pl.col("_dropped")).drop("_dropped"), scope)
+    convert_data = convert_data.with_columns(widen_floats())
+    if watermarks:
+        convert_data = filter_changed_rows(convert_data, watermarks)
+
+    convert_data = convert_data.with_columns(
         animal_accumulated_conversion=(
             pl.col("animal_accumulated_consumption")
             / (pl.col("measured_weight") - pl.col("initial_weight_avg"))
@@ -80,11 +241,10 @@ def get_conversion(session: Session) -> list[dict]:
         weight_delta=(pl.col("measured_weight") * pl.col("stock"))
         - (pl.col("initial_weight_avg") * pl.col("initial_total_quantity")),
     )
-    convert_data_df = convert_data_df.with_columns(
+    convert_data = convert_data.with_columns(
         entity_accumulated_conversion=(
             pl.col("entity_accumulated_consumption") / pl.col("weight_delta")
         ).round(6),
-        calculation_formula_version=pl.lit(VERSION),
     )
     zero_cond_entity = (pl.col("entity_accumulated_conversion") < 0) | (
         pl.col("entity_accumulated_conversion").is_infinite()
@@ -92,7 +252,7 @@ def get_conversion(session: Session) -> list[dict]:
     zero_cond_animal = (pl.col("animal_accumulated_conversion") < 0) | (
         pl.col("animal_accumulated_conversion").is_infinite()
     )
-    convert_data_df = convert_data_df.with_columns(
+    convert_data = convert_data.with_columns(
         entity_accumulated_conversion=pl.when(zero_cond_entity)
         .then(pl.lit(0))
         .otherwise(pl.col("entity_accumulated_conversion")),
@@ -100,27 +260,697 @@ def get_conversion(session: Session) -> list[dict]:
         .then(pl.lit(0))
         .otherwise(pl.col("animal_accumulated_conversion")),
     )
-    convert_data_df = convert_data_df.join(other=init_df, on="id_breeding", how="left").join(
-        other=standard_df, on=["animals_age", "sex", "id_stage"], how="left"
+    convert_data = convert_data.join(
+        other=init_df.pipe(match_key, convert_data), on="id_breeding", how="left"
+    ).with_columns(STANDARDS.load().lookup_expr("animal_accumulated_standard_conversion"))
+
+    ## Proyeccion final: el optimizador descarta todo lo que no llega a estas columnas
+    return convert_data.select(
+        "id_breeding",
+        "animals_age",
+        "date",
+        "animal_accumulated_conversion",
+        pl.col("animal_accumulated_standard_conversion").alias("accumulated_standard_conversion"),
+        "entity_accumulated_conversion",
+        calculation_formula_version=pl.lit(VERSION),
+    ).cast(conversion_schema)
+
+
+def collect_transform(
+    convert_data_df: pl.DataFrame | pl.LazyFrame,
+    init_df: pl.DataFrame,
+    watermarks: dict[int, dt.datetime] | None = None,
+    profile: str = TRANSFORM_PROFILE,
+    scope: ConversionScope | None = None,
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    imputed = impute_stock(convert_data_df.lazy())
+    plan = conversion_plan(imputed, init_df.lazy(), watermarks=watermarks, scope=scope)
+    ## Un LazyFrame viene de los Parquet del modo fuera de memoria: siempre streaming
+    streaming = (
+        isinstance(convert_data_df, pl.LazyFrame)
+        or convert_data_df.height > TRANSFORM_STREAMING_ROWS
+    )
+    engine = "streaming" if streaming else "auto"
+
+    with ctx_timer("transform") as stage:
+        if profile == "explain":
+            LOGGER.info(f"Conversion plan:\n{plan.explain(engine=engine)}")
+        if profile == "profile":
+            convert_data_df, timings = plan.profile(engine=engine)
+            stats = imputation_stats(imputed).collect()
+            for node, start, end in timings.sort(
+                pl.col("end") - pl.col("start"), descending=True
+            ).iter_rows():
+                LOGGER.info(f"Conversion profile: {node}: {(end - start) / 1000:.3f} ms")
+        else:
+            ## Ambos planes comparten la imputacion; collect_all la calcula una sola vez
+            convert_data_df, stats = pl.collect_all(
+                [plan, imputation_stats(imputed)], engine=engine
+            )
+        stage.rows, stage.bytes = convert_data_df.height, int(convert_data_df.estimated_size())
+    return convert_data_df, stats
+
+
+def transform_conversion(
+    convert_data_df: pl.DataFrame | pl.LazyFrame,
+    init_df: pl.DataFrame,
+    watermarks: dict[int, dt.datetime] | None = None,
+    profile: str = TRANSFORM_PROFILE,
+    scope: ConversionScope | None = None,
+) -> pl.DataFrame:
+    convert_data_df, stats = collect_transform(
+        convert_data_df, init_df, watermarks=watermarks, profile=profile, scope=scope
+    )
+    log_imputation(stats)
+    return convert_data_df
+
+
+def merge_imputation_stats(stats: list[pl.DataFrame]) -> pl.DataFrame:
+    return pl.concat(stats).select(
+        pl.col("rows_in").sum(),
+        pl.col("rows_out").sum(),
+        pl.col("imputed").sum(),
+        pl.col("dropped").explode().drop_nulls().sort().implode(),
+    )
+
+
+def transform_groups(
+    groups: Iterator[pl.DataFrame],
+    init_df: pl.DataFrame,
+    watermarks: dict[int, dt.datetime] | None = None,
+    scope: ConversionScope | None = None,
+    progress: Callable[[str, int], None] | None = None,
+) -> tuple[pl.DataFrame, int, float]:
+    ## Grupo a grupo de crianzas completas: de la entrada sólo vive un grupo a la vez; la salida
+    ## se acumula porque la respuesta la devuelve
+    outputs, stats, rows, extracted = [], [], 0, 0.0
+    for group in groups:
+        rows += group.height
+        extracted = max(extracted, group.estimated_size("mb"))
+        if progress is not None:
+            progress("transform", rows)
+        data, group_stats = collect_transform(group, init_df, watermarks=watermarks, scope=scope)
+        outputs.append(data)
+        stats.append(group_stats)
+    if stats:
+        log_imputation(merge_imputation_stats(stats))
+    data = pl.concat(outputs) if outputs else pl.DataFrame(schema=conversion_schema)
+    return data, rows, extracted
+
+
+async def aio_transform_groups(
+    groups: AsyncIterator[pl.DataFrame],
+    init_df: pl.DataFrame,
+    watermarks: dict[int, dt.datetime] | None = None,
+    scope: ConversionScope | None = None,
+) -> tuple[pl.DataFrame, int, float]:
+    outputs, stats, rows, extracted = [], [], 0, 0.0
+    async for group in groups:
+        rows += group.height
+        extracted = max(extracted, group.estimated_size("mb"))
+        ## Polars libera el GIL; cada grupo se transforma en un hilo para no bloquear el event loop
+        data, group_stats = await asyncio.to_thread(
+            collect_transform, group, init_df, watermarks, scope=scope
+        )
+        outputs.append(data)
+        stats.append(group_stats)
+    if stats:
+        log_imputation(merge_imputation_stats(stats))
+    data = pl.concat(outputs) if outputs else pl.DataFrame(schema=conversion_schema)
+    return data, rows, extracted
+
+
+def log_memory(tenant: str, extracted: float | None, converted: float) -> None:
+    LOGGER.info(
+        f"{tenant}: memory extract "
+        f"{'spilled to disk' if extracted is None else f'{extracted:.1f} MB'}, transform "
+        f"{converted:.1f} MB, peak RSS {peak_rss() / 2**20:.1f} MB"
+        f"{' (compact dtypes)' if COMPACT_DTYPES else ''}"
+    )
+
+
+def merge_results(results: list[ConversionResult], save_mode: str) -> ConversionResult:
+    saved = SaveSummary(mode=save_mode)
+    for result in results:
+        saved.written += result.saved.written
+        for count in ("inserted", "updated", "unchanged"):
+            if getattr(result.saved, count) is not None:
+                setattr(saved, count, (getattr(saved, count) or 0) + getattr(result.saved, count))
+    summary_only = any(result.summary_only for result in results)
+    data = (
+        pl.concat([result.data for result in results])
+        if results and not summary_only
+        else pl.DataFrame(schema=conversion_schema)
+    )
+    return ConversionResult(
+        data=data,
+        saved=saved,
+        rows=sum(result.rows for result in results),
+        summary_only=summary_only,
+        out_of_core=any(result.out_of_core for result in results),
+    )
+
+
+def summarize_result(data: pl.DataFrame, saved: SaveSummary) -> ConversionResult:
+    ## El rango ya quedo guardado: se conserva sólo el conteo para no acumular la salida completa
+    return ConversionResult(
+        data=pl.DataFrame(schema=conversion_schema),
+        saved=saved,
+        rows=data.height,
+        summary_only=True,
+    )
+
+
+def spill_partitions(
+    id_breeding_list: list[int],
+    row_counts: dict[int, int],
+    partition_rows: int = SPILL_PARTITION_ROWS,
+) -> list[list[int]]:
+    ## Rangos contiguos de id_breeding con a lo sumo partition_rows filas estimadas
+    partitions, rows = [[]], 0
+    for id_breeding in sorted(id_breeding_list):
+        count = row_counts.get(id_breeding, 0)
+        if partitions[-1] and rows + count > partition_rows:
+            partitions.append([])
+            rows = 0
+        partitions[-1].append(id_breeding)
+        rows += count
+    return partitions if partitions[-1] else []
+
+
+def needs_row_counts(
+    id_breeding_list: list[int],
+    budget: int = MEMORY_BUDGET_ROWS,
+    breeding_rows: int = BREEDING_MAX_ROWS,
+) -> bool:
+    ## Cota superior desde el catalogo: si ni en el peor caso se supera el presupuesto, no se cuenta
+    return bool(budget) and len(id_breeding_list) * breeding_rows > budget
+
+
+def over_budget(tenant: str, row_counts: dict[int, int], budget: int = MEMORY_BUDGET_ROWS) -> bool:
+    rows = sum(row_counts.values())
+    if not budget or rows <= budget:
+        return False
+    LOGGER.info(
+        f"{tenant}: {rows} estimated rows over the {budget} row budget, running out of core"
     )
+    return True
 
-    convert_data_df = convert_data_df[
-        [
-            "id_breeding",
-            "animals_age",
-            "date",
-            "animal_accumulated_conversion",
-            "animal_accumulated_standard_conversion",
-            "entity_accumulated_conversion",
-        ]
+
+def compute_spilled(
+    session: Session,
+    tenant: str,
+    partitions: list[list[int]],
+    init_df: pl.DataFrame,
+    changes: dict[int, dt.datetime],
+    watermarks: dict[int, dt.datetime],
+    save_mode: str,
+    scope: ConversionScope | None,
+    progress: Callable[[str, int], None],
+) -> ConversionResult:
+    results, converted = [], 0.0
+    for position, partition in enumerate(partitions, start=1):
+        with spill_folder(tenant) as folder:
+            progress("extract", 0)
+            with ctx_timer("spill") as stage:
+                stage.rows = spill_weights_consumptions(session, partition, folder, changes=changes)
+            LOGGER.info(
+                f"{tenant}: partition {position}/{len(partitions)} "
+                f"(id_breeding {partition[0]}..{partition[-1]}), {stage.rows} rows spilled"
+            )
+            if not stage.rows:
+                continue
+            progress("transform", stage.rows)
+            data = transform_conversion(
+                scan_spill(folder), init_df, watermarks=watermarks, scope=scope
+            )
+        progress("save", data.height)
+        with ctx_timer("save") as stage:
+            saved = save_conversion(session, data=data, mode=save_mode)
+            stage.rows, stage.bytes = saved.written, int(data.estimated_size())
+        converted = max(converted, data.estimated_size("mb"))
+        results.append(summarize_result(data, saved))
+        del data
+    log_memory(tenant, None, converted)
+    ## Sin filas en la respuesta aunque no se pidiera summary_only: se informa explicitamente
+    result = merge_results(results, save_mode)
+    result.summary_only = result.out_of_core = True
+    return result
+
+
+async def aio_compute_spilled(
+    session: AsyncSession,
+    tenant: str,
+    partitions: list[list[int]],
+    init_df: pl.DataFrame,
+    changes: dict[int, dt.datetime],
+    watermarks: dict[int, dt.datetime],
+    save_mode: str,
+    scope: ConversionScope | None,
+) -> ConversionResult:
+    results, converted = [], 0.0
+    for position, partition in enumerate(partitions, start=1):
+        with spill_folder(tenant) as folder:
+            async with aio_ctx_timer("spill") as stage:
+                stage.rows = await aio_spill_weights_consumptions(
+                    session, partition, folder, changes=changes
+                )
+            LOGGER.info(
+                f"{tenant}: partition {position}/{len(partitions)} "
+                f"(id_breeding {partition[0]}..{partition[-1]}), {stage.rows} rows spilled"
+            )
+            if not stage.rows:
+                continue
+            data = await asyncio.to_thread(
+                transform_conversion, scan_spill(folder), init_df, watermarks, scope=scope
+            )
+        async with aio_ctx_timer("save") as stage:
+            saved = await aio_save_conversion(session, data=data, mode=save_mode)
+            stage.rows, stage.bytes = saved.written, int(data.estimated_size())
+        converted = max(converted, data.estimated_size("mb"))
+        results.append(summarize_result(data, saved))
+        del data
+    log_memory(tenant, None, converted)
+    result = merge_results(results, save_mode)
+    result.summary_only = result.out_of_core = True
+    return result
+
+
+def pipeline_chunks(
+    id_breeding_list: list[int], chunk_breedings: int = PIPELINE_CHUNK_BREEDINGS
+) -> list[list[int]]:
+    if not chunk_breedings:
+        return []
+    ordered = sorted(id_breeding_list)
+    return [
+        ordered[start : start + chunk_breedings]
+        for start in range(0, len(ordered), chunk_breedings)
     ]
-    convert_data_df = convert_data_df.rename(
-        {"animal_accumulated_standard_conversion": "accumulated_standard_conversion"}
+
+
+def compute_pipelined(
+    session: Session,
+    tenant: str,
+    chunks: list[list[int]],
+    init_df: pl.DataFrame,
+    changes: dict[int, dt.datetime],
+    watermarks: dict[int, dt.datetime],
+    save_mode: str,
+    scope: ConversionScope | None,
+    progress: Callable[[str, int], None],
+    summary_only: bool = False,
+) -> ConversionResult:
+    extracted: list[float] = []
+    converted: list[float] = []
+
+    ## La extraccion usa su propia sesion: corre a la vez que el guardado del bloque anterior
+    with get_session(tenant) as source:
+
+        def extract(item: tuple[int, list[int]]) -> pl.DataFrame:
+            position, chunk = item
+            progress("extract", 0)
+            frame = get_weights_consumptions(source, chunk, changes=changes)
+            extracted.append(frame.estimated_size("mb"))
+            LOGGER.info(
+                f"{tenant}: chunk {position}/{len(chunks)} "
+                f"(id_breeding {chunk[0]}..{chunk[-1]}), {frame.height} rows extracted"
+            )
+            return frame
+
+        def transform(frame: pl.DataFrame) -> pl.DataFrame | None:
+            if frame.is_empty():
+                return None
+            progress("transform", frame.height)
+            return transform_conversion(frame, init_df, watermarks=watermarks, scope=scope)
+
+        def save(data: pl.DataFrame | None) -> ConversionResult | None:
+            if data is None:
+                return None
+            progress("save", data.height)
+            with ctx_timer("save") as stage:
+                saved = save_conversion(session, data=data, mode=save_mode)
+                stage.rows, stage.bytes = saved.written, int(data.estimated_size())
+            converted.append(data.estimated_size("mb"))
+            ## Sin summary_only la salida de cada bloque vuelve en la respuesta
+            return summarize_result(data, saved) if summary_only else ConversionResult(data, saved)
+
+        results = run_pipeline(
+            enumerate(chunks, start=1),
+            [("extract", extract), ("transform", transform), ("save", save)],
+            depths=[PIPELINE_TRANSFORM_QUEUE, PIPELINE_SAVE_QUEUE],
+        )
+    result = merge_results([result for result in results if result is not None], save_mode)
+    ## Memoria por bloque: sólo unos pocos bloques conviven en las colas
+    log_memory(tenant, max(extracted, default=0.0), max(converted, default=0.0))
+    return result
+
+
+async def aio_compute_pipelined(
+    session: AsyncSession,
+    tenant: str,
+    chunks: list[list[int]],
+    init_df: pl.DataFrame,
+    changes: dict[int, dt.datetime],
+    watermarks: dict[int, dt.datetime],
+    save_mode: str,
+    scope: ConversionScope | None,
+    summary_only: bool = False,
+) -> ConversionResult:
+    extracted: list[float] = []
+    converted: list[float] = []
+
+    async with get_async_session(tenant) as source:
+
+        async def extract(item: tuple[int, list[int]]) -> pl.DataFrame:
+            position, chunk = item
+            frame = await aio_get_weights_consumptions(source, chunk, changes=changes)
+            extracted.append(frame.estimated_size("mb"))
+            LOGGER.info(
+                f"{tenant}: chunk {position}/{len(chunks)} "
+                f"(id_breeding {chunk[0]}..{chunk[-1]}), {frame.height} rows extracted"
+            )
+            return frame
+
+        async def transform(frame: pl.DataFrame) -> pl.DataFrame | None:
+            if frame.is_empty():
+                return None
+            return await asyncio.to_thread(
+                transform_conversion, frame, init_df, watermarks, scope=scope
+            )
+
+        async def save(data: pl.DataFrame | None) -> ConversionResult | None:
+            if data is None:
+                return None
+            async with aio_ctx_timer("save") as stage:
+                saved = await aio_save_conversion(session, data=data, mode=save_mode)
+                stage.rows, stage.bytes = saved.written, int(data.estimated_size())
+            converted.append(data.estimated_size("mb"))
+            return summarize_result(data, saved) if summary_only else ConversionResult(data, saved)
+
+        results = await aio_run_pipeline(
+            enumerate(chunks, start=1),
+            [("extract", extract), ("transform", transform), ("save", save)],
+            depths=[PIPELINE_TRANSFORM_QUEUE, PIPELINE_SAVE_QUEUE],
+        )
+    result = merge_results([result for result in results if result is not None], save_mode)
+    ## Memoria por bloque: sólo unos pocos bloques conviven en las colas
+    log_memory(tenant, max(extracted, default=0.0), max(converted, default=0.0))
+    return result
+
+
+def catalog_stats(catalog: CatalogEntry, stats: list[Any]) -> list[Any]:
+    ## Cambios en crianzas, entidades o parametros iniciales tambien invalidan la cache
+    return [*stats, ("breedings", catalog.frame.height, catalog.watermark)]
+
+
+def compute_conversion(
+    session: Session,
+    tenant: str,
+    full_rebuild: bool = False,
+    save_mode: str = SAVE_MODE,
+    progress: Callable[[str, int], None] | None = None,
+    engine: str = CONVERSION_ENGINE,
+    scope: ConversionScope | None = None,
+    changes: dict[int, dt.datetime] | None = None,
+    summary_only: bool = False,
+) -> ConversionResult:
+    progress = progress or (lambda stage, rows: None)
+    empty_result = ConversionResult(
+        data=pl.DataFrame(schema=conversion_schema), saved=SaveSummary(mode=save_mode)
+    )
+    ## Parametros iniciales desde el catalogo de crianzas activas; get_conversion ya lo refresco
+    catalog_df = get_breeding_catalog(session, tenant).frame
+    active_breeding_list = catalog_df["id_breeding"].unique(maintain_order=True).to_list()
+    init_df = scope_breedings(catalog_df, scope)
+    scoped_breeding_list = init_df["id_breeding"].unique(maintain_order=True).to_list()
+    ## La ejecucion particionada ya consulto los cambios del shard para su huella
+    if changes is None:
+        with ctx_timer("breeding_changes") as stage:
+            changes = get_breeding_changes(session, scoped_breeding_list)
+            stage.rows = len(changes)
+    watermarks = {} if full_rebuild else WATERMARKS.get(tenant, watermark_generation())
+    id_breeding_list = get_changed_breedings(scoped_breeding_list, changes, watermarks)
+    LOGGER.info(
+        f"{tenant}: {len(id_breeding_list)} of {len(scoped_breeding_list)} active breedings to"
+        f" recompute ({'full rebuild' if full_rebuild else 'incremental'}"
+        f"{f', scope {scope.model_dump(exclude_none=True)}' if scope else ''})"
+    )
+    if not id_breeding_list:
+        return empty_result
+
+    if engine == "sql":
+        ## Imputacion, razones y estandar se calculan y escriben dentro de PostgreSQL
+        progress("sql", 0)
+        with ctx_timer("sql_merge") as stage:
+            saved = merge_conversion_in_db(
+                session,
+                id_breeding_list,
+                watermarks=watermarks,
+                mode=save_mode,
+                date_from=scope.date_from if scope else None,
+                date_to=scope.date_to if scope else None,
+            )
+            stage.rows = saved.written
+        update_watermarks(tenant, id_breeding_list, changes, active_breeding_list, scope)
+        return ConversionResult(data=empty_result.data, saved=saved)
+
+    if init_df.is_empty():
+        LOGGER.warning("No initial parameters found. Returning empty result.")
+        return empty_result
+
+    row_counts = (
+        get_breeding_row_counts(session, id_breeding_list)
+        if needs_row_counts(id_breeding_list)
+        else {}
+    )
+    if over_budget(tenant, row_counts):
+        partitions = spill_partitions(id_breeding_list, row_counts)
+        result = compute_spilled(
+            session,
+            tenant,
+            partitions,
+            init_df,
+            changes,
+            watermarks,
+            save_mode,
+            scope,
+            progress,
+        )
+        update_watermarks(tenant, id_breeding_list, changes, active_breeding_list, scope)
+        return result
+
+    chunks = pipeline_chunks(id_breeding_list)
+    if len(chunks) > 1:
+        result = compute_pipelined(
+            session,
+            tenant,
+            chunks,
+            init_df,
+            changes,
+            watermarks,
+            save_mode,
+            scope,
+            progress,
+            summary_only,
+        )
+        update_watermarks(tenant, id_breeding_list, changes, active_breeding_list, scope)
+        return result
+
+    progress("extract", 0)
+    groups = iter_breeding_groups(session, id_breeding_list, changes=changes)
+    convert_data_df, rows, extracted = transform_groups(
+        groups, init_df, watermarks=watermarks, scope=scope, progress=progress
+    )
+
+    if not rows:
+        LOGGER.warning("No conversion data found for the breeding list. Returning empty result.")
+        return empty_result
+
+    progress("save", convert_data_df.height)
+    with ctx_timer("save") as stage:
+        saved = save_conversion(session, data=convert_data_df, mode=save_mode)
+        stage.rows, stage.bytes = saved.written, int(convert_data_df.estimated_size())
+    update_watermarks(tenant, id_breeding_list, changes, active_breeding_list, scope)
+    log_memory(tenant, extracted, convert_data_df.estimated_size("mb"))
+    return ConversionResult(data=convert_data_df, saved=saved)
+
+
+async def aio_compute_conversion(
+    session: AsyncSession,
+    tenant: str,
+    full_rebuild: bool = False,
+    save_mode: str = SAVE_MODE,
+    engine: str = CONVERSION_ENGINE,
+    scope: ConversionScope | None = None,
+    changes: dict[int, dt.datetime] | None = None,
+    summary_only: bool = False,
+) -> ConversionResult:
+    empty_result = ConversionResult(
+        data=pl.DataFrame(schema=conversion_schema), saved=SaveSummary(mode=save_mode)
+    )
+    catalog_df = (await aio_get_breeding_catalog(session, tenant)).frame
+    active_breeding_list = catalog_df["id_breeding"].unique(maintain_order=True).to_list()
+    init_df = scope_breedings(catalog_df, scope)
+    scoped_breeding_list = init_df["id_breeding"].unique(maintain_order=True).to_list()
+    if changes is None:
+        async with aio_ctx_timer("breeding_changes") as stage:
+            changes = await aio_get_breeding_changes(session, scoped_breeding_list)
+            stage.rows = len(changes)
+    watermarks = (
+        {}
+        if full_rebuild
+        else await asyncio.to_thread(WATERMARKS.get, tenant, watermark_generation())
+    )
+    id_breeding_list = get_changed_breedings(scoped_breeding_list, changes, watermarks)
+    LOGGER.info(
+        f"{tenant}: {len(id_breeding_list)} of {len(scoped_breeding_list)} active breedings to"
+        f" recompute ({'full rebuild' if full_rebuild else 'incremental'}"
+        f"{f', scope {scope.model_dump(exclude_none=True)}' if scope else ''})"
+    )
+    if not id_breeding_list:
+        return empty_result
+
+    if engine == "sql":
+        async with aio_ctx_timer("sql_merge") as stage:
+            saved = await aio_merge_conversion_in_db(
+                session,
+                id_breeding_list,
+                watermarks=watermarks,
+                mode=save_mode,
+                date_from=scope.date_from if scope else None,
+                date_to=scope.date_to if scope else None,
+            )
+            stage.rows = saved.written
+        await asyncio.to_thread(
+            update_watermarks, tenant, id_breeding_list, changes, active_breeding_list, scope
+        )
+        return ConversionResult(data=empty_result.data, saved=saved)
+
+    if init_df.is_empty():
+        LOGGER.warning("No initial parameters found. Returning empty result.")
+        return empty_result
+
+    row_counts = (
+        await aio_get_breeding_row_counts(session, id_breeding_list)
+        if needs_row_counts(id_breeding_list)
+        else {}
     )
-    convert_data_df = convert_data_df.with_columns(
-        date=pl.col("date").cast(pl.Date), calculation_formula_version=pl.lit(VERSION)
+    if over_budget(tenant, row_counts):
+        partitions = spill_partitions(id_breeding_list, row_counts)
+        result = await aio_compute_spilled(
+            session, tenant, partitions, init_df, changes, watermarks, save_mode, scope
+        )
+        await asyncio.to_thread(
+            update_watermarks, tenant, id_breeding_list, changes, active_breeding_list, scope
+        )
+        return result
+
+    chunks = pipeline_chunks(id_breeding_list)
+    if len(chunks) > 1:
+        result = await aio_compute_pipelined(
+            session, tenant, chunks, init_df, changes, watermarks, save_mode, scope, summary_only
+        )
+        await asyncio.to_thread(
+            update_watermarks, tenant, id_breeding_list, changes, active_breeding_list, scope
+        )
+        return result
+
+    groups = aio_iter_breeding_groups(session, id_breeding_list, changes=changes)
+    convert_data_df, rows, extracted = await aio_transform_groups(
+        groups, init_df, watermarks=watermarks, scope=scope
+    )
+
+    if not rows:
+        LOGGER.warning("No conversion data found for the breeding list. Returning empty result.")
+        return empty_result
+
+    async with aio_ctx_timer("save") as stage:
+        saved = await aio_save_conversion(session, data=convert_data_df, mode=save_mode)
+        stage.rows, stage.bytes = saved.written, int(convert_data_df.estimated_size())
+    await asyncio.to_thread(
+        update_watermarks, tenant, id_breeding_list, changes, active_breeding_list, scope
     )
+    log_memory(tenant, extracted, convert_data_df.estimated_size("mb"))
+    return ConversionResult(data=convert_data_df, saved=saved)
 
-    result_data = convert_data_df.to_dicts()
-    save_conversion(session, data=result_data)
-    return result_data
+
+def get_conversion(
+    session: Session,
+    tenant: str,
+    full_rebuild: bool = False,
+    save_mode: str = SAVE_MODE,
+    progress: Callable[[str, int], None] | None = None,
+    engine: str = CONVERSION_ENGINE,
+    scope: ConversionScope | None = None,
+    summary_only: bool = False,
+) -> ConversionResult:
+    TENANT.set(tenant)
+    with ctx_timer("breeding_catalog") as stage:
+        catalog = get_breeding_catalog(session, tenant, full=full_rebuild)
+        stage.rows = catalog.frame.height
+    ## La huella se toma antes de extraer: un cambio concurrente invalida la entrada siguiente
+    with ctx_timer("source_stats"):
+        id_breeding_list = scope_breedings(catalog.frame, scope)["id_breeding"].unique().to_list()
+        stats = get_source_stats(session, id_breeding_list)
+        fingerprint = source_fingerprint(
+            catalog_stats(catalog, stats), engine=engine, scope=scope, save_mode=save_mode
+        )
+    cached = None if full_rebuild else get_cached_result(tenant, fingerprint)
+    if cached is not None:
+        LOGGER.info(f"{tenant}: source unchanged ({fingerprint[:12]}), returning cached result")
+        return ConversionResult(data=cached[0], saved=cached[1], cached=True)
+
+    result = compute_conversion(
+        session,
+        tenant,
+        full_rebuild=full_rebuild,
+        save_mode=save_mode,
+        progress=progress,
+        engine=engine,
+        scope=scope,
+        summary_only=summary_only,
+    )
+    ## Un resultado fuera de memoria no trae filas: cachearlo devolveria una respuesta vacia
+    if not result.summary_only:
+        set_cached_result(tenant, fingerprint, result.data, result.saved)
+    return result
+
+
+async def aio_get_conversion(
+    session: AsyncSession,
+    tenant: str,
+    full_rebuild: bool = False,
+    save_mode: str = SAVE_MODE,
+    engine: str = CONVERSION_ENGINE,
+    scope: ConversionScope | None = None,
+    summary_only: bool = False,
+) -> ConversionResult:
+    TENANT.set(tenant)
+    async with aio_ctx_timer("breeding_catalog") as stage:
+        catalog = await aio_get_breeding_catalog(session, tenant, full=full_rebuild)
+        stage.rows = catalog.frame.height
+    async with aio_ctx_timer("source_stats"):
+        id_breeding_list = scope_breedings(catalog.frame, scope)["id_breeding"].unique().to_list()
+        stats = await aio_get_source_stats(session, id_breeding_list)
+        fingerprint = source_fingerprint(
+            catalog_stats(catalog, stats), engine=engine, scope=scope, save_mode=save_mode
+        )
+    cached = (
+        None if full_rebuild else await asyncio.to_thread(get_cached_result, tenant, fingerprint)
+    )
+    if cached is not None:
+        LOGGER.info(f"{tenant}: source unchanged ({fingerprint[:12]}), returning cached result")
+        return ConversionResult(data=cached[0], saved=cached[1], cached=True)
+
+    result = await aio_compute_conversion(
+        session,
+        tenant,
+        full_rebuild=full_rebuild,
+        save_mode=save_mode,
+        engine=engine,
+        scope=scope,
+        summary_only=summary_only,
+    )
+    if not result.summary_only:
+        await asyncio.to_thread(set_cached_result, tenant, fingerprint, result.data, result.saved)
+    return result
@@ -0,0 +1,64 @@
+# Standard Library
+from typing import Callable, Iterator
+
+# External
+from sqlalchemy.sql import Select
+
+# Project
+from app.config import LOGGER
+from app.db import (
+    EXPLAIN_OPTION,
+    get_session,
+    select_breeding_weights_consumption_data,
+    select_init_params,
+)
+from app.utilities import get_init_params
+
+
+EXPLAIN_QUERIES: dict[str, Callable[[list[int]], Select]] = {
+    "init_params": lambda id_breeding_list: select_init_params(),
+    "weights": select_breeding_weights_consumption_data,
+}
+
+
+def iter_plan_nodes(node: dict) -> Iterator[dict]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+def summarize_plan(explained: dict) -> dict:
+    root = explained["Plan"]
+    nodes = list(iter_plan_nodes(root))
+    return {
+        "planning_ms": explained.get("Planning Time"),
+        "execution_ms": explained.get("Execution Time"),
+        "rows": root.get("Actual Rows"),
+        "shared_hit_blocks": root.get("Shared Hit Blocks"),
+        "shared_read_blocks": root.get("Shared Read Blocks"),
+        "nodes": [node["Node Type"] for node in nodes],
+        "seq_scans": sorted(
+            {node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"}
+        ),
+        "plan": explained,
+    }
+
+
+def explain_extraction(tenant: str, queries: list[str] | None = None) -> dict:
+    queries = queries or list(EXPLAIN_QUERIES)
+    with get_session(tenant) as session:
+        id_breeding_list = sorted({row.id_breeding for row in get_init_params(session)})
+        explained = {}
+        for name in queries:
+            ## EXPLAIN ANALYZE ejecuta la consulta; se usa la misma lista de crianzas activas
+            result = session.connection().execute(
+                EXPLAIN_QUERIES[name](id_breeding_list),
+                execution_options={EXPLAIN_OPTION: True},
+            )
+            explained[name] = summarize_plan(result.scalar_one()[0])
+            LOGGER.info(
+                f"{tenant}: EXPLAIN {name}: {explained[name]['execution_ms']} ms, "
+                f"seq scans on {explained[name]['seq_scans']}"
+            )
+        session.rollback()
+    return {"client": tenant, "breedings": len(id_breeding_list), "queries": explained}
@@ -0,0 +1,176 @@
+# Standard Library
+import asyncio
+import hashlib
+import json
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable
+
+# Project
+from app.config import (
+    CONVERSION_ENGINE,
+    CONVERSION_MAX_CONCURRENT,
+    CONVERSION_MAX_QUEUED,
+    LOGGER,
+    PARTITIONED,
+    SAVE_MODE,
+)
+from app.schemas import ConversionScope
+
+
+class TenantBusy(Exception):
+    def __init__(self, tenant: str, running: int, queued: int) -> None:
+        super().__init__(
+            f"Tenant {tenant} has {running} conversions running and {queued} queued; retry later"
+        )
+        self.tenant = tenant
+
+
+class SingleFlight:
+    def __init__(
+        self,
+        max_concurrent: int = CONVERSION_MAX_CONCURRENT,
+        max_queued: int = CONVERSION_MAX_QUEUED,
+    ) -> None:
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.started = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self._flights: dict[str, Future] = {}
+        self._running: dict[str, int] = {}
+        self._waiting: dict[str, deque[Future]] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, tenant: str, key: str) -> tuple[Future, bool, Future | None]:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False, None
+
+            ## Sólo las solicitudes nuevas ocupan cupo; las coalescidas no agregan carga
+            running = self._running.get(tenant, 0)
+            waiting = self._waiting.setdefault(tenant, deque())
+            slot = None
+            if running >= self.max_concurrent:
+                if len(waiting) >= self.max_queued:
+                    self.rejected += 1
+                    LOGGER.warning(
+                        f"{tenant}: conversion rejected, {running} running, {len(waiting)} queued"
+                    )
+                    raise TenantBusy(tenant, running, len(waiting))
+                slot = Future()
+                waiting.append(slot)
+            else:
+                self._running[tenant] = running + 1
+            flight = self._flights[key] = Future()
+            self.started += 1
+            return flight, True, slot
+
+    def _release(self, tenant: str) -> None:
+        with self._lock:
+            waiting = self._waiting.get(tenant)
+            ## El cupo pasa directo al siguiente en espera
+            while waiting:
+                slot = waiting.popleft()
+                if slot.set_running_or_notify_cancel():
+                    slot.set_result(None)
+                    return
+            self._running[tenant] -= 1
+
+    def _finish(self, tenant: str, key: str, flight: Future, slot: Future | None) -> None:
+        with self._lock:
+            self._flights.pop(key, None)
+            if slot is not None and (not slot.done() or slot.cancelled()):
+                ## Se fue antes de obtener cupo: deja la cola sin liberar nada
+                slot.cancel()
+                flight.cancel()
+                return
+        if not flight.done():
+            flight.cancel()
+        self._release(tenant)
+
+    def run(self, tenant: str, key: str, fn: Callable[[], Any]) -> Any:
+        flight, leader, slot = self._join(tenant, key)
+        if not leader:
+            return flight.result()
+        try:
+            if slot is not None:
+                slot.result()
+            result = fn()
+            flight.set_result(result)
+            return result
+        except BaseException as e:
+            if not flight.done():
+                flight.set_exception(e)
+            raise
+        finally:
+            self._finish(tenant, key, flight, slot)
+
+    async def aio_run(self, tenant: str, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flight, leader, slot = self._join(tenant, key)
+        if not leader:
+            return await asyncio.shield(asyncio.wrap_future(flight))
+        try:
+            if slot is not None:
+                await asyncio.wrap_future(slot)
+            result = await fn()
+            flight.set_result(result)
+            return result
+        except BaseException as e:
+            if not flight.done():
+                flight.set_exception(e)
+            raise
+        finally:
+            self._finish(tenant, key, flight, slot)
+
+    def stats(self) -> dict:
+        with self._lock:
+            tenants = {
+                tenant: {"running": running, "queued": len(self._waiting.get(tenant, ()))}
+                for tenant, running in self._running.items()
+                if running or self._waiting.get(tenant)
+            }
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queued": self.max_queued,
+                "in_flight": len(self._flights),
+                "started": self.started,
+                "coalesced": self.coalesced,
+                "rejected": self.rejected,
+                "tenants": tenants,
+            }
+
+
+FLIGHTS = SingleFlight()
+
+
+def flight_key(
+    tenant: str,
+    full_rebuild: bool = False,
+    save_mode: str = SAVE_MODE,
+    engine: str = CONVERSION_ENGINE,
+    scope: ConversionScope | None = None,
+    partitioned: bool = PARTITIONED,
+    summary_only: bool = False,
+) -> str:
+    ## Sobre los valores ya resueltos: omitir un campo o enviar su valor por defecto comparten
+    ## calculo. summary_only cuenta: un calculo sin filas no sirve a quien las pide
+    body = json.dumps(
+        {
+            "full_rebuild": full_rebuild,
+            "save_mode": save_mode,
+            "engine": engine,
+            "partitioned": partitioned,
+            "summary_only": summary_only,
+            "scope": scope.model_dump(mode="json", exclude_none=True) if scope else {},
+        },
+        sort_keys=True,
+    )
+    return f"{tenant}:{hashlib.sha256(body.encode()).hexdigest()}"
+
+
+def get_flight_stats() -> dict:
+    return FLIGHTS.stats()
@@ -0,0 +1,161 @@
+# Standard Library
+import datetime as dt
+import threading
+import uuid
+
+# Project
+from app.config import (
+    CONVERSION_ENGINE,
+    JOB_HEARTBEAT_TTL,
+    JOB_WORKERS,
+    LOGGER,
+    PARTITIONED,
+    SAVE_MODE,
+)
+from app.schemas import ConversionJob, ConversionScope
+from app.utilities import JOBS, MemoryJobQueue, RedisJobQueue
+
+# Local
+from .batch import run_tenant_conversion
+from .partition import REPLICA_ID
+
+
+class JobRunner:
+    def __init__(
+        self,
+        jobs: MemoryJobQueue | RedisJobQueue = JOBS,
+        workers: int = JOB_WORKERS,
+        heartbeat_ttl: int = JOB_HEARTBEAT_TTL,
+    ) -> None:
+        self.jobs = jobs
+        self.workers = workers
+        self.heartbeat_ttl = heartbeat_ttl
+        self.worker_ids: list[str] = []
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        ## Ids unicos por arranque: un proceso reiniciado no hereda la lista de uno caido
+        prefix = f"{REPLICA_ID}:{uuid.uuid4().hex[:8]}"
+        self.worker_ids = [f"{prefix}:{i}" for i in range(max(1, self.workers))]
+        self._beat()
+        for i, worker in enumerate(self.worker_ids):
+            thread = threading.Thread(
+                target=self._work, args=(worker,), name=f"job-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        LOGGER.info(
+            f"Job runner started: {len(self.worker_ids)} workers ({type(self.jobs).__name__})"
+        )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def _beat(self) -> None:
+        for worker in self.worker_ids:
+            self.jobs.heartbeat(worker)
+        requeued = self.jobs.recover()
+        if requeued:
+            LOGGER.warning(f"Requeued {len(requeued)} jobs from stopped workers: {requeued}")
+
+    def _heartbeat(self) -> None:
+        ## Late aunque un trabajo largo ocupe al trabajador; si el proceso muere, otra replica
+        ## ve expirar la marca y devuelve sus trabajos a la cola
+        while not self._stop.wait(self.heartbeat_ttl / 3):
+            try:
+                self._beat()
+            except Exception as e:
+                LOGGER.error(f"Error renewing job worker heartbeat: {e}")
+
+    def _work(self, worker: str) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self.jobs.dequeue(worker, timeout=1)
+            except Exception as e:
+                LOGGER.error(f"Error reading job queue: {e}")
+                self._stop.wait(1)
+                continue
+            if job is None:
+                continue
+            try:
+                self.run(job)
+            except Exception as e:
+                ## Un error fuera de la conversion (p. ej. al guardar el estado) no detiene al
+                ## trabajador; el trabajo queda fallido en lugar de "running" para siempre
+                LOGGER.error(f"Job {job.id} ({job.client}) failed: {e}")
+                job.status, job.error = "failed", str(e)
+                job.updated_at = dt.datetime.now(dt.timezone.utc)
+                try:
+                    self.jobs.save(job)
+                except Exception as e:
+                    LOGGER.error(f"Error saving failed job {job.id}: {e}")
+            finally:
+                try:
+                    self.jobs.ack(worker, job.id)
+                except Exception as e:
+                    LOGGER.error(f"Error acknowledging job {job.id}: {e}")
+
+    def run(self, job: ConversionJob) -> ConversionJob:
+        def progress(stage: str, rows: int) -> None:
+            job.stage = stage
+            job.rows_processed = rows
+            job.updated_at = dt.datetime.now(dt.timezone.utc)
+            self.jobs.save(job)
+
+        job.status = "running"
+        progress("start", 0)
+        summary = run_tenant_conversion(
+            job.client,
+            full_rebuild=job.full_rebuild,
+            save_mode=job.save_mode,
+            progress=progress,
+            engine=job.engine,
+            scope=job.scope,
+            partitioned=job.partitioned,
+        )
+        job.summary = summary
+        job.status = "failed" if summary.error else "done"
+        progress("finished", summary.rows)
+        LOGGER.info(f"Job {job.id} ({job.client}) {job.status} in {summary.duration:.3f} seconds")
+        return job
+
+
+JOB_RUNNER = JobRunner()
+
+
+def submit_conversion_job(
+    client: str,
+    full_rebuild: bool = False,
+    save_mode: str = SAVE_MODE,
+    engine: str = CONVERSION_ENGINE,
+    scope: ConversionScope | None = None,
+    partitioned: bool = PARTITIONED,
+) -> ConversionJob:
+    now = dt.datetime.now(dt.timezone.utc)
+    job = ConversionJob(
+        id=uuid.uuid4().hex,
+        client=client,
+        full_rebuild=full_rebuild,
+        save_mode=save_mode,
+        engine=engine,
+        scope=scope,
+        partitioned=partitioned,
+        created_at=now,
+        updated_at=now,
+    )
+    JOB_RUNNER.jobs.enqueue(job)
+    return job
+
+
+def get_conversion_job(job_id: str) -> ConversionJob | None:
+    return JOB_RUNNER.jobs.get(job_id)
@@ -0,0 +1,72 @@
+# Project
+from app.config import COMPACT_DTYPES, LOGGER, get_dropped_logs
+from app.db import get_pool_stats
+from app.utilities import METRICS, peak_rss, render_metric
+
+# Local
+from .cache import get_cache_stats
+from .flights import FLIGHTS
+
+
+POOL_METRICS = {
+    "size": "Configured size of the database connection pool.",
+    "checked_out": "Database connections currently in use.",
+    "idle": "Idle database connections in the pool.",
+    "overflow": "Database connections open beyond the pool size.",
+}
+
+
+def get_metrics() -> str:
+    lines = METRICS.render()
+
+    pool = get_pool_stats()
+    for key, description in POOL_METRICS.items():
+        lines += render_metric(f"conversion_db_pool_{key}", description, "gauge", pool[key])
+
+    try:
+        cache = get_cache_stats()
+        lines += render_metric(
+            "conversion_cache_hits_total", "Result cache hits.", "counter", cache["hits"]
+        )
+        lines += render_metric(
+            "conversion_cache_misses_total", "Result cache misses.", "counter", cache["misses"]
+        )
+        if "entries" in cache:
+            lines += render_metric(
+                "conversion_cache_entries", "Results held in the cache.", "gauge", cache["entries"]
+            )
+    except Exception as e:
+        LOGGER.warning(f"Cache stats unavailable for /metrics: {e}")
+
+    lines += render_metric(
+        "conversion_requests_coalesced_total",
+        "Conversion requests served by joining an identical in-flight computation.",
+        "counter",
+        FLIGHTS.coalesced,
+    )
+    lines += render_metric(
+        "conversion_requests_rejected_total",
+        "Conversion requests rejected because the tenant queue was full.",
+        "counter",
+        FLIGHTS.rejected,
+    )
+
+    lines += render_metric(
+        "conversion_process_peak_rss_bytes",
+        "Peak resident set size of the process.",
+        "gauge",
+        peak_rss(),
+    )
+
+    lines += render_metric(
+        "conversion_log_dropped_total",
+        "Log records dropped because the logging queue was full.",
+        "counter",
+        get_dropped_logs(),
+    )
+
+    return "\n".join(lines) + "\n"
+
+
+def get_memory_report() -> dict:
+    return {"compact_dtypes": COMPACT_DTYPES, "peak_rss": peak_rss(), "stages": METRICS.memory()}
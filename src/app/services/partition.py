@@ -0,0 +1,285 @@
+# Standard Library
+import asyncio
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+import zlib
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncGenerator, Callable, Generator
+
+# External
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# Project
+from app.config import CONVERSION_ENGINE, LOGGER, SAVE_MODE, SHARD_COUNT, SHARD_WAIT
+from app.schemas import ConversionScope
+from app.utilities import (
+    LEASES,
+    TENANT,
+    CatalogEntry,
+    MemoryLeaseStore,
+    RedisLeaseStore,
+    aio_ctx_timer,
+    aio_get_breeding_catalog,
+    aio_get_breeding_changes,
+    ctx_timer,
+    get_breeding_catalog,
+    get_breeding_changes,
+)
+
+# Local
+from .cache import source_fingerprint
+from .conversion import (
+    ConversionResult,
+    aio_compute_conversion,
+    catalog_stats,
+    compute_conversion,
+    merge_results,
+    scope_breedings,
+)
+
+
+REPLICA_ID = f"{socket.gethostname()}:{os.getpid()}"
+SHARD_POLL_SECONDS = 1.0
+
+
+def shard_of(id_breeding: int, shards: int = SHARD_COUNT) -> int:
+    ## crc32: el mismo shard en todas las replicas, independiente de PYTHONHASHSEED
+    return zlib.crc32(str(id_breeding).encode()) % max(1, shards)
+
+
+def partition_breedings(id_breeding_list: list[int], shards: int = SHARD_COUNT) -> dict[int, list]:
+    partitions: dict[int, list[int]] = {}
+    for id_breeding in id_breeding_list:
+        partitions.setdefault(shard_of(id_breeding, shards), []).append(id_breeding)
+    return dict(sorted(partitions.items()))
+
+
+def shard_key(tenant: str, shard: int) -> str:
+    return f"{tenant}:{shard}"
+
+
+def shard_order(partitions: dict[int, list[int]]) -> list[int]:
+    ## Cada replica empieza en un shard distinto para no competir por los primeros
+    shards = list(partitions)
+    start = random.randrange(len(shards)) if shards else 0
+    return shards[start:] + shards[:start]
+
+
+def shard_scope(scope: ConversionScope | None, id_breeding_list: list[int]) -> ConversionScope:
+    if scope is None:
+        return ConversionScope(id_breeding=id_breeding_list)
+    return scope.model_copy(update={"id_breeding": id_breeding_list})
+
+
+def shard_token(
+    catalog: CatalogEntry, changes: dict, engine: str, scope: ConversionScope, save_mode: str
+) -> str:
+    ## Huella del shard: si otra solicitud ya lo calculo con los mismos datos y modo no se repite
+    stats = [("shard", len(changes), max(changes.values(), default=None))]
+    return source_fingerprint(
+        catalog_stats(catalog, stats), engine=engine, scope=scope, save_mode=save_mode
+    )
+
+
+@contextmanager
+def lease_heartbeat(
+    leases: MemoryLeaseStore | RedisLeaseStore, key: str, owner: str
+) -> Generator[None, None, None]:
+    ## Renueva el lease cada tercio del TTL aunque una extraccion o transformacion dure mas que el
+    stop = threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(leases.ttl / 3):
+            if not leases.renew(key, owner):
+                LOGGER.warning(f"Lease on shard {key} lost while computing")
+
+    thread = threading.Thread(target=beat, name=f"lease-{key}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+@asynccontextmanager
+async def aio_lease_heartbeat(
+    leases: MemoryLeaseStore | RedisLeaseStore, key: str, owner: str
+) -> AsyncGenerator[None, None]:
+    async def beat() -> None:
+        while True:
+            await asyncio.sleep(leases.ttl / 3)
+            if not await asyncio.to_thread(leases.renew, key, owner):
+                LOGGER.warning(f"Lease on shard {key} lost while computing")
+
+    task = asyncio.create_task(beat(), name=f"lease-{key}")
+    try:
+        yield
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def merge_shard_results(
+    results: list[ConversionResult],
+    save_mode: str,
+    claimed: list[int],
+    skipped: list[int],
+    pending: list[int],
+) -> ConversionResult:
+    merged = merge_results(results, save_mode)
+    merged.claimed, merged.skipped, merged.pending = claimed, skipped, pending
+    return merged
+
+
+def get_partitioned_conversion(
+    session: Session,
+    tenant: str,
+    full_rebuild: bool = False,
+    save_mode: str = SAVE_MODE,
+    progress: Callable[[str, int], None] | None = None,
+    engine: str = CONVERSION_ENGINE,
+    scope: ConversionScope | None = None,
+    summary_only: bool = False,
+    shards: int = SHARD_COUNT,
+    leases: MemoryLeaseStore | RedisLeaseStore = LEASES,
+    wait: float = SHARD_WAIT,
+) -> ConversionResult:
+    TENANT.set(tenant)
+    progress = progress or (lambda stage, rows: None)
+    with ctx_timer("breeding_catalog") as stage:
+        catalog = get_breeding_catalog(session, tenant, full=full_rebuild)
+        stage.rows = catalog.frame.height
+    partitions = partition_breedings(
+        scope_breedings(catalog.frame, scope)["id_breeding"].unique(maintain_order=True).to_list(),
+        shards,
+    )
+    owner = f"{REPLICA_ID}:{uuid.uuid4().hex[:8]}"
+    results, claimed, done = [], [], []
+    pending, deadline = shard_order(partitions), time.monotonic() + wait
+    while True:
+        held = []
+        for shard in pending:
+            key = shard_key(tenant, shard)
+            ## Otra replica (u otra solicitud) ya procesa el shard: se reintenta en la vuelta siguiente
+            if not leases.acquire(key, owner):
+                held.append(shard)
+                continue
+            try:
+                with lease_heartbeat(leases, key, owner):
+                    scope_shard = shard_scope(scope, partitions[shard])
+                    changes = get_breeding_changes(session, partitions[shard])
+                    token = shard_token(catalog, changes, engine, scope_shard, save_mode)
+                    ## full_rebuild pide recalcular aunque otra solicitud ya lo haya hecho
+                    if not full_rebuild and leases.completed(key) == token:
+                        done.append(shard)
+                        continue
+                    claimed.append(shard)
+                    with ctx_timer("shard") as stage:
+                        result = compute_conversion(
+                            session,
+                            tenant,
+                            full_rebuild=full_rebuild,
+                            save_mode=save_mode,
+                            progress=progress,
+                            engine=engine,
+                            scope=scope_shard,
+                            changes=changes,
+                            summary_only=summary_only,
+                        )
+                        stage.rows = result.saved.written
+                results.append(result)
+                leases.complete(key, owner, token)
+            finally:
+                leases.release(key, owner)
+        pending = held
+        ## Los shards retenidos se esperan hasta SHARD_WAIT: al soltarse quedan al dia o se toman
+        if not pending or time.monotonic() >= deadline:
+            break
+        time.sleep(SHARD_POLL_SECONDS)
+    LOGGER.info(
+        f"{tenant}: {len(claimed)} of {len(partitions)} shards computed, "
+        f"{len(done)} already up to date, {len(pending)} still held by other workers"
+    )
+    return merge_shard_results(results, save_mode, claimed, done, pending)
+
+
+async def aio_get_partitioned_conversion(
+    session: AsyncSession,
+    tenant: str,
+    full_rebuild: bool = False,
+    save_mode: str = SAVE_MODE,
+    engine: str = CONVERSION_ENGINE,
+    scope: ConversionScope | None = None,
+    summary_only: bool = False,
+    shards: int = SHARD_COUNT,
+    leases: MemoryLeaseStore | RedisLeaseStore = LEASES,
+    wait: float = SHARD_WAIT,
+) -> ConversionResult:
+    TENANT.set(tenant)
+    async with aio_ctx_timer("breeding_catalog") as stage:
+        catalog = await aio_get_breeding_catalog(session, tenant, full=full_rebuild)
+        stage.rows = catalog.frame.height
+    partitions = partition_breedings(
+        scope_breedings(catalog.frame, scope)["id_breeding"].unique(maintain_order=True).to_list(),
+        shards,
+    )
+    owner = f"{REPLICA_ID}:{uuid.uuid4().hex[:8]}"
+    results, claimed, done = [], [], []
+    pending, deadline = shard_order(partitions), time.monotonic() + wait
+    while True:
+        held = []
+        for shard in pending:
+            key = shard_key(tenant, shard)
+            if not await asyncio.to_thread(leases.acquire, key, owner):
+                held.append(shard)
+                continue
+            try:
+                async with aio_lease_heartbeat(leases, key, owner):
+                    scope_shard = shard_scope(scope, partitions[shard])
+                    changes = await aio_get_breeding_changes(session, partitions[shard])
+                    token = shard_token(catalog, changes, engine, scope_shard, save_mode)
+                    if not full_rebuild and await asyncio.to_thread(leases.completed, key) == token:
+                        done.append(shard)
+                        continue
+                    claimed.append(shard)
+                    async with aio_ctx_timer("shard") as stage:
+                        result = await aio_compute_conversion(
+                            session,
+                            tenant,
+                            full_rebuild=full_rebuild,
+                            save_mode=save_mode,
+                            engine=engine,
+                            scope=scope_shard,
+                            changes=changes,
+                            summary_only=summary_only,
+                        )
+                        stage.rows = result.saved.written
+                results.append(result)
+                await asyncio.to_thread(leases.complete, key, owner, token)
+            finally:
+                await asyncio.to_thread(leases.release, key, owner)
+        pending = held
+        if not pending or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(SHARD_POLL_SECONDS)
+    LOGGER.info(
+        f"{tenant}: {len(claimed)} of {len(partitions)} shards computed, "
+        f"{len(done)} already up to date, {len(pending)} still held by other workers"
+    )
+    return merge_shard_results(results, save_mode, claimed, done, pending)
+
+
+def get_shard_leases(
+    tenant: str | None = None, leases: MemoryLeaseStore | RedisLeaseStore = LEASES
+) -> dict:
+    return {
+        "shards": SHARD_COUNT,
+        "ttl": leases.ttl,
+        "leases": leases.holders(f"{tenant}:" if tenant else ""),
+    }
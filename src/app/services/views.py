@@ -0,0 +1,126 @@
+# Standard Library
+import threading
+import time
+
+# External
+from sqlalchemy import inspect
+
+# Project
+from app.config import (
+    LOGGER,
+    WEIGHTS_VIEW_ENABLED,
+    WEIGHTS_VIEW_MAX_AGE,
+    WEIGHTS_VIEW_REFRESH,
+    WEIGHTS_VIEW_TENANTS,
+)
+from app.db import (
+    count_weights_view,
+    create_weights_view,
+    get_session,
+    record_weights_view_refresh,
+    refresh_weights_view,
+    select_refresh_start,
+    select_weights_view_refresh,
+    try_lock_weights_view,
+    weights_consumption_view,
+)
+from app.utilities import CATALOG
+
+
+def refresh_tenant_view(tenant: str) -> dict:
+    with get_session(tenant) as session:
+        connection = session.connection()
+        if not connection.execute(try_lock_weights_view(tenant)).scalar():
+            session.rollback()
+            LOGGER.info(f"{tenant}: weights view refresh already running elsewhere")
+            return {"client": tenant, "refreshed": False}
+        ts = time.perf_counter()
+        refreshed_at = connection.execute(select_refresh_start()).scalar_one()
+        exists = inspect(connection).has_table(weights_consumption_view.name, schema=tenant)
+        for statement in create_weights_view():
+            connection.execute(statement)
+        ## Recien creada ya tiene datos; luego se refresca sin bloquear las lecturas
+        if exists:
+            connection.execute(refresh_weights_view(concurrently=True))
+        rows = connection.execute(count_weights_view()).scalar_one()
+        duration_ms = (time.perf_counter() - ts) * 1000
+        connection.execute(record_weights_view_refresh(rows, duration_ms, refreshed_at))
+        session.commit()
+    LOGGER.info(
+        f"{tenant}: weights view {'refreshed' if exists else 'created'}, "
+        f"{rows} rows in {duration_ms:.1f} ms"
+    )
+    return {
+        "client": tenant,
+        "refreshed": True,
+        "created": not exists,
+        "rows": rows,
+        "duration_ms": round(duration_ms, 3),
+    }
+
+
+def get_view_stats(tenant: str) -> dict:
+    with get_session(tenant) as session:
+        connection = session.connection()
+        if not inspect(connection).has_table(weights_consumption_view.name, schema=tenant):
+            return {"client": tenant, "exists": False}
+        refresh = connection.execute(select_weights_view_refresh()).one_or_none()
+    if refresh is None:
+        return {"client": tenant, "exists": True, "refreshed_at": None}
+    return {
+        "client": tenant,
+        "exists": True,
+        "refreshed_at": refresh.refreshed_at,
+        "age": refresh.age.total_seconds(),
+        "stale": refresh.age.total_seconds() > WEIGHTS_VIEW_MAX_AGE,
+        "rows": refresh.rows,
+        "duration_ms": refresh.duration_ms,
+    }
+
+
+class ViewRefresher:
+    def __init__(
+        self,
+        enabled: bool = WEIGHTS_VIEW_ENABLED,
+        interval: int = WEIGHTS_VIEW_REFRESH,
+        tenants: list[str] = WEIGHTS_VIEW_TENANTS,
+    ) -> None:
+        self.enabled = enabled
+        self.interval = interval
+        self._tenants = tenants
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def tenants(self) -> list[str]:
+        ## Sin lista explicita se refrescan los tenants que ya pasaron por el catálogo
+        return self._tenants or CATALOG.tenants()
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._work, name="view-refresher", daemon=True)
+        self._thread.start()
+        LOGGER.info(f"Weights view refresher started: every {self.interval} seconds")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _work(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.run()
+
+    def run(self) -> list[dict]:
+        refreshed = []
+        for tenant in self.tenants():
+            try:
+                refreshed.append(refresh_tenant_view(tenant))
+            except Exception as e:
+                LOGGER.error(f"{tenant}: error refreshing weights view: {e}")
+        return refreshed
+
+
+VIEW_REFRESHER = ViewRefresher()
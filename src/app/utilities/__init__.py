@@ -1,14 +1,105 @@
 # Local
-from .get_data import get_init_params, get_standard, get_weights_consumptions, save_conversion
+from .aio_get_data import (
+    aio_get_breeding_catalog,
+    aio_get_breeding_changes,
+    aio_get_breeding_row_counts,
+    aio_get_init_params,
+    aio_get_source_stats,
+    aio_get_weights_consumptions,
+    aio_iter_breeding_groups,
+    aio_merge_conversion_in_db,
+    aio_save_conversion,
+    aio_spill_weights_consumptions,
+)
+from .catalog import CATALOG, BreedingCatalog, CatalogEntry
+from .dtypes import FLOAT_DECIMALS, compact_frame, concat_frames, widen_floats
+from .get_data import (
+    get_breeding_catalog,
+    get_breeding_changes,
+    get_breeding_row_counts,
+    get_init_params,
+    get_source_stats,
+    get_weights_consumptions,
+    group_breedings,
+    iter_breeding_groups,
+    iter_weights_consumptions,
+    merge_conversion_in_db,
+    save_conversion,
+    spill_weights_consumptions,
+)
+from .jobs import JOBS, MemoryJobQueue, RedisJobQueue, get_job_queue
+from .leases import LEASES, MemoryLeaseStore, RedisLeaseStore, get_lease_store
+from .metrics import METRICS, TENANT, Stage, StageMetrics, peak_rss, render_metric
+from .pipeline import aio_run_pipeline, run_pipeline
+from .spill import scan_spill, spill_folder
+from .standards import STANDARDS, StandardStore, get_standard
 from .timers import aio_ctx_timer, ctx_timer, wrap_timer
+from .watermarks import (
+    WATERMARKS,
+    MemoryWatermarkStore,
+    RedisWatermarkStore,
+    get_watermark_store,
+    watermark_generation,
+)
 
 
 __all__ = [
+    "aio_get_breeding_catalog",
+    "aio_get_breeding_changes",
+    "aio_get_breeding_row_counts",
+    "aio_get_init_params",
+    "aio_get_source_stats",
+    "aio_get_weights_consumptions",
+    "aio_iter_breeding_groups",
+    "aio_merge_conversion_in_db",
+    "aio_save_conversion",
+    "aio_run_pipeline",
+    "aio_spill_weights_consumptions",
+    "compact_frame",
+    "concat_frames",
+    "get_breeding_catalog",
+    "get_breeding_changes",
+    "get_breeding_row_counts",
     "get_init_params",
+    "get_source_stats",
     "get_weights_consumptions",
+    "group_breedings",
+    "iter_breeding_groups",
+    "iter_weights_consumptions",
+    "merge_conversion_in_db",
+    "run_pipeline",
+    "scan_spill",
+    "spill_folder",
+    "spill_weights_consumptions",
+    "widen_floats",
     "wrap_timer",
     "aio_ctx_timer",
     "ctx_timer",
+    "get_job_queue",
+    "get_lease_store",
+    "CATALOG",
+    "FLOAT_DECIMALS",
+    "BreedingCatalog",
+    "CatalogEntry",
+    "METRICS",
+    "TENANT",
+    "Stage",
+    "StageMetrics",
+    "peak_rss",
+    "render_metric",
     "get_standard",
+    "JOBS",
+    "LEASES",
+    "MemoryLeaseStore",
+    "RedisLeaseStore",
+    "MemoryJobQueue",
+    "RedisJobQueue",
+    "STANDARDS",
+    "StandardStore",
     "save_conversion",
+    "WATERMARKS",
+    "MemoryWatermarkStore",
+    "RedisWatermarkStore",
+    "get_watermark_store",
+    "watermark_generation",
 ]
@@ -0,0 +1,398 @@
+# Standard Library
+import asyncio
+import datetime as dt
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+# External
+import polars as pl
+from sqlalchemy.sql import Select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# Project
+from app.config import (
+    BULK_LOAD_THRESHOLD,
+    COMPACT_DTYPES,
+    EXTRACT_CHUNK_SIZE,
+    LOAD_CHUNK_SIZE,
+    LOGGER,
+    MAX_BIND_PARAMS,
+    SAVE_MODE,
+    VERSION,
+    WEIGHTS_VIEW_ENABLED,
+)
+from app.db import (
+    QUERY_STATS,
+    clear_conversion_standard,
+    compile_statement,
+    conversion_stage,
+    conversion_standard,
+    create_conversion_stage,
+    create_conversion_standard,
+    merge_conversion_rows,
+    merge_conversion_stage,
+    select_breeding_catalog,
+    select_breeding_changes,
+    select_breeding_row_counts,
+    select_breeding_weights_consumption_data,
+    select_init_params,
+    select_source_stats,
+    select_stored_conversion,
+    select_weights_view_data,
+    select_weights_view_state,
+    upsert_animalshed_conversion,
+)
+from app.schemas import (
+    SaveSummary,
+    compact_weight_consumption_schema,
+    stored_conversion_schema,
+    weight_consumption_schema,
+)
+
+# Local
+from .catalog import CATALOG, CatalogEntry
+from .dtypes import compact_frame, concat_frames
+from .get_data import (
+    FINGERPRINT_COLUMNS,
+    STANDARD_DIGEST_KEY,
+    diff_conversion,
+    fresh_view_breedings,
+    split_last_breeding,
+)
+from .metrics import METRICS, TENANT
+from .spill import spill_path
+from .standards import STANDARDS
+
+
+async def aio_get_init_params(session: AsyncSession) -> list[Any]:
+    try:
+        result = await session.exec(select_init_params())
+        return result.all()
+    except Exception as e:
+        LOGGER.error(f"Error fetching init params: {e}")
+        raise
+
+
+async def aio_get_breeding_catalog(
+    session: AsyncSession, tenant: str, full: bool = False
+) -> CatalogEntry:
+    ## El catalogo compartido lee y escribe Redis de forma sincrona: fuera del event loop
+    entry, action = await asyncio.to_thread(CATALOG.get, tenant, full=full)
+    try:
+        if action == "full":
+            result = await session.exec(select_breeding_catalog())
+            return await asyncio.to_thread(CATALOG.load, tenant, result.all())
+        if action == "incremental":
+            result = await session.exec(select_breeding_catalog(changed_since=entry.watermark))
+            return await asyncio.to_thread(CATALOG.merge, tenant, entry, result.all())
+        return entry
+    except Exception as e:
+        LOGGER.error(f"Error refreshing breeding catalog for {tenant}: {e}")
+        raise
+
+
+async def aio_get_breeding_changes(
+    session: AsyncSession, id_breeding_list: list[int]
+) -> dict[int, dt.datetime]:
+    try:
+        result = await session.exec(select_breeding_changes(id_breeding_list))
+        return {id_breeding: changed_at for id_breeding, changed_at in result.all()}
+    except Exception as e:
+        LOGGER.error(f"Error fetching source changes for breeding list {id_breeding_list}: {e}")
+        raise
+
+
+async def aio_stream_frames(
+    session: AsyncSession,
+    statement: Select,
+    schema: dict,
+    chunk_size: int = EXTRACT_CHUNK_SIZE,
+    stage: str = "extract",
+    compact_schema: dict | None = None,
+) -> AsyncIterator[pl.DataFrame]:
+    query_time = frame_time = 0.0
+    rows_out = bytes_out = 0
+    ts = time.perf_counter()
+    result = await session.stream(
+        statement, execution_options={"stream_results": True, "yield_per": chunk_size}
+    )
+    async for rows in result.partitions(chunk_size):
+        tf = time.perf_counter()
+        frame = pl.DataFrame(dict(zip(schema, zip(*rows))), schema=schema)
+        if compact_schema is not None:
+            frame = compact_frame(frame, compact_schema)
+        te = time.perf_counter()
+        query_time, frame_time = query_time + tf - ts, frame_time + te - tf
+        rows_out, bytes_out = rows_out + frame.height, bytes_out + int(frame.estimated_size())
+        yield frame
+        ts = time.perf_counter()
+    query_time += time.perf_counter() - ts
+    METRICS.observe(f"{stage}_query", query_time, rows=rows_out)
+    METRICS.observe(f"{stage}_frame", frame_time, rows=rows_out, size=bytes_out)
+    QUERY_STATS.record(
+        compile_statement(statement, session.bind), TENANT.get(), query_time, rows_out
+    )
+
+
+async def aio_collect_frames(batches: AsyncIterator[pl.DataFrame], schema: dict) -> pl.DataFrame:
+    return concat_frames([batch async for batch in batches], schema=schema)
+
+
+async def aio_get_view_breedings(
+    session: AsyncSession,
+    id_breeding_list: list[int],
+    changes: dict[int, dt.datetime] | None = None,
+) -> list[int]:
+    if not WEIGHTS_VIEW_ENABLED or not id_breeding_list:
+        return []
+    try:
+        async with session.begin_nested():
+            result = await session.exec(select_weights_view_state(id_breeding_list))
+            rows = result.all()
+    except Exception as e:
+        LOGGER.warning(f"Weights view unavailable, falling back to live join: {e}")
+        return []
+    return fresh_view_breedings(rows, changes)
+
+
+async def aio_iter_weights_consumptions(
+    session: AsyncSession,
+    id_breeding_list: list[int],
+    chunk_size: int = EXTRACT_CHUNK_SIZE,
+    changes: dict[int, dt.datetime] | None = None,
+) -> AsyncIterator[pl.DataFrame]:
+    view_list = await aio_get_view_breedings(session, id_breeding_list, changes)
+    live_list = [i for i in id_breeding_list if i not in set(view_list)]
+    try:
+        if view_list:
+            async for batch in aio_stream_frames(
+                session,
+                select_weights_view_data(view_list).order_by("id_breeding"),
+                schema=weight_consumption_schema,
+                chunk_size=chunk_size,
+                compact_schema=compact_weight_consumption_schema if COMPACT_DTYPES else None,
+                stage="weights_view",
+            ):
+                yield batch
+        if live_list:
+            async for batch in aio_stream_frames(
+                session,
+                select_breeding_weights_consumption_data(live_list).order_by("id_breeding"),
+                schema=weight_consumption_schema,
+                chunk_size=chunk_size,
+                compact_schema=compact_weight_consumption_schema if COMPACT_DTYPES else None,
+                stage="weights",
+            ):
+                yield batch
+    except Exception as e:
+        LOGGER.error(
+            f"Error fetching weights and consumptions for breeding list {id_breeding_list}: {e}"
+        )
+        raise
+
+
+async def aio_get_weights_consumptions(
+    session: AsyncSession,
+    id_breeding_list: list[int],
+    chunk_size: int = EXTRACT_CHUNK_SIZE,
+    changes: dict[int, dt.datetime] | None = None,
+) -> pl.DataFrame:
+    batches = aio_iter_weights_consumptions(
+        session, id_breeding_list, chunk_size=chunk_size, changes=changes
+    )
+    return await aio_collect_frames(batches, schema=weight_consumption_schema)
+
+
+async def aio_iter_breeding_groups(
+    session: AsyncSession,
+    id_breeding_list: list[int],
+    chunk_size: int = EXTRACT_CHUNK_SIZE,
+    changes: dict[int, dt.datetime] | None = None,
+) -> AsyncIterator[pl.DataFrame]:
+    pending = None
+    batches = aio_iter_weights_consumptions(
+        session, id_breeding_list, chunk_size=chunk_size, changes=changes
+    )
+    async for batch in batches:
+        if batch.is_empty():
+            continue
+        complete, pending = split_last_breeding(pending, batch)
+        if not complete.is_empty():
+            yield complete
+    if pending is not None:
+        yield pending
+
+
+async def aio_spill_weights_consumptions(
+    session: AsyncSession,
+    id_breeding_list: list[int],
+    folder: Path,
+    chunk_size: int = EXTRACT_CHUNK_SIZE,
+    changes: dict[int, dt.datetime] | None = None,
+) -> int:
+    rows = position = 0
+    batches = aio_iter_weights_consumptions(
+        session, id_breeding_list, chunk_size=chunk_size, changes=changes
+    )
+    async for batch in batches:
+        await asyncio.to_thread(batch.write_parquet, spill_path(folder, position))
+        rows, position = rows + batch.height, position + 1
+    return rows
+
+
+async def aio_get_stored_conversion(
+    session: AsyncSession, id_breeding_list: list[int]
+) -> pl.DataFrame:
+    try:
+        batches = aio_stream_frames(
+            session,
+            select_stored_conversion(id_breeding_list),
+            schema=stored_conversion_schema,
+            stage="stored_conversion",
+        )
+        return await aio_collect_frames(batches, schema=stored_conversion_schema)
+    except Exception as e:
+        LOGGER.error(f"Error fetching stored conversion for breeding list {id_breeding_list}: {e}")
+        raise
+
+
+async def aio_get_breeding_row_counts(
+    session: AsyncSession, id_breeding_list: list[int]
+) -> dict[int, int]:
+    try:
+        result = await session.exec(select_breeding_row_counts(id_breeding_list))
+        return {id_breeding: rows for id_breeding, rows in result.all()}
+    except Exception as e:
+        LOGGER.error(f"Error estimating rows for breeding list {id_breeding_list}: {e}")
+        raise
+
+
+async def aio_get_source_stats(session: AsyncSession, id_breeding_list: list[int]) -> list[Any]:
+    try:
+        result = await session.exec(select_source_stats(id_breeding_list))
+        return result.all()
+    except Exception as e:
+        LOGGER.error(f"Error fetching source stats: {e}")
+        raise
+
+
+async def aio_copy_conversion(
+    session: AsyncSession, data: pl.DataFrame, chunk_size: int = LOAD_CHUNK_SIZE
+) -> None:
+    connection = await session.connection()
+    await connection.execute(create_conversion_stage())
+    raw_connection = await connection.get_raw_connection()
+    for chunk in data.iter_slices(n_rows=chunk_size):
+        await raw_connection.driver_connection.copy_records_to_table(
+            conversion_stage.name,
+            records=chunk.iter_rows(),
+            columns=chunk.columns,
+            schema_name=conversion_stage.schema,
+        )
+    await session.exec(merge_conversion_stage(data.columns))
+
+
+async def aio_upsert_conversion(session: AsyncSession, data: pl.DataFrame) -> None:
+    batch_size = max(1, MAX_BIND_PARAMS // max(1, data.width))
+    for batch in data.iter_slices(n_rows=batch_size):
+        await session.exec(upsert_animalshed_conversion(batch.to_dicts()))
+
+
+async def aio_write_conversion(session: AsyncSession, data: pl.DataFrame) -> str:
+    if data.height > BULK_LOAD_THRESHOLD:
+        await aio_copy_conversion(session, data)
+        return "copy"
+    await aio_upsert_conversion(session, data)
+    return "statement"
+
+
+async def aio_save_conversion(
+    session: AsyncSession, data: pl.DataFrame, mode: str = SAVE_MODE
+) -> SaveSummary:
+    summary = SaveSummary(mode=mode)
+    if data.is_empty():
+        return summary
+    try:
+        ts = time.perf_counter()
+        if mode == "diff":
+            stored = await aio_get_stored_conversion(
+                session, data["id_breeding"].unique().to_list()
+            )
+            data, summary.inserted, summary.updated, summary.unchanged = diff_conversion(
+                data, stored
+            )
+        method = await aio_write_conversion(session, data) if not data.is_empty() else "skip"
+        await session.commit()
+        te = time.perf_counter()
+        summary.written = data.height
+        LOGGER.info(
+            f"save_conversion ({mode}/{method}): {data.height} rows in {(te - ts):.3f} seconds"
+            f" ({data.height / max(te - ts, 1e-9):.0f} rows/s)"
+        )
+        return summary
+    except Exception as e:
+        LOGGER.error(f"Error saving conversion data: {e}")
+        await session.rollback()
+        raise
+
+
+async def aio_load_conversion_standard(session: AsyncSession) -> None:
+    connection = await session.connection()
+    standard = STANDARDS.table(columns=["animal_accumulated_standard_conversion"])
+    if connection.info.get(STANDARD_DIGEST_KEY) == STANDARDS.digest:
+        return
+    await connection.execute(create_conversion_standard())
+    await connection.execute(clear_conversion_standard())
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        conversion_standard.name,
+        records=standard.iter_rows(),
+        columns=standard.columns,
+        schema_name=conversion_standard.schema,
+    )
+    connection.info[STANDARD_DIGEST_KEY] = STANDARDS.digest
+
+
+async def aio_merge_conversion_in_db(
+    session: AsyncSession,
+    id_breeding_list: list[int],
+    watermarks: dict[int, dt.datetime] | None = None,
+    mode: str = SAVE_MODE,
+    date_from: dt.date | None = None,
+    date_to: dt.date | None = None,
+) -> SaveSummary:
+    summary = SaveSummary(mode=mode)
+    try:
+        ts = time.perf_counter()
+        await aio_load_conversion_standard(session)
+        result = await session.exec(
+            merge_conversion_rows(
+                id_breeding_list,
+                watermarks=watermarks,
+                version=VERSION,
+                distinct_columns=FINGERPRINT_COLUMNS if mode == "diff" else None,
+                date_from=date_from,
+                date_to=date_to,
+            )
+        )
+        rows, inserted, written = result.one()
+        await session.commit()
+        te = time.perf_counter()
+        summary.written = written
+        if mode == "diff":
+            summary.inserted, summary.updated, summary.unchanged = (
+                inserted,
+                written - inserted,
+                rows - written,
+            )
+        LOGGER.info(
+            f"save_conversion ({mode}/sql): {written} of {rows} rows in {(te - ts):.3f} seconds"
+            f" ({rows / max(te - ts, 1e-9):.0f} rows/s)"
+        )
+        return summary
+    except Exception as e:
+        LOGGER.error(f"Error computing conversion in database: {e}")
+        (await session.connection()).info.pop(STANDARD_DIGEST_KEY, None)
+        await session.rollback()
+        raise
@@ -0,0 +1,227 @@
+# Standard Library
+import datetime as dt
+import io
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+# External
+import polars as pl
+
+# Project
+from app.config import CATALOG_REFRESH, CATALOG_TTL, COMPACT_DTYPES, LOGGER
+from app.db import RedisResultCache, get_redis
+from app.schemas import compact_init_params_schema, init_params_schema
+
+# Local
+from .dtypes import compact_frame
+
+
+CATALOG_PREFIX = "conversion:catalog:"
+CATALOG_STATS_KEY = "conversion:catalog:stats"
+WATERMARK_KEY = "watermark"
+LOADED_KEY = "loaded_at"
+CHECKED_KEY = "checked_at"
+
+
+def shared_key(tenant: str) -> str:
+    return f"{tenant}:breedings"
+
+
+@dataclass
+class CatalogEntry:
+    frame: pl.DataFrame
+    watermark: dt.datetime | None
+    loaded_at: float
+    checked_at: float
+
+
+def dump_entry(entry: CatalogEntry) -> bytes:
+    buffer = io.BytesIO()
+    entry.frame.write_parquet(
+        buffer,
+        metadata={
+            WATERMARK_KEY: entry.watermark.isoformat() if entry.watermark else "",
+            LOADED_KEY: str(entry.loaded_at),
+            CHECKED_KEY: str(entry.checked_at),
+        },
+    )
+    return buffer.getvalue()
+
+
+def load_entry(raw: bytes) -> CatalogEntry:
+    metadata = pl.read_parquet_metadata(io.BytesIO(raw))
+    return CatalogEntry(
+        frame=pl.read_parquet(io.BytesIO(raw)),
+        watermark=(
+            dt.datetime.fromisoformat(metadata[WATERMARK_KEY]) if metadata[WATERMARK_KEY] else None
+        ),
+        loaded_at=float(metadata[LOADED_KEY]),
+        checked_at=float(metadata[CHECKED_KEY]),
+    )
+
+
+def catalog_frame(frame: pl.DataFrame, compact: bool = COMPACT_DTYPES) -> pl.DataFrame:
+    frame = frame.select(*init_params_schema)
+    return compact_frame(frame, compact_init_params_schema) if compact else frame
+
+
+def get_shared_catalog() -> RedisResultCache | None:
+    client = get_redis(decode_responses=False)
+    if client is None:
+        return None
+    return RedisResultCache(
+        client, ttl=CATALOG_TTL, prefix=CATALOG_PREFIX, stats_key=CATALOG_STATS_KEY
+    )
+
+
+class BreedingCatalog:
+    def __init__(
+        self,
+        ttl: int = CATALOG_TTL,
+        refresh: int = CATALOG_REFRESH,
+        shared: RedisResultCache | None = None,
+    ) -> None:
+        self.ttl = ttl
+        self.refresh = refresh
+        self.shared = shared
+        self.hits = 0
+        self.full_loads = 0
+        self.incremental_loads = 0
+        self._entries: dict[str, CatalogEntry] = {}
+        self._lock = threading.Lock()
+
+    def _action(self, entry: CatalogEntry | None, now: float) -> str | None:
+        if entry is None or entry.watermark is None or now - entry.loaded_at >= self.ttl:
+            return "full"
+        if now - entry.checked_at >= self.refresh:
+            return "incremental"
+        return None
+
+    def _get_shared(self, tenant: str) -> CatalogEntry | None:
+        if self.shared is None:
+            return None
+        try:
+            raw = self.shared.get(shared_key(tenant))
+            return load_entry(raw) if raw is not None else None
+        except Exception as e:
+            LOGGER.warning(f"Shared breeding catalog lookup failed for {tenant}: {e}")
+            return None
+
+    def _store(self, tenant: str, entry: CatalogEntry) -> CatalogEntry:
+        with self._lock:
+            self._entries[tenant] = entry
+        if self.shared is not None:
+            try:
+                self.shared.set(shared_key(tenant), dump_entry(entry))
+            except Exception as e:
+                LOGGER.warning(f"Shared breeding catalog store failed for {tenant}: {e}")
+        return entry
+
+    def get(self, tenant: str, full: bool = False) -> tuple[CatalogEntry | None, str | None]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(tenant)
+        if full:
+            return entry, "full"
+
+        action = self._action(entry, now)
+        if action is not None:
+            ## Otra replica pudo haberlo refrescado
+            shared = self._get_shared(tenant)
+            if shared is not None and (entry is None or shared.checked_at > entry.checked_at):
+                with self._lock:
+                    self._entries[tenant] = shared
+                entry, action = shared, self._action(shared, now)
+        if action is None:
+            self.hits += 1
+        return entry, action
+
+    def load(self, tenant: str, rows: list[Any]) -> CatalogEntry:
+        now = time.time()
+        changes = pl.DataFrame(
+            rows, schema={**init_params_schema, "changed_at": pl.Datetime}, orient="row"
+        )
+        self.full_loads += 1
+        LOGGER.info(f"{tenant}: breeding catalog loaded, {changes.height} rows")
+        return self._store(
+            tenant,
+            CatalogEntry(
+                frame=catalog_frame(changes),
+                watermark=changes["changed_at"].max(),
+                loaded_at=now,
+                checked_at=now,
+            ),
+        )
+
+    def merge(self, tenant: str, entry: CatalogEntry, rows: list[Any]) -> CatalogEntry:
+        now = time.time()
+        changes = pl.DataFrame(
+            rows,
+            schema={**init_params_schema, "active": pl.Boolean, "changed_at": pl.Datetime},
+            orient="row",
+        )
+        ## Las filas de una crianza con cambios se reemplazan completas; las cerradas salen
+        frame = pl.concat(
+            [
+                entry.frame.filter(~pl.col("id_breeding").is_in(changes["id_breeding"].implode())),
+                changes.filter(pl.col("active")).select(*init_params_schema),
+            ],
+            how="vertical_relaxed",
+        )
+        watermark = max(filter(None, [entry.watermark, changes["changed_at"].max()]))
+        self.incremental_loads += 1
+        if not changes.is_empty():
+            LOGGER.info(
+                f"{tenant}: breeding catalog refreshed, "
+                f"{changes['id_breeding'].n_unique()} breedings changed"
+            )
+        return self._store(
+            tenant,
+            CatalogEntry(
+                frame=catalog_frame(frame),
+                watermark=watermark,
+                loaded_at=entry.loaded_at,
+                checked_at=now,
+            ),
+        )
+
+    def invalidate(self, tenant: str | None = None) -> int:
+        with self._lock:
+            tenants = [tenant] if tenant is not None else list(self._entries)
+            invalidated = sum(self._entries.pop(name, None) is not None for name in tenants)
+        if self.shared is not None:
+            invalidated = max(invalidated, self.shared.invalidate(f"{tenant}:" if tenant else ""))
+        LOGGER.info(f"Breeding catalog invalidated for {tenant or 'all tenants'}")
+        return invalidated
+
+    def tenants(self) -> list[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            tenants = {
+                tenant: {
+                    "breedings": entry.frame["id_breeding"].n_unique(),
+                    "rows": entry.frame.height,
+                    "watermark": entry.watermark,
+                    "age": round(now - entry.loaded_at, 3),
+                    "checked": round(now - entry.checked_at, 3),
+                }
+                for tenant, entry in self._entries.items()
+            }
+        return {
+            "backend": "redis" if self.shared is not None else "memory",
+            "ttl": self.ttl,
+            "refresh": self.refresh,
+            "hits": self.hits,
+            "full_loads": self.full_loads,
+            "incremental_loads": self.incremental_loads,
+            "tenants": tenants,
+        }
+
+
+CATALOG = BreedingCatalog(shared=get_shared_catalog())
@@ -0,0 +1,50 @@
+# External
+import polars as pl
+
+
+## Un Float32 sirve si al redondearlo a 6 decimales se recupera exacto el Float64 de origen
+FLOAT_DECIMALS = 6
+
+
+def round_trips(original: pl.Series, candidate: pl.Series) -> bool:
+    if candidate.null_count() != original.null_count():
+        return False
+    restored = candidate.cast(original.dtype)
+    if original.dtype.is_float():
+        return (restored.round(FLOAT_DECIMALS) == original).all()
+    return (restored == original).all()
+
+
+def compact_series(series: pl.Series, dtype: pl.DataType) -> pl.Series:
+    if series.dtype == dtype:
+        return series
+    candidate = series.cast(dtype, strict=False)
+    ## Un valor fuera de rango, con hora o con más precisión mantiene la columna ancha
+    return candidate if round_trips(series, candidate) else series
+
+
+def compact_frame(frame: pl.DataFrame, schema: dict) -> pl.DataFrame:
+    return frame.with_columns(
+        compact_series(frame[name], dtype) for name, dtype in schema.items() if name in frame
+    )
+
+
+def widen_floats(*names: str) -> pl.Expr:
+    ## El valor Float64 original se recupera exacto al redondear a FLOAT_DECIMALS
+    columns = pl.col(*names) if names else pl.col(pl.Float32)
+    return columns.cast(pl.Float64).round(FLOAT_DECIMALS)
+
+
+def concat_frames(
+    frames: list[pl.DataFrame] | list[pl.LazyFrame], schema: dict
+) -> pl.DataFrame | pl.LazyFrame:
+    if not frames:
+        return pl.DataFrame(schema=schema)
+    ## Si algún bloque quedó en Float64, los Float32 del resto se ensanchan antes de unir
+    schemas = [frame.collect_schema() for frame in frames]
+    wide = {name for frame in schemas for name, dtype in frame.items() if dtype == pl.Float64}
+    aligned = []
+    for frame, frame_schema in zip(frames, schemas):
+        narrow = [name for name in wide if frame_schema.get(name) == pl.Float32]
+        aligned.append(frame.with_columns(widen_floats(*narrow)) if narrow else frame)
+    return pl.concat(aligned, how="vertical_relaxed", rechunk=False)
@@ -1,18 +1,71 @@
 # Standard Library
-from typing import Any
+import datetime as dt
+import io
+import time
+from pathlib import Path
+from typing import Any, Iterator
 
 # External
 import polars as pl
+from sqlalchemy.sql import Select
 from sqlmodel import Session
-from pathlib import Path
 
 # Project
-from app.config import LOGGER
+from app.config import (
+    BULK_LOAD_THRESHOLD,
+    COMPACT_DTYPES,
+    EXTRACT_CHUNK_SIZE,
+    LOAD_CHUNK_SIZE,
+    LOGGER,
+    MAX_BIND_PARAMS,
+    SAVE_MODE,
+    VERSION,
+    WEIGHTS_VIEW_ENABLED,
+    WEIGHTS_VIEW_MAX_AGE,
+)
 from app.db import (
+    QUERY_STATS,
+    clear_conversion_standard,
+    compile_statement,
+    copy_conversion_stage,
+    copy_conversion_standard,
+    create_conversion_stage,
+    create_conversion_standard,
+    merge_conversion_rows,
+    merge_conversion_stage,
+    select_breeding_catalog,
+    select_breeding_changes,
+    select_breeding_row_counts,
     select_breeding_weights_consumption_data,
     select_init_params,
+    select_source_stats,
+    select_stored_conversion,
+    select_weights_view_data,
+    select_weights_view_state,
     upsert_animalshed_conversion,
 )
+from app.schemas import (
+    SaveSummary,
+    compact_weight_consumption_schema,
+    stored_conversion_schema,
+    weight_consumption_schema,
+)
+
+# Local
+from .catalog import CATALOG, CatalogEntry
+from .dtypes import compact_frame, concat_frames
+from .metrics import METRICS, TENANT
+from .spill import spill_path
+from .standards import STANDARDS
+
+
+FINGERPRINT_COLUMNS = [
+    "animal_accumulated_conversion",
+    "entity_accumulated_conversion",
+    "accumulated_standard_conversion",
+    "calculation_formula_version",
+]
+STANDARD_DIGEST_KEY = "conversion_standard_digest"
 
 
 def get_init_params(session: Session) -> list[Any]:
@@ -25,11 +78,135 @@ def get_init_params(session: Session) -> list[Any]:
         raise
 
 
-def get_weights_consumptions(session: Session, id_breeding_list: list[int]) -> list[Any]:
+def stream_frames(
+    session: Session,
+    statement: Select,
+    schema: dict,
+    chunk_size: int = EXTRACT_CHUNK_SIZE,
+    stage: str = "extract",
+    compact_schema: dict | None = None,
+) -> Iterator[pl.DataFrame]:
+    ## Cursor del lado del servidor: en memoria sólo vive un bloque de filas a la vez
+    ## Se mide por separado la espera a la base de datos y la construccion de cada bloque
+    query_time = frame_time = 0.0
+    rows_out = bytes_out = 0
+    ts = time.perf_counter()
+    result = session.exec(
+        statement, execution_options={"stream_results": True, "yield_per": chunk_size}
+    )
+    for rows in result.partitions(chunk_size):
+        tf = time.perf_counter()
+        frame = pl.DataFrame(dict(zip(schema, zip(*rows))), schema=schema)
+        if compact_schema is not None:
+            frame = compact_frame(frame, compact_schema)
+        te = time.perf_counter()
+        query_time, frame_time = query_time + tf - ts, frame_time + te - tf
+        rows_out, bytes_out = rows_out + frame.height, bytes_out + int(frame.estimated_size())
+        yield frame
+        ts = time.perf_counter()
+    query_time += time.perf_counter() - ts
+    METRICS.observe(f"{stage}_query", query_time, rows=rows_out)
+    METRICS.observe(f"{stage}_frame", frame_time, rows=rows_out, size=bytes_out)
+    QUERY_STATS.record(
+        compile_statement(statement, session.get_bind()),
+        TENANT.get(),
+        query_time,
+        rows_out,
+    )
+
+
+def collect_frames(batches: Iterator[pl.DataFrame], schema: dict) -> pl.DataFrame:
+    return concat_frames(list(batches), schema=schema)
+
+
+def split_last_breeding(
+    pending: pl.DataFrame | None, batch: pl.DataFrame
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    ## Con filas ordenadas por id_breeding la ultima crianza del bloque puede seguir en el
+    ## siguiente: se retiene y el resto son crianzas completas
+    if pending is not None:
+        batch = concat_frames([pending, batch], schema=batch.schema)
+    last = pl.col("id_breeding").eq_missing(batch["id_breeding"][-1])
+    return batch.filter(~last), batch.filter(last)
+
+
+def group_breedings(batches: Iterator[pl.DataFrame]) -> Iterator[pl.DataFrame]:
+    pending = None
+    for batch in batches:
+        if batch.is_empty():
+            continue
+        complete, pending = split_last_breeding(pending, batch)
+        if not complete.is_empty():
+            yield complete
+    if pending is not None:
+        yield pending
+
+
+def fresh_view_breedings(
+    rows: list[Any], changes: dict[int, dt.datetime] | None, max_age: int = WEIGHTS_VIEW_MAX_AGE
+) -> list[int]:
+    ## Desde la vista sólo las crianzas sin cambios en el origen posteriores al último refresco.
+    ## El cambio se compara con el refresco de su misma clase (con o sin zona horaria)
+    def unchanged(
+        id_breeding: int, refreshed_at: dt.datetime, refreshed_at_tz: dt.datetime
+    ) -> bool:
+        changed_at = changes.get(id_breeding) if changes is not None else None
+        if changed_at is None:
+            return True
+        return changed_at <= (refreshed_at if changed_at.tzinfo is None else refreshed_at_tz)
+
+    return [
+        id_breeding
+        for id_breeding, refreshed_at, refreshed_at_tz, age in rows
+        if age is not None
+        and age.total_seconds() <= max_age
+        and unchanged(id_breeding, refreshed_at, refreshed_at_tz)
+    ]
+
+
+def get_view_breedings(
+    session: Session, id_breeding_list: list[int], changes: dict[int, dt.datetime] | None = None
+) -> list[int]:
+    if not WEIGHTS_VIEW_ENABLED or not id_breeding_list:
+        return []
     try:
-        result = session.exec(select_breeding_weights_consumption_data(id_breeding_list))
-        result = result.all()
-        return result
+        ## Savepoint: si la vista aún no existe la sesion sigue utilizable para el join en vivo
+        with session.begin_nested():
+            rows = session.exec(select_weights_view_state(id_breeding_list)).all()
+    except Exception as e:
+        LOGGER.warning(f"Weights view unavailable, falling back to live join: {e}")
+        return []
+    return fresh_view_breedings(rows, changes)
+
+
+def iter_weights_consumptions(
+    session: Session,
+    id_breeding_list: list[int],
+    chunk_size: int = EXTRACT_CHUNK_SIZE,
+    changes: dict[int, dt.datetime] | None = None,
+) -> Iterator[pl.DataFrame]:
+    ## Ordenado por crianza: group_breedings arma grupos de crianzas completas sin leer todo
+    view_list = get_view_breedings(session, id_breeding_list, changes)
+    live_list = [i for i in id_breeding_list if i not in set(view_list)]
+    try:
+        if view_list:
+            yield from stream_frames(
+                session,
+                select_weights_view_data(view_list).order_by("id_breeding"),
+                schema=weight_consumption_schema,
+                chunk_size=chunk_size,
+                compact_schema=compact_weight_consumption_schema if COMPACT_DTYPES else None,
+                stage="weights_view",
+            )
+        if live_list:
+            yield from stream_frames(
+                session,
+                select_breeding_weights_consumption_data(live_list).order_by("id_breeding"),
+                schema=weight_consumption_schema,
+                chunk_size=chunk_size,
+                compact_schema=compact_weight_consumption_schema if COMPACT_DTYPES else None,
+                stage="weights",
+            )
     except Exception as e:
         LOGGER.error(
             f"Error fetching weights and consumptions for breeding list {id_breeding_list}: {e}"
@@ -37,41 +214,233 @@ def get_weights_consumptions(session: Session, id_breeding_list: list[int]) -> l
         raise
 
 
-def get_standard():
-    base = Path(__file__).resolve().parent.parent.parent  # ← carpeta src/
-    pollos = base / "maestroestandargenetica_202510160912_pollos.csv"
-    cerdos = base / "maestroestandargenetica_202510161619_cerdos.csv"
-
-    pollos_df = pl.read_csv(pollos).with_columns(pl.lit(1).alias("id_stage"))
-    cerdos_df = pl.read_csv(cerdos).with_columns(pl.lit(2).alias("id_stage"))
-    std = pl.concat(
-        items=[
-            pollos_df[
-                "edad", "sexo", "nombreGenetica", "conversion", "conversionAcumulada", "id_stage"
-            ],
-            cerdos_df[
-                "edad", "sexo", "nombreGenetica", "conversion", "conversionAcumulada", "id_stage"
-            ],
-        ]
+def get_weights_consumptions(
+    session: Session,
+    id_breeding_list: list[int],
+    chunk_size: int = EXTRACT_CHUNK_SIZE,
+    changes: dict[int, dt.datetime] | None = None,
+) -> pl.DataFrame:
+    batches = iter_weights_consumptions(
+        session, id_breeding_list, chunk_size=chunk_size, changes=changes
     )
-    std = std.filter(pl.col("nombreGenetica") == "ROSS - 2020")
-    std = std.rename(
-        {
-            "conversionAcumulada": "animal_daily_standard_conversion",
-            "conversion": "animal_accumulated_standard_conversion",
-            "edad": "animals_age",
-            "sexo": "sex",
-        }
+    return collect_frames(batches, schema=weight_consumption_schema)
+
+
+def iter_breeding_groups(
+    session: Session,
+    id_breeding_list: list[int],
+    chunk_size: int = EXTRACT_CHUNK_SIZE,
+    changes: dict[int, dt.datetime] | None = None,
+) -> Iterator[pl.DataFrame]:
+    return group_breedings(
+        iter_weights_consumptions(session, id_breeding_list, chunk_size=chunk_size, changes=changes)
+    )
+
+
+def spill_weights_consumptions(
+    session: Session,
+    id_breeding_list: list[int],
+    folder: Path,
+    chunk_size: int = EXTRACT_CHUNK_SIZE,
+    changes: dict[int, dt.datetime] | None = None,
+) -> int:
+    ## Cada bloque del cursor va a su propio Parquet: en memoria vive un solo bloque
+    rows = 0
+    batches = iter_weights_consumptions(
+        session, id_breeding_list, chunk_size=chunk_size, changes=changes
     )
+    for position, batch in enumerate(batches):
+        batch.write_parquet(spill_path(folder, position))
+        rows += batch.height
+    return rows
+
 
-    return std
+def get_stored_conversion(session: Session, id_breeding_list: list[int]) -> pl.DataFrame:
+    try:
+        batches = stream_frames(
+            session,
+            select_stored_conversion(id_breeding_list),
+            schema=stored_conversion_schema,
+            stage="stored_conversion",
+        )
+        return collect_frames(batches, schema=stored_conversion_schema)
+    except Exception as e:
+        LOGGER.error(f"Error fetching stored conversion for breeding list {id_breeding_list}: {e}")
+        raise
 
 
-def save_conversion(session: Session, data: list[dict]) -> None:
+def get_breeding_catalog(session: Session, tenant: str, full: bool = False) -> CatalogEntry:
+    entry, action = CATALOG.get(tenant, full=full)
     try:
-        session.exec(upsert_animalshed_conversion(data))
+        if action == "full":
+            return CATALOG.load(tenant, session.exec(select_breeding_catalog()).all())
+        if action == "incremental":
+            rows = session.exec(select_breeding_catalog(changed_since=entry.watermark)).all()
+            return CATALOG.merge(tenant, entry, rows)
+        return entry
+    except Exception as e:
+        LOGGER.error(f"Error refreshing breeding catalog for {tenant}: {e}")
+        raise
+
+
+def get_breeding_changes(session: Session, id_breeding_list: list[int]) -> dict[int, dt.datetime]:
+    try:
+        result = session.exec(select_breeding_changes(id_breeding_list))
+        return {id_breeding: changed_at for id_breeding, changed_at in result.all()}
+    except Exception as e:
+        LOGGER.error(f"Error fetching source changes for breeding list {id_breeding_list}: {e}")
+        raise
+
+
+def get_breeding_row_counts(session: Session, id_breeding_list: list[int]) -> dict[int, int]:
+    try:
+        result = session.exec(select_breeding_row_counts(id_breeding_list))
+        return {id_breeding: rows for id_breeding, rows in result.all()}
+    except Exception as e:
+        LOGGER.error(f"Error estimating rows for breeding list {id_breeding_list}: {e}")
+        raise
+
+
+def get_source_stats(session: Session, id_breeding_list: list[int]) -> list[Any]:
+    try:
+        return session.exec(select_source_stats(id_breeding_list)).all()
+    except Exception as e:
+        LOGGER.error(f"Error fetching source stats: {e}")
+        raise
+
+
+def copy_conversion(
+    session: Session, data: pl.DataFrame, chunk_size: int = LOAD_CHUNK_SIZE
+) -> None:
+    connection = session.connection()
+    connection.execute(create_conversion_stage())
+    copy_sql = copy_conversion_stage(data.columns)
+    with connection.connection.cursor() as cursor:
+        for chunk in data.iter_slices(n_rows=chunk_size):
+            cursor.copy_expert(copy_sql, io.StringIO(chunk.write_csv(include_header=False)))
+    session.exec(merge_conversion_stage(data.columns))
+
+
+def upsert_conversion(session: Session, data: pl.DataFrame) -> None:
+    ## PostgreSQL admite como maximo 65535 parametros por sentencia
+    batch_size = max(1, MAX_BIND_PARAMS // max(1, data.width))
+    for batch in data.iter_slices(n_rows=batch_size):
+        session.exec(upsert_animalshed_conversion(batch.to_dicts()))
+
+
+def conversion_fingerprint() -> pl.Expr:
+    ## NaN y -0.0 se normalizan para que valores equivalentes tengan la misma huella
+    values = [
+        (pl.col(column).cast(pl.Float64).fill_nan(None) + 0.0)
+        for column in FINGERPRINT_COLUMNS
+        if column != "calculation_formula_version"
+    ]
+    return pl.struct(*values, pl.col("calculation_formula_version")).hash().alias("_fingerprint")
+
+
+def diff_conversion(data: pl.DataFrame, stored: pl.DataFrame) -> tuple[pl.DataFrame, int, int, int]:
+    stored = stored.select("id_breeding", "date", conversion_fingerprint().alias("_stored"))
+    data = data.with_columns(conversion_fingerprint()).join(
+        stored, on=["id_breeding", "date"], how="left"
+    )
+    is_new = pl.col("_stored").is_null()
+    is_changed = pl.col("_stored") != pl.col("_fingerprint")
+    inserted, updated = data.select(
+        is_new.sum().alias("inserted"), is_changed.sum().alias("updated")
+    ).row(0)
+    changed = data.filter(is_new | is_changed).drop("_fingerprint", "_stored")
+    return changed, inserted, updated, data.height - inserted - updated
+
+
+def write_conversion(session: Session, data: pl.DataFrame) -> str:
+    if data.height > BULK_LOAD_THRESHOLD:
+        copy_conversion(session, data)
+        return "copy"
+    upsert_conversion(session, data)
+    return "statement"
+
+
+def save_conversion(session: Session, data: pl.DataFrame, mode: str = SAVE_MODE) -> SaveSummary:
+    summary = SaveSummary(mode=mode)
+    if data.is_empty():
+        return summary
+    try:
+        ts = time.perf_counter()
+        if mode == "diff":
+            stored = get_stored_conversion(session, data["id_breeding"].unique().to_list())
+            data, summary.inserted, summary.updated, summary.unchanged = diff_conversion(
+                data, stored
+            )
+        method = write_conversion(session, data) if not data.is_empty() else "skip"
         session.commit()
+        te = time.perf_counter()
+        summary.written = data.height
+        LOGGER.info(
+            f"save_conversion ({mode}/{method}): {data.height} rows in {(te - ts):.3f} seconds"
+            f" ({data.height / max(te - ts, 1e-9):.0f} rows/s)"
+        )
+        return summary
     except Exception as e:
         LOGGER.error(f"Error saving conversion data: {e}")
         session.rollback()
         raise
+
+
+def load_conversion_standard(session: Session) -> None:
+    connection = session.connection()
+    standard = STANDARDS.table(columns=["animal_accumulated_standard_conversion"])
+    ## El info de la conexion se limpia al reconectar, igual que la tabla temporal
+    if connection.info.get(STANDARD_DIGEST_KEY) == STANDARDS.digest:
+        return
+    connection.execute(create_conversion_standard())
+    connection.execute(clear_conversion_standard())
+    with connection.connection.cursor() as cursor:
+        cursor.copy_expert(
+            copy_conversion_standard(standard.columns),
+            io.StringIO(standard.write_csv(include_header=False)),
+        )
+    connection.info[STANDARD_DIGEST_KEY] = STANDARDS.digest
+
+
+def merge_conversion_in_db(
+    session: Session,
+    id_breeding_list: list[int],
+    watermarks: dict[int, dt.datetime] | None = None,
+    mode: str = SAVE_MODE,
+    date_from: dt.date | None = None,
+    date_to: dt.date | None = None,
+) -> SaveSummary:
+    summary = SaveSummary(mode=mode)
+    try:
+        ts = time.perf_counter()
+        load_conversion_standard(session)
+        rows, inserted, written = session.exec(
+            merge_conversion_rows(
+                id_breeding_list,
+                watermarks=watermarks,
+                version=VERSION,
+                distinct_columns=FINGERPRINT_COLUMNS if mode == "diff" else None,
+                date_from=date_from,
+                date_to=date_to,
+            )
+        ).one()
+        session.commit()
+        te = time.perf_counter()
+        summary.written = written
+        if mode == "diff":
+            summary.inserted, summary.updated, summary.unchanged = (
+                inserted,
+                written - inserted,
+                rows - written,
+            )
+        LOGGER.info(
+            f"save_conversion ({mode}/sql): {written} of {rows} rows in {(te - ts):.3f} seconds"
+            f" ({rows / max(te - ts, 1e-9):.0f} rows/s)"
+        )
+        return summary
+    except Exception as e:
+        LOGGER.error(f"Error computing conversion in database: {e}")
+        ## El rollback tambien deshace la carga del estandar en esta conexion
+        session.connection().info.pop(STANDARD_DIGEST_KEY, None)
+        session.rollback()
+        raise
@@ -0,0 +1,142 @@
+# Standard Library
+import datetime as dt
+import queue
+import threading
+
+# External
+from redis import Redis
+
+# Project
+from app.config import JOB_HEARTBEAT_TTL, JOB_TTL
+from app.db import get_redis
+from app.schemas import ConversionJob
+
+
+JOB_KEY = "conversion:job:{}"
+JOB_QUEUE_KEY = "conversion:jobs:queue"
+JOB_PROCESSING_KEY = "conversion:jobs:processing:{}"
+JOB_HEARTBEAT_KEY = "conversion:jobs:heartbeat:{}"
+JOB_WORKERS_KEY = "conversion:jobs:workers"
+
+
+class MemoryJobQueue:
+    def __init__(self, ttl: int = JOB_TTL) -> None:
+        self.ttl = ttl
+        self._jobs: dict[str, ConversionJob] = {}
+        self._queue: queue.Queue[str] = queue.Queue()
+        self._lock = threading.Lock()
+
+    def _prune(self) -> None:
+        ## Equivalente al TTL de Redis: se olvidan los trabajos terminados hace mas de ttl segundos
+        limit = dt.datetime.now(dt.timezone.utc) - dt.timedelta(seconds=self.ttl)
+        for job_id in [
+            job.id
+            for job in self._jobs.values()
+            if job.status in ("done", "failed") and job.updated_at < limit
+        ]:
+            del self._jobs[job_id]
+
+    def save(self, job: ConversionJob) -> None:
+        with self._lock:
+            self._jobs[job.id] = job.model_copy(deep=True)
+
+    def get(self, job_id: str) -> ConversionJob | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy(deep=True) if job is not None else None
+
+    def enqueue(self, job: ConversionJob) -> None:
+        with self._lock:
+            self._prune()
+        self.save(job)
+        self._queue.put(job.id)
+
+    def dequeue(self, worker: str, timeout: int = 1) -> ConversionJob | None:
+        try:
+            job_id = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return self.get(job_id)
+
+    ## En proceso la cola muere con sus trabajadores: no hay nada que confirmar ni recuperar
+    def ack(self, worker: str, job_id: str) -> None:
+        return None
+
+    def heartbeat(self, worker: str) -> None:
+        return None
+
+    def recover(self) -> list[str]:
+        return []
+
+
+class RedisJobQueue:
+    def __init__(
+        self, client: Redis, ttl: int = JOB_TTL, heartbeat_ttl: int = JOB_HEARTBEAT_TTL
+    ) -> None:
+        self.client = client
+        self.ttl = ttl
+        self.heartbeat_ttl = heartbeat_ttl
+
+    def save(self, job: ConversionJob) -> None:
+        self.client.set(JOB_KEY.format(job.id), job.model_dump_json(), ex=self.ttl)
+
+    def get(self, job_id: str) -> ConversionJob | None:
+        raw = self.client.get(JOB_KEY.format(job_id))
+        return ConversionJob.model_validate_json(raw) if raw is not None else None
+
+    def enqueue(self, job: ConversionJob) -> None:
+        pipeline = self.client.pipeline()
+        pipeline.set(JOB_KEY.format(job.id), job.model_dump_json(), ex=self.ttl)
+        pipeline.lpush(JOB_QUEUE_KEY, job.id)
+        pipeline.execute()
+
+    def dequeue(self, worker: str, timeout: int = 1) -> ConversionJob | None:
+        ## BLMOVE deja el id en la lista del trabajador hasta el ack: si el proceso muere no se
+        ## pierde. Timeout 0 bloquea indefinidamente
+        job_id = self.client.blmove(
+            JOB_QUEUE_KEY, JOB_PROCESSING_KEY.format(worker), max(1, timeout), "RIGHT", "LEFT"
+        )
+        if job_id is None:
+            return None
+        job = self.get(job_id)
+        if job is None:
+            self.ack(worker, job_id)
+        return job
+
+    def ack(self, worker: str, job_id: str) -> None:
+        self.client.lrem(JOB_PROCESSING_KEY.format(worker), 0, job_id)
+
+    def heartbeat(self, worker: str) -> None:
+        pipeline = self.client.pipeline()
+        pipeline.sadd(JOB_WORKERS_KEY, worker)
+        pipeline.set(JOB_HEARTBEAT_KEY.format(worker), "1", ex=self.heartbeat_ttl)
+        pipeline.execute()
+
+    def recover(self) -> list[str]:
+        ## Trabajadores sin heartbeat (caidos o redesplegados): sus trabajos vuelven al frente
+        requeued = []
+        for worker in self.client.smembers(JOB_WORKERS_KEY):
+            if self.client.exists(JOB_HEARTBEAT_KEY.format(worker)):
+                continue
+            processing = JOB_PROCESSING_KEY.format(worker)
+            while job_id := self.client.lmove(processing, JOB_QUEUE_KEY, "RIGHT", "RIGHT"):
+                job = self.get(job_id)
+                if job is not None and job.status in ("done", "failed"):
+                    ## Termino pero no alcanzo a confirmar: no se repite
+                    self.client.lrem(JOB_QUEUE_KEY, 0, job_id)
+                    continue
+                if job is not None:
+                    job.status, job.stage = "queued", "requeued"
+                    job.updated_at = dt.datetime.now(dt.timezone.utc)
+                    self.save(job)
+                requeued.append(job_id)
+            self.client.srem(JOB_WORKERS_KEY, worker)
+        return requeued
+
+
+def get_job_queue() -> MemoryJobQueue | RedisJobQueue:
+    client = get_redis()
+    return RedisJobQueue(client) if client is not None else MemoryJobQueue()
+
+
+JOBS = get_job_queue()
@@ -0,0 +1,121 @@
+# Standard Library
+import threading
+import time
+
+# External
+from redis import Redis
+
+# Project
+from app.config import SHARD_LEASE_TTL
+from app.db import get_redis
+
+
+LEASE_KEY = "conversion:lease:{}"
+DONE_KEY = "conversion:lease-done:{}"
+
+## Sólo el dueño renueva o libera: comparar y modificar en un solo paso
+RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class MemoryLeaseStore:
+    def __init__(self, ttl: int = SHARD_LEASE_TTL) -> None:
+        self.ttl = ttl
+        self._leases: dict[str, tuple[str, float]] = {}
+        self._done: dict[str, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _holder(self, key: str, now: float) -> str | None:
+        owner, expires_at = self._leases.get(key, (None, 0.0))
+        return owner if expires_at > now else None
+
+    def acquire(self, key: str, owner: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self._holder(key, now) not in (None, owner):
+                return False
+            self._leases[key] = (owner, now + self.ttl)
+            return True
+
+    def renew(self, key: str, owner: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self._holder(key, now) != owner:
+                return False
+            self._leases[key] = (owner, now + self.ttl)
+            return True
+
+    def release(self, key: str, owner: str) -> bool:
+        with self._lock:
+            if self._holder(key, time.monotonic()) != owner:
+                return False
+            del self._leases[key]
+            return True
+
+    def complete(self, key: str, owner: str, token: str) -> bool:
+        with self._lock:
+            self._done[key] = (token, time.monotonic() + self.ttl)
+        return self.release(key, owner)
+
+    def completed(self, key: str) -> str | None:
+        with self._lock:
+            token, expires_at = self._done.get(key, (None, 0.0))
+            return token if expires_at > time.monotonic() else None
+
+    def holders(self, prefix: str = "") -> dict[str, str]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: owner
+                for key, (owner, expires_at) in self._leases.items()
+                if key.startswith(prefix) and expires_at > now
+            }
+
+
+class RedisLeaseStore:
+    def __init__(self, client: Redis, ttl: int = SHARD_LEASE_TTL) -> None:
+        self.client = client
+        self.ttl = ttl
+        self._renew = client.register_script(RENEW_SCRIPT)
+        self._release = client.register_script(RELEASE_SCRIPT)
+
+    def acquire(self, key: str, owner: str) -> bool:
+        return bool(self.client.set(LEASE_KEY.format(key), owner, nx=True, px=self.ttl * 1000))
+
+    def renew(self, key: str, owner: str) -> bool:
+        return bool(self._renew(keys=[LEASE_KEY.format(key)], args=[owner, self.ttl * 1000]))
+
+    def release(self, key: str, owner: str) -> bool:
+        return bool(self._release(keys=[LEASE_KEY.format(key)], args=[owner]))
+
+    def complete(self, key: str, owner: str, token: str) -> bool:
+        self.client.set(DONE_KEY.format(key), token, ex=self.ttl)
+        return self.release(key, owner)
+
+    def completed(self, key: str) -> str | None:
+        return self.client.get(DONE_KEY.format(key))
+
+    def holders(self, prefix: str = "") -> dict[str, str]:
+        pattern = LEASE_KEY.format(f"{prefix}*")
+        keys = list(self.client.scan_iter(match=pattern, count=500))
+        owners = self.client.mget(keys) if keys else []
+        start = len(LEASE_KEY.format(""))
+        return {key[start:]: owner for key, owner in zip(keys, owners) if owner is not None}
+
+
+def get_lease_store() -> MemoryLeaseStore | RedisLeaseStore:
+    client = get_redis()
+    return RedisLeaseStore(client) if client is not None else MemoryLeaseStore()
+
+
+LEASES = get_lease_store()
@@ -0,0 +1,133 @@
+# Standard Library
+import resource
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+## Tenant en curso; get_conversion lo fija para que cada etapa se registre por tenant
+TENANT: ContextVar[str] = ContextVar("tenant", default="")
+
+
+@dataclass
+class Stage:
+    name: str
+    tenant: str
+    rows: int = 0
+    bytes: int = 0
+
+
+@dataclass
+class StageSeries:
+    buckets: list[int]
+    count: int = 0
+    sum: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+    last_bytes: int = 0
+    peak_bytes: int = 0
+
+
+def peak_rss() -> int:
+    ## ru_maxrss viene en KiB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_metric(name: str, description: str, kind: str, value: float) -> list[str]:
+    return [f"# HELP {name} {description}", f"# TYPE {name} {kind}", f"{name} {value}"]
+
+
+class StageMetrics:
+    def __init__(self, buckets: tuple[float, ...] = STAGE_BUCKETS) -> None:
+        self.buckets = buckets
+        self._series: dict[tuple[str, str], StageSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        stage: str,
+        duration: float,
+        rows: int = 0,
+        size: int = 0,
+        tenant: str | None = None,
+    ) -> None:
+        key = (stage, TENANT.get() if tenant is None else tenant)
+        with self._lock:
+            series = self._series.setdefault(key, StageSeries(buckets=[0] * len(self.buckets)))
+            position = bisect_left(self.buckets, duration)
+            if position < len(self.buckets):
+                series.buckets[position] += 1
+            series.count += 1
+            series.sum += duration
+            series.rows += rows
+            series.bytes += size
+            if size:
+                series.last_bytes, series.peak_bytes = size, max(series.peak_bytes, size)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def memory(self) -> dict:
+        with self._lock:
+            report: dict[str, dict] = {}
+            for (stage, tenant), values in sorted(self._series.items()):
+                if values.peak_bytes:
+                    report.setdefault(tenant, {})[stage] = {
+                        "last_bytes": values.last_bytes,
+                        "peak_bytes": values.peak_bytes,
+                    }
+            return report
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = sorted(self._series.items())
+            lines = [
+                "# HELP conversion_stage_duration_seconds Duration of each pipeline stage.",
+                "# TYPE conversion_stage_duration_seconds histogram",
+            ]
+            for (stage, tenant), values in series:
+                labels = f'stage="{escape_label(stage)}",tenant="{escape_label(tenant)}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, values.buckets):
+                    cumulative += count
+                    lines.append(
+                        f'conversion_stage_duration_seconds_bucket{{{labels},le="{bound}"}}'
+                        f" {cumulative}"
+                    )
+                lines.append(
+                    f'conversion_stage_duration_seconds_bucket{{{labels},le="+Inf"}} {values.count}'
+                )
+                lines.append(f"conversion_stage_duration_seconds_sum{{{labels}}} {values.sum}")
+                lines.append(f"conversion_stage_duration_seconds_count{{{labels}}} {values.count}")
+            for metric, attribute, description in (
+                ("conversion_stage_rows_total", "rows", "Rows processed by each pipeline stage."),
+                ("conversion_stage_bytes_total", "bytes", "Bytes produced by each pipeline stage."),
+            ):
+                lines.append(f"# HELP {metric} {description}")
+                lines.append(f"# TYPE {metric} counter")
+                for (stage, tenant), values in series:
+                    lines.append(
+                        f'{metric}{{stage="{escape_label(stage)}",tenant="{escape_label(tenant)}"}}'
+                        f" {getattr(values, attribute)}"
+                    )
+            lines.append(
+                "# HELP conversion_stage_peak_bytes Largest frame produced by each pipeline stage."
+            )
+            lines.append("# TYPE conversion_stage_peak_bytes gauge")
+            for (stage, tenant), values in series:
+                lines.append(
+                    f'conversion_stage_peak_bytes{{stage="{escape_label(stage)}",'
+                    f'tenant="{escape_label(tenant)}"}} {values.peak_bytes}'
+                )
+            return lines
+
+
+METRICS = StageMetrics()
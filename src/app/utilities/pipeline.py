@@ -0,0 +1,127 @@
+# Standard Library
+import asyncio
+import contextvars
+import queue
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator
+
+# Project
+from app.config import LOGGER
+
+
+## Marca de fin de flujo entre etapas; None es un resultado valido de una etapa
+DONE = object()
+POLL_SECONDS = 0.1
+
+Stage = tuple[str, Callable[[Any], Any]]
+AioStage = tuple[str, Callable[[Any], Awaitable[Any]]]
+
+
+def run_pipeline(items: Iterable[Any], stages: list[Stage], depths: list[int]) -> list[Any]:
+    ## Una cola acotada entre cada par de etapas: si la siguiente se atrasa, la anterior espera
+    queues = [queue.Queue(maxsize=max(1, depth)) for depth in depths[: len(stages) - 1]]
+    cancel = threading.Event()
+    errors: list[Exception] = []
+    results: list[Any] = []
+
+    def put(target: queue.Queue, item: Any) -> bool:
+        while not cancel.is_set():
+            try:
+                target.put(item, timeout=POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def drain(source: queue.Queue) -> Iterator[Any]:
+        ## Comparacion por identidad: un DataFrame compara con == elemento a elemento
+        while not cancel.is_set():
+            try:
+                item = source.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if item is DONE:
+                return
+            yield item
+
+    def work(position: int, name: str, fn: Callable[[Any], Any]) -> None:
+        source = items if position == 0 else drain(queues[position - 1])
+        target = queues[position] if position < len(queues) else None
+        try:
+            for item in source:
+                if cancel.is_set():
+                    return
+                result = fn(item)
+                if target is None:
+                    results.append(result)
+                elif not put(target, result):
+                    return
+            if target is not None:
+                put(target, DONE)
+        except Exception as e:
+            ## El primer error detiene a todas las etapas; las demas salen en su proxima espera
+            LOGGER.error(f"Pipeline stage {name} failed: {e}")
+            errors.append(e)
+            cancel.set()
+
+    ## Cada hilo conserva el tenant y demas ContextVar de quien lanza el pipeline
+    threads = [
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(work, position, name, fn),
+            name=f"pipeline-{name}",
+            daemon=True,
+        )
+        for position, (name, fn) in enumerate(stages)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
+
+
+async def aio_run_pipeline(
+    items: Iterable[Any], stages: list[AioStage], depths: list[int]
+) -> list[Any]:
+    queues = [asyncio.Queue(maxsize=max(1, depth)) for depth in depths[: len(stages) - 1]]
+    results: list[Any] = []
+
+    async def drain(source: asyncio.Queue) -> AsyncIterator[Any]:
+        while (item := await source.get()) is not DONE:
+            yield item
+
+    async def feed(source: Iterator[Any]) -> AsyncIterator[Any]:
+        for item in source:
+            yield item
+
+    async def work(position: int, fn: Callable[[Any], Awaitable[Any]]) -> None:
+        source = feed(iter(items)) if position == 0 else drain(queues[position - 1])
+        target = queues[position] if position < len(queues) else None
+        async for item in source:
+            result = await fn(item)
+            if target is None:
+                results.append(result)
+            else:
+                await target.put(result)
+        if target is not None:
+            await target.put(DONE)
+
+    tasks = [
+        asyncio.create_task(work(position, fn), name=f"pipeline-{name}")
+        for position, (name, fn) in enumerate(stages)
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task, (name, _) in zip(tasks, stages):
+            if task in done and task.exception() is not None:
+                LOGGER.error(f"Pipeline stage {name} failed: {task.exception()}")
+                raise task.exception()
+    finally:
+        ## Error o cancelacion de la solicitud: ninguna etapa queda esperando en su cola
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return results
@@ -0,0 +1,38 @@
+# Standard Library
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Generator
+
+# External
+import polars as pl
+
+# Project
+from app.config import LOGGER, SPILL_DIR
+from app.schemas import weight_consumption_schema
+
+# Local
+from .dtypes import concat_frames
+
+
+def spill_path(folder: Path, position: int) -> Path:
+    return folder / f"{position:06d}.parquet"
+
+
+@contextmanager
+def spill_folder(tenant: str, root: str = SPILL_DIR) -> Generator[Path, None, None]:
+    Path(root).mkdir(parents=True, exist_ok=True)
+    folder = Path(tempfile.mkdtemp(prefix=f"{tenant}-", dir=root))
+    try:
+        yield folder
+    finally:
+        ## Los archivos del rango se borran aunque la transformacion o el guardado fallen
+        shutil.rmtree(folder, ignore_errors=True)
+        LOGGER.debug(f"Spill folder {folder} removed")
+
+
+def scan_spill(folder: Path) -> pl.LazyFrame:
+    ## Un bloque pudo quedar con tipos anchos: concat_frames alinea los Float32 del resto
+    scans = [pl.scan_parquet(path) for path in sorted(folder.glob("*.parquet"))]
+    return concat_frames(scans, schema=weight_consumption_schema).lazy()
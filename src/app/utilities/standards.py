@@ -0,0 +1,176 @@
+# Standard Library
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+# External
+import polars as pl
+
+# Project
+from app.config import COMPACT_DTYPES, LOGGER
+from app.schemas import compact_standard_schema
+
+# Local
+from .dtypes import compact_frame
+
+
+STANDARD_FOLDER = Path(__file__).resolve().parent.parent.parent  # ← carpeta src/
+STANDARD_FILES = {
+    1: "maestroestandargenetica_202510160912_pollos.csv",
+    2: "maestroestandargenetica_202510161619_cerdos.csv",
+}
+STANDARD_GENETICS = "ROSS - 2020"
+STANDARD_KEYS = ["id_stage", "sex", "animals_age"]
+STANDARD_VALUES = ["animal_accumulated_standard_conversion", "animal_daily_standard_conversion"]
+COMPILED_STANDARD = "maestroestandargenetica.parquet"
+DIGEST_KEY = "standard_digest"
+
+
+def read_standard_csv(folder: Path, files: dict[int, str]) -> pl.DataFrame:
+    std = pl.concat(
+        items=[
+            pl.read_csv(folder / name)
+            .select("edad", "sexo", "nombreGenetica", "conversion", "conversionAcumulada")
+            .with_columns(pl.lit(id_stage).alias("id_stage"))
+            for id_stage, name in files.items()
+        ]
+    )
+    std = std.filter(pl.col("nombreGenetica") == STANDARD_GENETICS)
+    std = std.rename(
+        {
+            "conversionAcumulada": "animal_daily_standard_conversion",
+            "conversion": "animal_accumulated_standard_conversion",
+            "edad": "animals_age",
+            "sexo": "sex",
+        }
+    )
+
+    return std
+
+
+def _position_expr(stages: dict[int, int], sexes: dict[str, int], ages: int) -> pl.Expr:
+    age = pl.col("animals_age")
+    stage_pos = pl.col("id_stage").replace_strict(stages, default=None, return_dtype=pl.Int64)
+    sex_pos = pl.col("sex").replace_strict(sexes, default=None, return_dtype=pl.Int64)
+    return (
+        pl.when((age >= 0) & (age < ages))
+        .then((stage_pos * len(sexes) + sex_pos) * ages + age)
+        .alias("_position")
+    )
+
+
+class StandardStore:
+    def __init__(
+        self,
+        folder: Path = STANDARD_FOLDER,
+        files: dict[int, str] = STANDARD_FILES,
+        compiled: str = COMPILED_STANDARD,
+    ) -> None:
+        self.folder = folder
+        self.files = files
+        self.compiled_path = folder / compiled
+        self.digest: str | None = None
+        self.frame: pl.DataFrame | None = None
+        self._signature: tuple | None = None
+        self._lock = threading.Lock()
+        self._index: tuple = ({}, {}, 0, {})
+
+    def _csv_signature(self) -> tuple:
+        return tuple(
+            (name, os.stat(self.folder / name).st_mtime_ns, os.stat(self.folder / name).st_size)
+            for name in self.files.values()
+        )
+
+    def _csv_digest(self) -> str:
+        digest = hashlib.sha256()
+        for name in self.files.values():
+            digest.update((self.folder / name).read_bytes())
+        return digest.hexdigest()
+
+    def _read_compiled(self, digest: str) -> pl.DataFrame | None:
+        if not self.compiled_path.exists():
+            return None
+        try:
+            metadata = pl.read_parquet_metadata(self.compiled_path)
+            if metadata.get(DIGEST_KEY) != digest:
+                return None
+            return pl.read_parquet(self.compiled_path)
+        except Exception as e:
+            LOGGER.warning(f"Unable to read compiled standard {self.compiled_path}: {e}")
+            return None
+
+    def _write_compiled(self, frame: pl.DataFrame, digest: str) -> None:
+        try:
+            frame.write_parquet(self.compiled_path, metadata={DIGEST_KEY: digest})
+        except OSError as e:
+            LOGGER.warning(f"Unable to persist compiled standard {self.compiled_path}: {e}")
+
+    def _build_index(self, frame: pl.DataFrame) -> tuple:
+        ## Indice denso (id_stage, sex, edad) -> posicion; ante claves repetidas prima la primera
+        frame = frame.unique(subset=STANDARD_KEYS, keep="first", maintain_order=True)
+        stages = {v: i for i, v in enumerate(frame["id_stage"].unique().sort().to_list())}
+        sexes = {v: i for i, v in enumerate(frame["sex"].unique().sort().to_list())}
+        ages = frame["animals_age"].max() + 1 if not frame.is_empty() else 0
+
+        size = len(stages) * len(sexes) * ages
+        position = frame.select(_position_expr(stages, sexes, ages))["_position"]
+        dense = {
+            column: pl.Series(column, [None] * size, dtype=frame[column].dtype).scatter(
+                position, frame[column]
+            )
+            for column in STANDARD_VALUES
+        }
+        return stages, sexes, ages, dense
+
+    def load(self, force: bool = False) -> "StandardStore":
+        with self._lock:
+            signature = self._csv_signature()
+            if not force and self.frame is not None and signature == self._signature:
+                return self
+
+            digest = self._csv_digest()
+            if not force and self.frame is not None and digest == self.digest:
+                self._signature = signature
+                return self
+
+            frame = None if force else self._read_compiled(digest)
+            if frame is None:
+                frame = read_standard_csv(self.folder, self.files)
+                self._write_compiled(frame, digest)
+                LOGGER.info(
+                    f"Standard compiled from CSV: {frame.height} rows, digest {digest[:12]}"
+                )
+            else:
+                LOGGER.info(f"Standard loaded from {self.compiled_path.name}: {frame.height} rows")
+
+            if COMPACT_DTYPES:
+                frame = compact_frame(frame, compact_standard_schema)
+            self._index = self._build_index(frame)
+            self.frame = frame
+            self.digest = digest
+            self._signature = signature
+            return self
+
+    def lookup_expr(self, column: str = "animal_accumulated_standard_conversion") -> pl.Expr:
+        stages, sexes, ages, dense = self._index
+        return pl.lit(dense[column]).gather(_position_expr(stages, sexes, ages)).alias(column)
+
+    def table(self, columns: list[str] = STANDARD_VALUES) -> pl.DataFrame:
+        ## Misma regla que el indice denso: ante claves repetidas prima la primera
+        return (
+            self.load()
+            .frame.unique(subset=STANDARD_KEYS, keep="first", maintain_order=True)
+            .select(*STANDARD_KEYS, *columns)
+        )
+
+    def attach(self, df: pl.DataFrame, columns: list[str] = STANDARD_VALUES) -> pl.DataFrame:
+        self.load()
+        return df.with_columns([self.lookup_expr(column) for column in columns])
+
+
+STANDARDS = StandardStore()
+
+
+def get_standard() -> pl.DataFrame:
+    return STANDARDS.load().frame
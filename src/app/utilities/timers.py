@@ -5,9 +5,24 @@ from contextlib import asynccontextmanager, contextmanager
 from functools import wraps
 from typing import Any, AsyncGenerator, Callable, Generator
 
+# External
+import polars as pl
+
 # Project
 from app.config import LOGGER
 
+# Local
+from .metrics import METRICS, TENANT, Stage
+
+
+def observe_result(name: str, duration: float, result: Any) -> None:
+    if isinstance(result, pl.DataFrame):
+        METRICS.observe(name, duration, rows=result.height, size=int(result.estimated_size()))
+    elif isinstance(result, list):
+        METRICS.observe(name, duration, rows=len(result))
+    else:
+        METRICS.observe(name, duration)
+
 
 def wrap_timer(name: str) -> Callable:
     def wrapper(fun: Callable) -> Callable:
@@ -19,6 +34,7 @@ def wrap_timer(name: str) -> Callable:
                 result = await fun(*args, **kw)
                 te = time.perf_counter()
                 LOGGER.info(f"{name}: total execution time: {(te - ts):.3f} seconds")
+                observe_result(name, te - ts, result)
                 return result
 
             return wrap
@@ -31,6 +47,7 @@ def wrap_timer(name: str) -> Callable:
                 result = fun(*args, **kw)
                 te = time.perf_counter()
                 LOGGER.info(f"{name}: total execution time: {(te - ts):.3f} seconds")
+                observe_result(name, te - ts, result)
                 return result
 
             return wrap
@@ -39,16 +56,20 @@ def wrap_timer(name: str) -> Callable:
 
 
 @asynccontextmanager
-async def aio_ctx_timer(name: str) -> AsyncGenerator[None, None]:
+async def aio_ctx_timer(name: str) -> AsyncGenerator[Stage, None]:
+    stage = Stage(name=name, tenant=TENANT.get())
     ts = time.perf_counter()
-    yield
+    yield stage
     te = time.perf_counter()
     LOGGER.info(f"{name}: total execution time: {(te - ts):.3f} seconds")
+    METRICS.observe(name, te - ts, rows=stage.rows, size=stage.bytes, tenant=stage.tenant)
 
 
 @contextmanager
-def ctx_timer(name: str) -> Generator[None, None, None]:
+def ctx_timer(name: str) -> Generator[Stage, None, None]:
+    stage = Stage(name=name, tenant=TENANT.get())
     ts = time.perf_counter()
-    yield
+    yield stage
     te = time.perf_counter()
     LOGGER.info(f"{name}: total execution time: {(te - ts):.3f} seconds")
+    METRICS.observe(name, te - ts, rows=stage.rows, size=stage.bytes, tenant=stage.tenant)
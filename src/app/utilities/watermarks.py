@@ -0,0 +1,108 @@
+# Standard Library
+import datetime as dt
+import threading
+
+# External
+from redis import Redis
+
+# Project
+from app.config import VERSION
+from app.db import get_redis
+
+# Local
+from .standards import STANDARDS
+
+
+WATERMARK_KEY = "conversion:watermarks:{}:{}"
+
+
+def watermark_generation() -> str:
+    ## Un cambio de formula o de estandar invalida las marcas: todo se recalcula
+    return f"{VERSION}:{STANDARDS.load().digest}"
+
+
+class MemoryWatermarkStore:
+    def __init__(self) -> None:
+        self._watermarks: dict[str, tuple[str, dict[int, dt.datetime]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tenant: str, generation: str) -> dict[int, dt.datetime]:
+        with self._lock:
+            current_generation, watermarks = self._watermarks.get(tenant, ("", {}))
+            return dict(watermarks) if current_generation == generation else {}
+
+    def update(
+        self,
+        tenant: str,
+        generation: str,
+        watermarks: dict[int, dt.datetime],
+        active: list[int] | None = None,
+    ) -> None:
+        with self._lock:
+            current_generation, current = self._watermarks.get(tenant, (generation, {}))
+            if current_generation != generation:
+                current = {}
+            current.update(watermarks)
+            ## Crianzas cerradas dejan de tener marca
+            if active is not None:
+                for id_breeding in set(current) - set(active):
+                    del current[id_breeding]
+            self._watermarks[tenant] = (generation, current)
+
+    def reset(self, tenant: str | None = None) -> None:
+        with self._lock:
+            if tenant is None:
+                self._watermarks.clear()
+            else:
+                self._watermarks.pop(tenant, None)
+
+
+class RedisWatermarkStore:
+    def __init__(self, client: Redis) -> None:
+        self.client = client
+
+    def get(self, tenant: str, generation: str) -> dict[int, dt.datetime]:
+        raw = self.client.hgetall(WATERMARK_KEY.format(tenant, generation))
+        return {int(key): dt.datetime.fromisoformat(value) for key, value in raw.items()}
+
+    def update(
+        self,
+        tenant: str,
+        generation: str,
+        watermarks: dict[int, dt.datetime],
+        active: list[int] | None = None,
+    ) -> None:
+        key = WATERMARK_KEY.format(tenant, generation)
+        ## Las marcas de generaciones anteriores ya no se leen
+        stale = [
+            other
+            for other in self.client.scan_iter(match=WATERMARK_KEY.format(tenant, "*"), count=500)
+            if other != key
+        ]
+        closed = []
+        if active is not None:
+            closed = list(set(map(int, self.client.hkeys(key))) - set(active))
+        pipeline = self.client.pipeline()
+        if stale:
+            pipeline.delete(*stale)
+        if watermarks:
+            pipeline.hset(
+                key, mapping={str(i): value.isoformat() for i, value in watermarks.items()}
+            )
+        if closed:
+            pipeline.hdel(key, *map(str, closed))
+        pipeline.execute()
+
+    def reset(self, tenant: str | None = None) -> None:
+        pattern = WATERMARK_KEY.format(tenant if tenant is not None else "*", "*")
+        keys = list(self.client.scan_iter(match=pattern, count=500))
+        if keys:
+            self.client.delete(*keys)
+
+
+def get_watermark_store() -> MemoryWatermarkStore | RedisWatermarkStore:
+    client = get_redis()
+    return RedisWatermarkStore(client) if client is not None else MemoryWatermarkStore()
+
+
+WATERMARKS = get_watermark_store()
@@ -1,14 +1,34 @@
 # External
 from dotenv import load_dotenv
 
+
 load_dotenv()
 
+# Standard Library
+from contextlib import asynccontextmanager
+
+# External
 from fastapi import FastAPI
 
 # Project
+from app.db import async_engine
 from app.routers import ROUTERS
+from app.services import JOB_RUNNER, VIEW_REFRESHER
+from app.utilities import STANDARDS
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    STANDARDS.load()
+    JOB_RUNNER.start()
+    VIEW_REFRESHER.start()
+    yield
+    VIEW_REFRESHER.stop()
+    JOB_RUNNER.stop()
+    await async_engine.dispose()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 for router in ROUTERS:
     app.include_router(router)
@@ -0,0 +1,168 @@
+# Standard Library
+import uuid
+from contextlib import contextmanager
+from typing import Generator
+
+# External
+import polars as pl
+import pytest
+from sqlalchemy import delete, insert, text
+from sqlalchemy.exc import OperationalError
+
+# Project
+from app import models
+from app.db.sql.database import engine
+
+
+TENANT_TABLES = (
+    models.Breedings,
+    models.BreedingData,
+    models.Entities,
+    models.AnimalWeights,
+    models.FoodConsumption,
+    models.Mortality,
+    models.AnimalConversion,
+)
+
+
+@contextmanager
+def tenant_schema() -> Generator[str, None, None]:
+    ## Schema de tenant temporal con las tablas de los modelos sobre el PostgreSQL configurado
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except OperationalError as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+    tenant = f"test_{uuid.uuid4().hex[:8]}"
+    with engine.begin() as connection:
+        connection.execute(text(f'CREATE SCHEMA "{tenant}"'))
+    bind = engine.execution_options(schema_translate_map={None: tenant})
+    for model in TENANT_TABLES:
+        model.__table__.create(bind, checkfirst=True)
+    try:
+        yield tenant
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text(f'DROP SCHEMA "{tenant}" CASCADE'))
+
+
+@pytest.fixture(scope="session")
+def postgres_tenant() -> Generator[str, None, None]:
+    with tenant_schema() as tenant:
+        yield tenant
+
+
+@pytest.fixture(scope="session")
+def conversion_tenant() -> Generator[str, None, None]:
+    ## Schema propio con las restricciones de la base real que los modelos no declaran: crianzas
+    ## activas sin end_date, fechas de alta por defecto y la clave unica del upsert
+    with tenant_schema() as tenant:
+        with engine.begin() as connection:
+            for model in TENANT_TABLES:
+                table = f'"{tenant}"."{model.__table__.name}"'
+                for column in model.__table__.columns:
+                    if column.primary_key:
+                        continue
+                    connection.execute(
+                        text(f'ALTER TABLE {table} ALTER COLUMN "{column.name}" DROP NOT NULL')
+                    )
+                    if column.name in ("created_at", "updated_at", "createdAt", "updatedAt"):
+                        connection.execute(
+                            text(
+                                f'ALTER TABLE {table} ALTER COLUMN "{column.name}"'
+                                " SET DEFAULT now()"
+                            )
+                        )
+            connection.execute(
+                text(
+                    f'ALTER TABLE "{tenant}".animal_conversion ADD CONSTRAINT'
+                    " animal_conversion_unique UNIQUE (id_breeding, date)"
+                )
+            )
+        yield tenant
+
+
+@pytest.fixture
+def seed_conversion_source(conversion_tenant: str):
+    ## Carga filas con el esquema de weight_consumption_schema e init_params_schema en las tablas
+    ## de origen; se borran al terminar el test
+    bind = engine.execution_options(schema_translate_map={None: conversion_tenant})
+
+    def seed(weights: pl.DataFrame, init: pl.DataFrame) -> list[int]:
+        params = init.to_dicts()
+        rows = weights.to_dicts()
+        initial = {
+            row["id_breeding"]: row
+            for row in weights.unique("id_breeding", keep="first").to_dicts()
+        }
+        tables = {
+            models.Entities: [
+                {
+                    "idta": str(param["idta"]),
+                    "parent_id": str(param["parent_id"]),
+                    "name": param["breeding_code"],
+                    "operational_state": 1,
+                    "id_entity_type": 1,
+                    "id_stage": param["id_stage"],
+                }
+                for param in params
+            ],
+            models.Breedings: [
+                {
+                    "id_breeding": param["id_breeding"],
+                    "idta": str(param["idta"]),
+                    "start_date": min(row["date"] for row in rows).date(),
+                    "breeding_code": param["breeding_code"],
+                }
+                for param in params
+            ],
+            models.BreedingData: [
+                {
+                    "id_breeding": param["id_breeding"],
+                    "sex": param["sex"],
+                    "initial_weight_avg": initial[param["id_breeding"]]["initial_weight_avg"],
+                    "initial_age": initial[param["id_breeding"]]["initial_age"],
+                    "initial_total_quantity": initial[param["id_breeding"]][
+                        "initial_total_quantity"
+                    ],
+                }
+                for param in params
+            ],
+            models.AnimalWeights: [
+                {key: row[key] for key in ("id_breeding", "animals_age", "date", "measured_weight")}
+                for row in rows
+            ],
+            models.FoodConsumption: [
+                {
+                    key: row[key]
+                    for key in (
+                        "id_breeding",
+                        "date",
+                        "animals_age",
+                        "entity_accumulated_consumption",
+                        "animal_accumulated_consumption",
+                    )
+                }
+                for row in rows
+            ],
+            models.Mortality: [
+                {
+                    "id_breeding": row["id_breeding"],
+                    "date_mortality": row["date"].date(),
+                    "animals_age": row["animals_age"],
+                    "stock": row["stock"],
+                }
+                for row in rows
+                if row["stock"] is not None
+            ],
+        }
+        with bind.begin() as connection:
+            for model, values in tables.items():
+                if values:
+                    connection.execute(insert(model.__table__), values)
+        return [param["id_breeding"] for param in params]
+
+    yield seed
+    with bind.begin() as connection:
+        for model in TENANT_TABLES:
+            connection.execute(delete(model.__table__))
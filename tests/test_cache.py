@@ -0,0 +1,109 @@
+# Standard Library
+import datetime as dt
+import shutil
+
+# External
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+# Project
+import app.services.cache as cache_service
+from app.db import MemoryResultCache
+from app.schemas import ConversionScope, SaveSummary
+from app.services.cache import get_cached_result, set_cached_result, source_fingerprint
+from app.utilities import StandardStore
+from app.utilities.standards import STANDARD_FILES, STANDARD_FOLDER
+
+
+CHANGED_AT = dt.datetime(2026, 1, 1)
+STATS = [("animal_weights", 10, CHANGED_AT), ("food_consumptions", 10, CHANGED_AT)]
+
+
+@pytest.fixture
+def standards(tmp_path, monkeypatch) -> StandardStore:
+    for name in STANDARD_FILES.values():
+        shutil.copy(STANDARD_FOLDER / name, tmp_path / name)
+    store = StandardStore(folder=tmp_path)
+    monkeypatch.setattr(cache_service, "STANDARDS", store)
+    return store
+
+
+@pytest.fixture
+def result_cache(monkeypatch) -> MemoryResultCache:
+    cache = MemoryResultCache(ttl=60, max_entries=10)
+    monkeypatch.setattr(cache_service, "RESULT_CACHE", cache)
+    monkeypatch.setattr(cache_service, "CACHE_ENABLED", True)
+    return cache
+
+
+def test_fingerprint_is_stable_for_the_same_inputs(standards):
+    assert source_fingerprint(STATS) == source_fingerprint(list(reversed(STATS)))
+    assert source_fingerprint(STATS, scope=ConversionScope(id_stage=1)) == source_fingerprint(
+        STATS, scope=ConversionScope(id_stage=1)
+    )
+
+
+@pytest.mark.parametrize(
+    "changed",
+    [
+        {"stats": [("animal_weights", 11, CHANGED_AT), STATS[1]]},
+        {"stats": [("animal_weights", 10, CHANGED_AT + dt.timedelta(seconds=1)), STATS[1]]},
+        {"stats": [*STATS, ("mortalities", 1, None)]},
+        {"engine": "sql"},
+        {"save_mode": "diff"},
+        {"scope": ConversionScope(id_breeding=[1])},
+        {"scope": ConversionScope(date_from=dt.date(2026, 1, 1))},
+    ],
+)
+def test_fingerprint_changes_with_each_input(standards, changed):
+    base = {"stats": STATS, "engine": "polars", "save_mode": "upsert", "scope": None}
+    assert source_fingerprint(**{**base, **changed}) != source_fingerprint(**base)
+
+
+def test_fingerprint_changes_with_version(standards, monkeypatch):
+    base = source_fingerprint(STATS)
+    monkeypatch.setattr(cache_service, "VERSION", "next")
+    assert source_fingerprint(STATS) != base
+
+
+def test_fingerprint_changes_with_standard(standards):
+    base = source_fingerprint(STATS)
+    standard_csv = standards.folder / STANDARD_FILES[1]
+    standard_csv.write_text(standard_csv.read_text() + "\n")
+    assert source_fingerprint(STATS) != base
+
+
+def test_results_round_trip_and_skip_over_max_bytes(result_cache, monkeypatch):
+    data = pl.DataFrame({"id_breeding": [1, 2], "ratio": [1.5, None]})
+    saved = SaveSummary(mode="diff", written=2, inserted=1, updated=1, unchanged=0)
+
+    set_cached_result("t1", "small", data, saved)
+    cached_data, cached_saved = get_cached_result("t1", "small")
+    assert_frame_equal(cached_data, data)
+    assert cached_saved == saved
+
+    monkeypatch.setattr(cache_service, "CACHE_MAX_BYTES", 1)
+    set_cached_result("t1", "large", data, saved)
+    assert get_cached_result("t1", "large") is None
+    assert result_cache.stats()["entries"] == 1
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryResultCache(ttl=60, max_entries=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    ## Leer "a" la renueva: el desalojo cae sobre "b"
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1" and cache.get("c") == b"3"
+    assert cache.stats()["entries"] == 2
+
+
+def test_memory_cache_expires_entries():
+    cache = MemoryResultCache(ttl=0, max_entries=2)
+    cache.set("a", b"1")
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,348 @@
+# Standard Library
+import datetime as dt
+
+# External
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+from sqlmodel import select
+
+# Project
+from app.config import VERSION
+from app.db import get_session, select_conversion_rows
+from app.models import AnimalConversion
+from app.schemas import ConversionScope, init_params_schema, weight_consumption_schema
+from app.services.conversion import impute_stock, transform_conversion
+from app.utilities import STANDARDS, merge_conversion_in_db
+from app.utilities.get_data import load_conversion_standard
+
+
+START = dt.datetime(2026, 1, 1)
+INITIAL_WEIGHT = 0.04
+## Ventanas que cortan crianzas con stock imputado desde filas fuera de la ventana
+WINDOWS = [
+    (dt.date(2026, 1, 2), None),
+    (None, dt.date(2026, 1, 2)),
+    (dt.date(2026, 1, 2), dt.date(2026, 1, 3)),
+]
+
+
+def breeding_rows(
+    id_breeding: int,
+    stocks: list[int | None],
+    initial_total_quantity: int | None = 1000,
+    initial_age: int = 0,
+    days: list[int] | None = None,
+) -> list[dict]:
+    days = days if days is not None else list(range(len(stocks)))
+    return [
+        {
+            "measured_weight": INITIAL_WEIGHT + 0.06 * day,
+            "animals_age": day + 1,
+            "date": START + dt.timedelta(days=day),
+            "entity_accumulated_consumption": 90.0 * day,
+            "animal_accumulated_consumption": 0.1 * day,
+            "stock": stock,
+            "initial_weight_avg": INITIAL_WEIGHT,
+            "initial_age": initial_age,
+            "initial_total_quantity": initial_total_quantity,
+            "id_breeding": id_breeding,
+            "changed_at": START,
+        }
+        for day, stock in zip(days, stocks)
+    ]
+
+
+def weights_frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        [
+            ## Sin nulos; la fila de la edad inicial toma el stock inicial
+            *breeding_rows(1, [1, 998, 995, 990], initial_age=1),
+            ## Stock nulo al inicio y conocido despues
+            *breeding_rows(2, [None, None, 950, 940]),
+            ## Todo nulo: stock inicial, o se descarta si es 0 o no existe
+            *breeding_rows(3, [None, None, None]),
+            *breeding_rows(4, [None, None], initial_total_quantity=0),
+            *breeding_rows(5, [None, None], initial_total_quantity=None),
+            ## Fechas repetidas: ante empate prima el orden de llegada
+            *breeding_rows(6, [None, 990, 985, None], days=[0, 1, 1, 2]),
+        ],
+        schema=weight_consumption_schema,
+    )
+
+
+def init_frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        [
+            {
+                "idta": id_breeding,
+                "parent_id": 1,
+                "breeding_code": f"B{id_breeding}",
+                "geneticaPredominante": "ROSS - 2020",
+                "sex": sex,
+                "id_breeding": id_breeding,
+                "id_stage": 1,
+            }
+            for id_breeding, sex in zip(range(1, 7), ["Macho", "Hembra", "Mixto"] * 2)
+        ],
+        schema=init_params_schema,
+    )
+
+
+def baseline_impute_stock(convert_data_df: pl.DataFrame) -> pl.DataFrame:
+    ## Bucle por crianza de la version original de get_conversion. sort("date") no garantiza
+    ## orden estable; con maintain_order el empate de fechas queda definido
+    convert_data_df = convert_data_df.with_columns(
+        stock=pl.when(pl.col("animals_age") == pl.col("initial_age"))
+        .then(pl.col("initial_total_quantity"))
+        .otherwise(pl.col("stock"))
+    )
+    prodhouse_del = (
+        convert_data_df.filter(pl.col("stock").is_null())["id_breeding"].unique().to_list()
+    )
+
+    for idbreeding_i in prodhouse_del:
+        clean_df = convert_data_df.filter(pl.col("id_breeding") == idbreeding_i).drop_nulls(
+            subset=pl.col("stock")
+        )
+        initial_stock = (
+            convert_data_df.filter(pl.col("id_breeding") == idbreeding_i)["initial_total_quantity"]
+            .unique()
+            .item()
+        )
+
+        if clean_df.is_empty() and initial_stock:
+            convert_data_df = convert_data_df.with_columns(
+                stock=pl.when(pl.col("id_breeding") == idbreeding_i)
+                .then(pl.col("initial_total_quantity"))
+                .otherwise(pl.col("stock"))
+            )
+        elif not clean_df.is_empty():
+            latest_stock = clean_df.sort("date", maintain_order=True).tail(n=1)["stock"].item()
+            convert_data_df = convert_data_df.with_columns(
+                stock=pl.when(pl.col("id_breeding") == idbreeding_i)
+                .then(pl.lit(latest_stock))
+                .otherwise(pl.col("stock"))
+            )
+        else:
+            convert_data_df = convert_data_df.remove(pl.col("id_breeding") == idbreeding_i)
+
+    return convert_data_df
+
+
+def test_impute_stock_matches_baseline():
+    frame = weights_frame()
+    imputed = impute_stock(frame.lazy()).collect()
+
+    assert_frame_equal(
+        imputed.filter(~pl.col("_dropped")).select(frame.columns),
+        baseline_impute_stock(frame),
+        check_row_order=False,
+        check_exact=True,
+    )
+
+
+def test_impute_stock_flags_imputed_and_dropped_breedings():
+    imputed = impute_stock(weights_frame().lazy()).collect()
+    flags = imputed.group_by("id_breeding").agg(
+        pl.col("stock_imputed").first(), pl.col("_dropped").first(), pl.col("stock").unique()
+    )
+    flags = {row["id_breeding"]: row for row in flags.iter_rows(named=True)}
+
+    assert not flags[1]["stock_imputed"] and not flags[1]["_dropped"]
+    assert flags[2]["stock"] == [940]
+    assert flags[3]["stock"] == [1000]
+    assert flags[4]["_dropped"] and flags[5]["_dropped"]
+    assert flags[6]["stock"] == [985]
+
+
+def baseline_transform(
+    convert_data_df: pl.DataFrame, init_df: pl.DataFrame, standard_df: pl.DataFrame
+) -> pl.DataFrame:
+    ## Razones, cruce con el estandar y proyeccion de la version original de get_conversion
+    convert_data_df = baseline_impute_stock(convert_data_df)
+    convert_data_df = convert_data_df.with_columns(
+        animal_accumulated_conversion=(
+            pl.col("animal_accumulated_consumption")
+            / (pl.col("measured_weight") - pl.col("initial_weight_avg"))
+        ).round(6),
+        weight_delta=(pl.col("measured_weight") * pl.col("stock"))
+        - (pl.col("initial_weight_avg") * pl.col("initial_total_quantity")),
+    )
+    convert_data_df = convert_data_df.with_columns(
+        entity_accumulated_conversion=(
+            pl.col("entity_accumulated_consumption") / pl.col("weight_delta")
+        ).round(6),
+    )
+    zero_cond_entity = (pl.col("entity_accumulated_conversion") < 0) | (
+        pl.col("entity_accumulated_conversion").is_infinite()
+    )
+    zero_cond_animal = (pl.col("animal_accumulated_conversion") < 0) | (
+        pl.col("animal_accumulated_conversion").is_infinite()
+    )
+    convert_data_df = convert_data_df.with_columns(
+        entity_accumulated_conversion=pl.when(zero_cond_entity)
+        .then(pl.lit(0))
+        .otherwise(pl.col("entity_accumulated_conversion")),
+        animal_accumulated_conversion=pl.when(zero_cond_animal)
+        .then(pl.lit(0))
+        .otherwise(pl.col("animal_accumulated_conversion")),
+    )
+    convert_data_df = convert_data_df.join(other=init_df, on="id_breeding", how="left").join(
+        other=standard_df, on=["animals_age", "sex", "id_stage"], how="left"
+    )
+    return convert_data_df.select(
+        "id_breeding",
+        "animals_age",
+        pl.col("date").cast(pl.Date),
+        "animal_accumulated_conversion",
+        pl.col("animal_accumulated_standard_conversion").alias("accumulated_standard_conversion"),
+        "entity_accumulated_conversion",
+        calculation_formula_version=pl.lit(VERSION),
+    )
+
+
+def test_transform_conversion_matches_baseline():
+    ## Consumo con peso igual al inicial en la crianza 2: x/0 se anula a 0
+    frame, init_df = weights_frame(), init_frame()
+    frame = frame.with_columns(
+        animal_accumulated_consumption=pl.when(
+            (pl.col("id_breeding") == 2) & (pl.col("animals_age") == 1)
+        )
+        .then(0.05)
+        .otherwise(pl.col("animal_accumulated_consumption"))
+    )
+    standard_df = STANDARDS.table(columns=["animal_accumulated_standard_conversion"])
+    converted = transform_conversion(frame, init_df)
+
+    ## Incluye filas 0/0 (NaN), la division por cero (0) y el cruce con el estandar
+    assert converted["animal_accumulated_conversion"].is_nan().any()
+    assert converted.filter((pl.col("id_breeding") == 2) & (pl.col("animals_age") == 1))[
+        "animal_accumulated_conversion"
+    ].to_list() == [0.0]
+    assert converted["accumulated_standard_conversion"].is_not_null().all()
+    assert_frame_equal(
+        converted,
+        baseline_transform(frame, init_df, standard_df.cast({"id_stage": pl.Int64})),
+        check_row_order=False,
+        check_exact=True,
+        check_dtypes=False,
+    )
+
+
+def tie_rows(id_breeding: int) -> list[dict]:
+    ## Peso - peso inicial = 2 y razones de 7 decimales terminadas en 5: round(6) al par en
+    ## Polars da 0.000002, round(numeric) de PostgreSQL daria 0.000003
+    consumptions = [5e-6, 9e-6, 1.3e-5]
+    return [
+        {
+            **row,
+            "measured_weight": 2.5,
+            "initial_weight_avg": 0.5,
+            "animal_accumulated_consumption": consumption,
+            "entity_accumulated_consumption": consumption * 1000,
+        }
+        for row, consumption in zip(
+            breeding_rows(id_breeding, [1000] * len(consumptions)), consumptions
+        )
+    ]
+
+
+def sql_source() -> tuple[pl.DataFrame, pl.DataFrame]:
+    ## La crianza 6 repite fechas: el join de origen por fecha la duplica, no es comparable
+    frame = pl.concat(
+        [
+            weights_frame().filter(pl.col("id_breeding") != 6),
+            pl.DataFrame(tie_rows(7), schema=weight_consumption_schema),
+        ]
+    )
+    init_df = pl.concat(
+        [
+            init_frame().filter(pl.col("id_breeding") != 6),
+            pl.DataFrame(
+                [{**init_frame().row(0, named=True), "idta": 7, "id_breeding": 7}],
+                schema=init_params_schema,
+            ),
+        ]
+    )
+    return frame, init_df
+
+
+def filter_window(converted: pl.DataFrame, window: tuple) -> pl.DataFrame:
+    date_from, date_to = window
+    if date_from is not None:
+        converted = converted.filter(pl.col("date") >= date_from)
+    if date_to is not None:
+        converted = converted.filter(pl.col("date") <= date_to)
+    return converted
+
+
+def test_sql_engine_matches_polars(seed_conversion_source, conversion_tenant):
+    frame, init_df = sql_source()
+    id_breeding_list = seed_conversion_source(frame, init_df)
+    expected = transform_conversion(frame, init_df)
+
+    with get_session(conversion_tenant) as session:
+        merge_conversion_in_db(session, id_breeding_list)
+        stored = pl.DataFrame(
+            [
+                row._asdict()
+                for row in session.exec(
+                    select(
+                        AnimalConversion.id_breeding,
+                        AnimalConversion.animals_age,
+                        AnimalConversion.date,
+                        AnimalConversion.animal_accumulated_conversion,
+                        AnimalConversion.accumulated_standard_conversion,
+                        AnimalConversion.entity_accumulated_conversion,
+                        AnimalConversion.calculation_formula_version,
+                    )
+                ).all()
+            ]
+        )
+
+    ties = expected.filter(pl.col("id_breeding") == 7)
+    assert ties["animal_accumulated_conversion"].to_list() == [2e-6, 4e-6, 6e-6]
+    assert ties["entity_accumulated_conversion"].to_list() == [2e-6, 4e-6, 6e-6]
+    assert_frame_equal(
+        stored.sort("id_breeding", "date"),
+        expected.sort("id_breeding", "date"),
+        check_exact=True,
+        check_dtypes=False,
+    )
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+def test_polars_window_matches_filtered_output(window):
+    frame, init_df = weights_frame(), init_frame()
+    date_from, date_to = window
+    windowed = transform_conversion(
+        frame, init_df, scope=ConversionScope(date_from=date_from, date_to=date_to)
+    )
+    expected = filter_window(transform_conversion(frame, init_df), window)
+
+    assert 0 < windowed.height < transform_conversion(frame, init_df).height
+    assert_frame_equal(windowed, expected, check_row_order=False, check_exact=True)
+
+
+def select_rows(session, id_breeding_list: list[int], **window) -> pl.DataFrame:
+    statement = select_conversion_rows(id_breeding_list, version=VERSION, **window)
+    return pl.DataFrame([row._asdict() for row in session.exec(statement).all()])
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+def test_sql_window_matches_filtered_output(seed_conversion_source, conversion_tenant, window):
+    id_breeding_list = seed_conversion_source(*sql_source())
+    date_from, date_to = window
+
+    with get_session(conversion_tenant) as session:
+        load_conversion_standard(session)
+        full = select_rows(session, id_breeding_list)
+        windowed = select_rows(session, id_breeding_list, date_from=date_from, date_to=date_to)
+
+    assert 0 < windowed.height < full.height
+    assert_frame_equal(
+        windowed.sort("id_breeding", "date"),
+        filter_window(full, window).sort("id_breeding", "date"),
+        check_exact=True,
+    )
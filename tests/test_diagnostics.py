@@ -0,0 +1,133 @@
+# Project
+from app.db import EXPLAIN_OPTION, QueryStats, get_session
+from app.db.sql.monitor import normalize_statement
+from app.services import EXPLAIN_QUERIES, explain_extraction, summarize_plan
+
+
+## EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) de select_init_params, recortado
+INIT_PARAMS_PLAN = {
+    "Plan": {
+        "Node Type": "Hash Join",
+        "Actual Rows": 40,
+        "Shared Hit Blocks": 12,
+        "Shared Read Blocks": 3,
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "breedings"},
+            {
+                "Node Type": "Hash",
+                "Plans": [
+                    {
+                        "Node Type": "Hash Join",
+                        "Plans": [
+                            {"Node Type": "Seq Scan", "Relation Name": "entities"},
+                            {
+                                "Node Type": "Hash",
+                                "Plans": [
+                                    {
+                                        "Node Type": "Index Scan",
+                                        "Relation Name": "breeding_data",
+                                    }
+                                ],
+                            },
+                        ],
+                    }
+                ],
+            },
+        ],
+    },
+    "Planning Time": 0.412,
+    "Execution Time": 1.873,
+}
+
+
+def relations(plan: dict) -> set[str]:
+    found = {plan["Relation Name"]} if "Relation Name" in plan else set()
+    for child in plan.get("Plans", []):
+        found |= relations(child)
+    return found
+
+
+def test_summarize_plan_walks_nodes_in_order():
+    summary = summarize_plan(INIT_PARAMS_PLAN)
+    assert summary["nodes"] == [
+        "Hash Join",
+        "Seq Scan",
+        "Hash",
+        "Hash Join",
+        "Seq Scan",
+        "Hash",
+        "Index Scan",
+    ]
+    assert summary["planning_ms"] == 0.412
+    assert summary["execution_ms"] == 1.873
+    assert summary["rows"] == 40
+    assert (summary["shared_hit_blocks"], summary["shared_read_blocks"]) == (12, 3)
+
+
+def test_summarize_plan_lists_seq_scan_tables_only():
+    assert summarize_plan(INIT_PARAMS_PLAN)["seq_scans"] == ["breedings", "entities"]
+
+
+def test_normalize_statement_collapses_in_lists():
+    psycopg = "SELECT *\n  FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s,\n %(id_1_3)s)"
+    asyncpg = "SELECT * FROM t WHERE id IN ($1, $2, $3)"
+    assert normalize_statement(psycopg) == "SELECT * FROM t WHERE id IN (...)"
+    assert normalize_statement(asyncpg) == "SELECT * FROM t WHERE id IN (...)"
+
+
+def test_normalize_statement_groups_lists_of_any_length():
+    short = "SELECT * FROM t WHERE id IN ($1, $2)"
+    long = "SELECT * FROM t WHERE id IN ($1, $2, $3, $4, $5)"
+    assert normalize_statement(short) == normalize_statement(long)
+
+
+def test_query_stats_records_slow_queries_from_threshold():
+    stats = QueryStats(slow_ms=100, slow_log_size=10)
+    stats.record("SELECT 1", "t1", duration=0.099, rows=1)
+    stats.record("SELECT 1", "t1", duration=0.1, rows=2)
+    stats.record("SELECT 1", "t1", duration=0.25, rows=-1)
+    snapshot = stats.snapshot()
+    [statement] = snapshot["statements"]
+    assert statement["calls"] == 3
+    assert statement["slow"] == 2
+    assert statement["rows"] == 3
+    assert [query["duration_ms"] for query in snapshot["slow"]] == [100.0, 250.0]
+    assert {query["tenant"] for query in snapshot["slow"]} == {"t1"}
+
+
+def test_query_stats_slow_log_is_bounded():
+    stats = QueryStats(slow_ms=0, slow_log_size=2)
+    for position in range(5):
+        stats.record(f"SELECT {position}", "t1", duration=0.01, rows=0)
+    assert [query["statement"] for query in stats.snapshot()["slow"]] == ["SELECT 3", "SELECT 4"]
+
+
+def test_init_params_plan_reads_only_breeding_tables(postgres_tenant):
+    with get_session(postgres_tenant) as session:
+        explained = session.connection().execute(
+            EXPLAIN_QUERIES["init_params"]([]), execution_options={EXPLAIN_OPTION: True}
+        )
+        plan = summarize_plan(explained.scalar_one()[0])
+    assert relations(plan["plan"]["Plan"]) == {"breedings", "entities", "breeding_data"}
+    assert any(node.endswith(("Join", "Nested Loop")) for node in plan["nodes"])
+
+
+def test_weights_plan_pushes_breeding_list_into_index(postgres_tenant):
+    with get_session(postgres_tenant) as session:
+        explained = session.connection().execute(
+            EXPLAIN_QUERIES["weights"]([1, 2, 3]), execution_options={EXPLAIN_OPTION: True}
+        )
+        plan = summarize_plan(explained.scalar_one()[0])
+    assert {"animal_weights", "breedings"} <= relations(plan["plan"]["Plan"])
+    ## La lista de crianzas se resuelve por la clave primaria, sin recorrer breedings
+    assert "breedings" not in plan["seq_scans"]
+
+
+def test_explain_extraction_reports_every_query(postgres_tenant):
+    report = explain_extraction(postgres_tenant)
+    assert report["client"] == postgres_tenant
+    assert report["breedings"] == 0
+    assert set(report["queries"]) == set(EXPLAIN_QUERIES)
+    for summary in report["queries"].values():
+        assert summary["nodes"]
+        assert summary["execution_ms"] is not None
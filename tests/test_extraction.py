@@ -0,0 +1,37 @@
+# External
+import polars as pl
+from polars.testing import assert_frame_equal
+from sqlalchemy import func, select
+
+# Project
+from app.db import get_session
+from app.utilities import group_breedings
+from app.utilities.get_data import stream_frames
+
+
+def test_stream_frames_yields_bounded_chunks(postgres_tenant):
+    statement = select(func.generate_series(1, 25).label("n"))
+    with get_session(postgres_tenant) as session:
+        frames = list(stream_frames(session, statement, schema={"n": pl.Int64}, chunk_size=10))
+    assert [frame.height for frame in frames] == [10, 10, 5]
+    assert pl.concat(frames)["n"].to_list() == list(range(1, 26))
+
+
+def test_group_breedings_never_splits_a_breeding():
+    ## Cursor ordenado por crianza en bloques de 4 filas; la crianza 2 cruza tres bloques y
+    ## un grupo puede llevar varias crianzas completas
+    rows = pl.DataFrame({"id_breeding": [1, 1, 2, 2, 2, 2, 2, 2, 2, 3, 4, 4], "day": range(12)})
+    batches = rows.iter_slices(n_rows=4)
+
+    groups = list(group_breedings(batches))
+
+    ids = [set(group["id_breeding"]) for group in groups]
+    assert all(not a & b for position, a in enumerate(ids) for b in ids[position + 1 :])
+    assert ids == [{1}, {2, 3}, {4}]
+    assert_frame_equal(pl.concat(groups), rows)
+
+
+def test_group_breedings_skips_empty_batches():
+    empty = pl.DataFrame(schema={"id_breeding": pl.Int64})
+    groups = list(group_breedings(iter([empty, pl.DataFrame({"id_breeding": [7, 7]}), empty])))
+    assert [group["id_breeding"].to_list() for group in groups] == [[7, 7]]
@@ -0,0 +1,110 @@
+# Standard Library
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# External
+import pytest
+from fastapi import status
+
+# Project
+import app.services.batch as batch_service
+from app.routers.conversion import conversion_error
+from app.schemas import ConversionScope, SaveSummary
+from app.services import ConversionResult, SingleFlight, TenantBusy, flight_key
+
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def held(release: threading.Event, value, calls: list | None = None):
+    ## Calculo que queda en curso hasta que el test lo libera
+    def fn():
+        if calls is not None:
+            calls.append(value)
+        release.wait(5)
+        return value
+
+    return fn
+
+
+def test_concurrent_calls_with_same_key_share_one_computation():
+    flights, release, calls = SingleFlight(max_concurrent=1, max_queued=0), threading.Event(), []
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        leader = executor.submit(flights.run, "t1", "k", held(release, "result", calls))
+        wait_until(lambda: calls)
+        followers = [executor.submit(flights.run, "t1", "k", held(release, "other")) for _ in "ab"]
+        wait_until(lambda: flights.coalesced == 2)
+        release.set()
+        assert [future.result() for future in [leader, *followers]] == ["result"] * 3
+    assert calls == ["result"]
+    assert flights.stats()["started"] == 1 and flights.stats()["in_flight"] == 0
+
+
+def test_distinct_calls_over_the_limit_are_rejected():
+    flights, release, calls = SingleFlight(max_concurrent=1, max_queued=0), threading.Event(), []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        running = executor.submit(flights.run, "t1", "a", held(release, "a", calls))
+        wait_until(lambda: calls)
+        with pytest.raises(TenantBusy) as busy:
+            flights.run("t1", "b", held(release, "b"))
+        ## Otro tenant no comparte el cupo
+        assert flights.run("t2", "b", lambda: "t2") == "t2"
+        release.set()
+        assert running.result() == "a"
+    assert flights.rejected == 1
+
+    error = conversion_error(busy.value)
+    assert error.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert "Retry-After" in error.headers
+
+
+def test_queued_calls_are_admitted_in_fifo_order():
+    flights, release, calls = SingleFlight(max_concurrent=1, max_queued=2), threading.Event(), []
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(flights.run, "t1", "a", held(release, "a", calls))]
+        wait_until(lambda: calls == ["a"])
+        for key in "bc":
+            futures.append(executor.submit(flights.run, "t1", key, held(release, key, calls)))
+            wait_until(lambda: flights.stats()["tenants"]["t1"]["queued"] == len(futures) - 1)
+        assert calls == ["a"]
+        release.set()
+        assert [future.result() for future in futures] == ["a", "b", "c"]
+    assert calls == ["a", "b", "c"]
+    assert flights.stats()["tenants"] == {}
+
+
+def test_flight_key_uses_resolved_values():
+    assert flight_key("t1", False, "upsert", "polars", None, False) == flight_key(
+        "t1", False, "upsert", "polars", ConversionScope(), False
+    )
+    assert flight_key("t1", scope=ConversionScope(id_stage=1)) == flight_key(
+        "t1", scope=ConversionScope(id_stage=1, sex=None)
+    )
+    assert flight_key("t1", save_mode="upsert") != flight_key("t1", save_mode="diff")
+    assert flight_key("t1", engine="polars") != flight_key("t1", engine="sql")
+    assert flight_key("t1") != flight_key("t2")
+
+
+def test_batch_conversions_run_through_the_tenant_limit(monkeypatch):
+    flights, release, calls = SingleFlight(max_concurrent=1, max_queued=0), threading.Event(), []
+    result = ConversionResult(data=None, saved=SaveSummary(mode="upsert"), rows=7)
+    monkeypatch.setattr(batch_service, "FLIGHTS", flights)
+    monkeypatch.setattr(
+        batch_service, "convert_tenant", lambda tenant, **kwargs: held(release, result, calls)()
+    )
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(batch_service.run_tenant_conversion, "t1", save_mode="upsert")
+        wait_until(lambda: calls)
+        ## Misma solicitud: se coalesce; otra distinta con el cupo lleno queda como error
+        same = executor.submit(batch_service.run_tenant_conversion, "t1", save_mode="upsert")
+        wait_until(lambda: flights.coalesced == 1)
+        busy = batch_service.run_tenant_conversion("t1", save_mode="diff")
+        release.set()
+        assert first.result().rows == same.result().rows == 7
+    assert len(calls) == 1
+    assert "retry later" in busy.error
@@ -0,0 +1,60 @@
+# Standard Library
+import datetime as dt
+import time
+
+# Project
+import app.services.jobs as jobs_service
+from app.schemas import ConversionJob, TenantSummary
+from app.services.jobs import JobRunner
+from app.utilities import MemoryJobQueue
+
+
+class FlakyJobQueue(MemoryJobQueue):
+    ## Falla el primer guardado del estado "start", como un corte de Redis
+    def __init__(self) -> None:
+        super().__init__()
+        self.failures = 1
+
+    def save(self, job: ConversionJob) -> None:
+        if job.stage == "start" and self.failures:
+            self.failures -= 1
+            raise ConnectionError("redis down")
+        super().save(job)
+
+
+def new_job(job_id: str) -> ConversionJob:
+    now = dt.datetime.now(dt.timezone.utc)
+    return ConversionJob(
+        id=job_id, client="tenant", save_mode="upsert", created_at=now, updated_at=now
+    )
+
+
+def wait_for(jobs: MemoryJobQueue, job_id: str, status: str, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if jobs.get(job_id).status == status:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_worker_survives_a_failing_save(monkeypatch):
+    monkeypatch.setattr(
+        jobs_service,
+        "run_tenant_conversion",
+        lambda tenant, **kwargs: TenantSummary(client=tenant, rows=3),
+    )
+    jobs = FlakyJobQueue()
+    runner = JobRunner(jobs=jobs, workers=1)
+    runner.start()
+    try:
+        jobs.enqueue(new_job("broken"))
+        assert wait_for(jobs, "broken", "failed")
+        assert jobs.get("broken").error == "redis down"
+
+        ## El mismo trabajador sigue consumiendo la cola
+        jobs.enqueue(new_job("next"))
+        assert wait_for(jobs, "next", "done")
+        assert jobs.get("next").rows_processed == 3
+    finally:
+        runner.stop()
@@ -0,0 +1,218 @@
+# Standard Library
+import asyncio
+import datetime as dt
+import threading
+
+# External
+import polars as pl
+import pytest
+
+# Project
+import app.services.partition as partition_service
+from app.routers.conversion import conversion_response
+from app.schemas import ConversionRequest, SaveSummary, conversion_schema, init_params_schema
+from app.services import ConversionResult
+from app.utilities import CatalogEntry, MemoryLeaseStore
+
+
+CHANGED_AT = dt.datetime(2026, 1, 1)
+BREEDINGS = [1, 2, 3, 4]
+
+
+def test_lease_acquire_renew_release():
+    leases = MemoryLeaseStore(ttl=60)
+    assert leases.acquire("t1:0", "a")
+    assert not leases.acquire("t1:0", "b")
+    ## El mismo dueño puede volver a tomarlo
+    assert leases.acquire("t1:0", "a")
+
+    assert not leases.renew("t1:0", "b")
+    assert leases.renew("t1:0", "a")
+    assert leases.holders("t1:") == {"t1:0": "a"}
+
+    assert not leases.release("t1:0", "b")
+    assert leases.release("t1:0", "a")
+    assert not leases.renew("t1:0", "a")
+    assert leases.acquire("t1:0", "b")
+
+
+def test_expired_lease_can_be_taken_over():
+    leases = MemoryLeaseStore(ttl=0)
+    assert leases.acquire("t1:0", "a")
+    assert leases.holders() == {}
+    assert not leases.renew("t1:0", "a")
+    assert leases.acquire("t1:0", "b")
+
+
+def test_complete_records_token_and_releases():
+    leases = MemoryLeaseStore(ttl=60)
+    leases.acquire("t1:0", "a")
+    assert leases.complete("t1:0", "a", "token")
+    assert leases.completed("t1:0") == "token"
+    assert leases.completed("t1:1") is None
+    assert leases.acquire("t1:0", "b")
+
+
+@pytest.fixture
+def shards(monkeypatch) -> dict:
+    ## Catalogo y calculo en memoria; se registran los shards calculados
+    init_df = pl.DataFrame(
+        [
+            {
+                "idta": id_breeding,
+                "parent_id": 1,
+                "breeding_code": f"B{id_breeding}",
+                "geneticaPredominante": "ROSS - 2020",
+                "sex": "Mixto",
+                "id_breeding": id_breeding,
+                "id_stage": 1,
+            }
+            for id_breeding in BREEDINGS
+        ],
+        schema=init_params_schema,
+    )
+    catalog = CatalogEntry(frame=init_df, watermark=CHANGED_AT, loaded_at=0.0, checked_at=0.0)
+    state = {"computed": [], "changes": {i: CHANGED_AT for i in BREEDINGS}}
+
+    def compute(session, tenant, save_mode="upsert", scope=None, **kwargs) -> ConversionResult:
+        state["computed"].append(scope.id_breeding)
+        return ConversionResult(
+            data=pl.DataFrame(schema=conversion_schema),
+            saved=SaveSummary(mode=save_mode, written=len(scope.id_breeding)),
+        )
+
+    async def aio_compute(*args, **kwargs) -> ConversionResult:
+        return compute(*args, **kwargs)
+
+    async def aio_changes(session, id_breeding_list) -> dict:
+        return {i: state["changes"][i] for i in id_breeding_list}
+
+    async def aio_catalog(*args, **kwargs) -> CatalogEntry:
+        return catalog
+
+    monkeypatch.setattr(partition_service, "get_breeding_catalog", lambda *a, **k: catalog)
+    monkeypatch.setattr(partition_service, "aio_get_breeding_catalog", aio_catalog)
+    monkeypatch.setattr(
+        partition_service,
+        "get_breeding_changes",
+        lambda session, ids: {i: state["changes"][i] for i in ids},
+    )
+    monkeypatch.setattr(partition_service, "aio_get_breeding_changes", aio_changes)
+    monkeypatch.setattr(partition_service, "compute_conversion", compute)
+    monkeypatch.setattr(partition_service, "aio_compute_conversion", aio_compute)
+    monkeypatch.setattr(partition_service, "SHARD_POLL_SECONDS", 0.05)
+    return state
+
+
+def run_partitioned(leases: MemoryLeaseStore, **kwargs) -> ConversionResult:
+    return partition_service.get_partitioned_conversion(
+        None, "t1", shards=1, leases=leases, **{"wait": 0, **kwargs}
+    )
+
+
+def test_completed_shard_is_skipped_until_full_rebuild_or_new_save_mode(shards):
+    leases = MemoryLeaseStore(ttl=60)
+    first = run_partitioned(leases)
+    assert (first.claimed, first.skipped, first.pending) == ([0], [], [])
+
+    ## Mismos datos y modo: el token coincide y el shard no se repite
+    again = run_partitioned(leases)
+    assert (again.claimed, again.skipped) == ([], [0])
+    assert len(shards["computed"]) == 1
+
+    rebuild = run_partitioned(leases, full_rebuild=True)
+    assert rebuild.claimed == [0]
+
+    diff = run_partitioned(leases, save_mode="diff")
+    assert diff.claimed == [0]
+    assert run_partitioned(leases, save_mode="diff").skipped == [0]
+
+    ## Datos nuevos en una crianza cambian el token
+    shards["changes"][2] = CHANGED_AT + dt.timedelta(hours=1)
+    assert run_partitioned(leases, save_mode="diff").claimed == [0]
+    assert len(shards["computed"]) == 4
+
+
+def test_shard_token_depends_on_save_mode_and_changes(shards):
+    catalog = partition_service.get_breeding_catalog(None, "t1")
+    scope = partition_service.shard_scope(None, BREEDINGS)
+    changes = dict(shards["changes"])
+    token = partition_service.shard_token(catalog, changes, "polars", scope, "upsert")
+
+    assert partition_service.shard_token(catalog, changes, "polars", scope, "upsert") == token
+    assert partition_service.shard_token(catalog, changes, "polars", scope, "diff") != token
+    assert partition_service.shard_token(catalog, changes, "sql", scope, "upsert") != token
+    changes[1] = CHANGED_AT + dt.timedelta(seconds=1)
+    assert partition_service.shard_token(catalog, changes, "polars", scope, "upsert") != token
+
+
+def test_held_shard_is_reported_pending_with_202(shards):
+    leases = MemoryLeaseStore(ttl=60)
+    leases.acquire("t1:0", "other")
+    result = run_partitioned(leases)
+
+    assert (result.claimed, result.skipped, result.pending) == ([], [], [0])
+    assert shards["computed"] == []
+    response = conversion_response(ConversionRequest(client="t1"), result, None, 1.0)
+    assert response.status_code == 202
+    assert response.headers["X-Shards-Pending"] == "0"
+
+    leases.release("t1:0", "other")
+    response = conversion_response(
+        ConversionRequest(client="t1"), run_partitioned(leases), None, 1.0
+    )
+    assert response.status_code == 200
+    assert response.headers["X-Shards-Pending"] == ""
+
+
+@pytest.mark.parametrize("finished", [True, False])
+def test_held_shard_is_waited_for(shards, finished):
+    leases = MemoryLeaseStore(ttl=60)
+    leases.acquire("t1:0", "other")
+    catalog = partition_service.get_breeding_catalog(None, "t1")
+    token = partition_service.shard_token(
+        catalog,
+        shards["changes"],
+        "polars",
+        partition_service.shard_scope(None, BREEDINGS),
+        "upsert",
+    )
+
+    def other_worker() -> None:
+        ## La otra replica termina el shard (mismo token) o lo suelta sin terminar
+        if finished:
+            leases.complete("t1:0", "other", token)
+        else:
+            leases.release("t1:0", "other")
+
+    timer = threading.Timer(0.2, other_worker)
+    timer.start()
+    result = run_partitioned(leases, engine="polars", wait=5)
+    timer.join()
+
+    assert result.pending == []
+    if finished:
+        assert (result.claimed, result.skipped) == ([], [0])
+        assert shards["computed"] == []
+    else:
+        assert (result.claimed, result.skipped) == ([0], [])
+        assert shards["computed"] == [BREEDINGS]
+
+
+def test_aio_held_shard_is_waited_for_then_reported_pending(shards):
+    leases = MemoryLeaseStore(ttl=60)
+    leases.acquire("t1:0", "other")
+
+    async def scenario() -> tuple[ConversionResult, ConversionResult]:
+        pending = await partition_service.aio_get_partitioned_conversion(
+            None, "t1", shards=1, leases=leases, wait=0.2
+        )
+        asyncio.get_running_loop().call_later(0.1, leases.release, "t1:0", "other")
+        claimed = await partition_service.aio_get_partitioned_conversion(
+            None, "t1", shards=1, leases=leases, wait=5
+        )
+        return pending, claimed
+
+    pending, claimed = asyncio.run(scenario())
+    assert pending.pending == [0] and pending.claimed == []
+    assert claimed.pending == [] and claimed.claimed == [0]
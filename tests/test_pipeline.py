@@ -0,0 +1,200 @@
+# Standard Library
+import asyncio
+import contextlib
+import datetime as dt
+import threading
+import time
+
+# External
+import polars as pl
+import pytest
+
+# Project
+import app.services.conversion as conversion_service
+from app.schemas import SaveSummary, init_params_schema, weight_consumption_schema
+from app.utilities import CatalogEntry, MemoryWatermarkStore, aio_run_pipeline, run_pipeline
+
+
+ITEMS = 20
+START = dt.datetime(2026, 1, 1)
+
+
+def counted(items: int, seen: list[int]):
+    for item in range(items):
+        seen.append(item)
+        yield item
+
+
+def wait_stable(values: list, settle: float = 0.3) -> int:
+    ## Espera a que la etapa productora deje de avanzar
+    size = -1
+    while size != len(values):
+        size = len(values)
+        time.sleep(settle)
+    return size
+
+
+def test_pipeline_bounds_items_in_flight():
+    seen, results, release = [], [], threading.Event()
+
+    def save(item: int) -> int:
+        release.wait(5)
+        return item
+
+    stages = [("extract", lambda item: item), ("transform", lambda item: item), ("save", save)]
+    worker = threading.Thread(
+        target=lambda: results.extend(run_pipeline(counted(ITEMS, seen), stages, depths=[1, 1]))
+    )
+    worker.start()
+    ## Uno en save, uno por cola y uno retenido por cada etapa anterior esperando lugar
+    assert wait_stable(seen) <= 5
+    release.set()
+    worker.join(5)
+    assert results == list(range(ITEMS))
+
+
+def test_pipeline_stops_every_stage_on_the_first_error():
+    seen, saved = [], []
+
+    def transform(item: int) -> int:
+        if item == 3:
+            raise ValueError("bad chunk")
+        return item
+
+    with pytest.raises(ValueError, match="bad chunk"):
+        run_pipeline(
+            counted(ITEMS, seen),
+            [("extract", lambda item: item), ("transform", transform), ("save", saved.append)],
+            depths=[1, 1],
+        )
+    assert len(seen) < ITEMS
+    ## Lo ya encolado puede guardarse o no; nada desde el bloque fallido en adelante
+    assert saved == list(range(len(saved))) and len(saved) <= 3
+
+
+def test_aio_pipeline_bounds_items_and_cancels_on_error():
+    async def scenario() -> tuple[int, list[int], list[int]]:
+        seen, saved, release = [], [], asyncio.Event()
+
+        async def identity(item: int) -> int:
+            return item
+
+        async def save(item: int) -> int:
+            await release.wait()
+            saved.append(item)
+            return item
+
+        stages = [("extract", identity), ("transform", identity), ("save", save)]
+        run = asyncio.create_task(aio_run_pipeline(counted(ITEMS, seen), stages, depths=[1, 1]))
+        await asyncio.sleep(0.1)
+        in_flight = len(seen)
+        release.set()
+        assert await run == list(range(ITEMS))
+
+        async def transform(item: int) -> int:
+            if item == 3:
+                raise ValueError("bad chunk")
+            return item
+
+        seen.clear()
+        with pytest.raises(ValueError, match="bad chunk"):
+            await aio_run_pipeline(
+                counted(ITEMS, seen),
+                [("extract", identity), ("transform", transform), ("save", identity)],
+                depths=[1, 1],
+            )
+        return in_flight, seen, saved
+
+    in_flight, seen, saved = asyncio.run(scenario())
+    assert in_flight <= 5
+    assert len(seen) < ITEMS
+    assert saved == list(range(ITEMS))
+
+
+@pytest.fixture
+def pipelined(monkeypatch):
+    ## compute_conversion por la via de bloques, con extraccion y guardado en memoria
+    init_df = pl.DataFrame(
+        [
+            {
+                "idta": id_breeding,
+                "parent_id": 1,
+                "breeding_code": f"B{id_breeding}",
+                "geneticaPredominante": "ROSS - 2020",
+                "sex": "Mixto",
+                "id_breeding": id_breeding,
+                "id_stage": 1,
+            }
+            for id_breeding in (1, 2)
+        ],
+        schema=init_params_schema,
+    )
+    state = {"fail": None, "saved": [], "watermarks": MemoryWatermarkStore()}
+
+    def weights(session, id_breeding_list, changes=None) -> pl.DataFrame:
+        if id_breeding_list == state["fail"]:
+            raise ConnectionError("connection lost")
+        return pl.DataFrame(
+            [
+                {
+                    "measured_weight": 0.04 + 0.06 * day,
+                    "animals_age": day + 1,
+                    "date": START + dt.timedelta(days=day),
+                    "entity_accumulated_consumption": 90.0 * day,
+                    "animal_accumulated_consumption": 0.1 * day,
+                    "stock": 1000 - day,
+                    "initial_weight_avg": 0.04,
+                    "initial_age": 0,
+                    "initial_total_quantity": 1000,
+                    "id_breeding": id_breeding,
+                    "changed_at": START,
+                }
+                for id_breeding in id_breeding_list
+                for day in range(3)
+            ],
+            schema=weight_consumption_schema,
+        )
+
+    def save(session, data: pl.DataFrame, mode: str) -> SaveSummary:
+        state["saved"].append(data.height)
+        return SaveSummary(mode=mode, written=data.height)
+
+    catalog = CatalogEntry(frame=init_df, watermark=START, loaded_at=0.0, checked_at=0.0)
+    monkeypatch.setattr(conversion_service, "WATERMARKS", state["watermarks"])
+    monkeypatch.setattr(conversion_service, "get_breeding_catalog", lambda *args: catalog)
+    monkeypatch.setattr(
+        conversion_service, "get_breeding_changes", lambda *args: {1: START, 2: START}
+    )
+    monkeypatch.setattr(conversion_service, "needs_row_counts", lambda *args: False)
+    monkeypatch.setattr(conversion_service, "pipeline_chunks", lambda ids: [[i] for i in ids])
+    monkeypatch.setattr(conversion_service, "get_session", lambda tenant: contextlib.nullcontext())
+    monkeypatch.setattr(conversion_service, "get_weights_consumptions", weights)
+    monkeypatch.setattr(conversion_service, "save_conversion", save)
+    return state
+
+
+def test_pipelined_conversion_returns_rows_unless_summary_only(pipelined):
+    result = conversion_service.compute_conversion(None, "t1", engine="polars")
+    assert not result.summary_only
+    assert result.rows == result.data.height == sum(pipelined["saved"]) == 6
+    assert sorted(result.data["id_breeding"].unique().to_list()) == [1, 2]
+
+    summary = conversion_service.compute_conversion(
+        None, "t1", full_rebuild=True, engine="polars", summary_only=True
+    )
+    assert summary.summary_only and summary.data.is_empty()
+    assert summary.rows == 6
+
+
+def test_pipelined_error_keeps_watermarks(pipelined):
+    pipelined["fail"] = [2]
+    with pytest.raises(ConnectionError):
+        conversion_service.compute_conversion(None, "t1", engine="polars")
+    assert pipelined["watermarks"].get("t1", conversion_service.watermark_generation()) == {}
+
+    pipelined["fail"] = None
+    conversion_service.compute_conversion(None, "t1", engine="polars")
+    assert pipelined["watermarks"].get("t1", conversion_service.watermark_generation()) == {
+        1: START,
+        2: START,
+    }
@@ -0,0 +1,173 @@
+# Standard Library
+import asyncio
+import datetime as dt
+import json
+from pathlib import Path
+
+# External
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+# Project
+import app.services.conversion as conversion_service
+from app.routers.conversion import conversion_response
+from app.schemas import (
+    ConversionRequest,
+    SaveSummary,
+    conversion_schema,
+    init_params_schema,
+    weight_consumption_schema,
+)
+from app.utilities import scan_spill, spill_folder
+from app.utilities.spill import spill_path
+
+
+START = dt.datetime(2026, 1, 1)
+BREEDINGS = [1, 2, 3]
+PARTITIONS = [[1, 2], [3]]
+
+
+def weights_frame(id_breeding_list: list[int]) -> pl.DataFrame:
+    return pl.DataFrame(
+        [
+            {
+                "measured_weight": 0.04 + 0.06 * day,
+                "animals_age": day + 1,
+                "date": START + dt.timedelta(days=day),
+                "entity_accumulated_consumption": 90.0 * day,
+                "animal_accumulated_consumption": 0.1 * day,
+                "stock": None if day == 1 else 1000 - day,
+                "initial_weight_avg": 0.04,
+                "initial_age": 0,
+                "initial_total_quantity": 1000,
+                "id_breeding": id_breeding,
+                "changed_at": START,
+            }
+            for id_breeding in id_breeding_list
+            for day in range(4)
+        ],
+        schema=weight_consumption_schema,
+    )
+
+
+def init_frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        [
+            {
+                "idta": id_breeding,
+                "parent_id": 1,
+                "breeding_code": f"B{id_breeding}",
+                "geneticaPredominante": "ROSS - 2020",
+                "sex": "Mixto",
+                "id_breeding": id_breeding,
+                "id_stage": 1,
+            }
+            for id_breeding in BREEDINGS
+        ],
+        schema=init_params_schema,
+    )
+
+
+@pytest.fixture
+def spill(monkeypatch, tmp_path):
+    ## Rangos en bloques de 3 filas bajo tmp_path; se registra lo escrito y lo guardado
+    state = {"fail": None, "files": [], "saved": []}
+
+    def write_blocks(session, id_breeding_list, folder: Path, changes=None) -> int:
+        frame = weights_frame(id_breeding_list)
+        for position, block in enumerate(frame.iter_slices(n_rows=3)):
+            block.write_parquet(spill_path(folder, position))
+        state["files"].append(len(list(folder.glob("*.parquet"))))
+        if state["fail"] == "extract":
+            raise ConnectionError("cursor closed")
+        return frame.height
+
+    async def aio_write_blocks(session, id_breeding_list, folder: Path, changes=None) -> int:
+        return write_blocks(session, id_breeding_list, folder, changes)
+
+    def save(session, data: pl.DataFrame, mode: str) -> SaveSummary:
+        if state["fail"] == "save":
+            raise ConnectionError("connection lost")
+        state["saved"].append(data)
+        return SaveSummary(mode=mode, written=data.height)
+
+    async def aio_save(session, data: pl.DataFrame, mode: str) -> SaveSummary:
+        return save(session, data, mode)
+
+    monkeypatch.setattr(
+        conversion_service, "spill_folder", lambda tenant: spill_folder(tenant, root=tmp_path)
+    )
+    monkeypatch.setattr(conversion_service, "spill_weights_consumptions", write_blocks)
+    monkeypatch.setattr(conversion_service, "aio_spill_weights_consumptions", aio_write_blocks)
+    monkeypatch.setattr(conversion_service, "save_conversion", save)
+    monkeypatch.setattr(conversion_service, "aio_save_conversion", aio_save)
+    return state
+
+
+def compute_spilled() -> conversion_service.ConversionResult:
+    return conversion_service.compute_spilled(
+        None, "t1", PARTITIONS, init_frame(), {}, {}, "upsert", None, lambda stage, rows: None
+    )
+
+
+def test_scan_spill_reads_every_block(tmp_path):
+    frame = weights_frame(BREEDINGS)
+    for position, block in enumerate(frame.iter_slices(n_rows=5)):
+        block.write_parquet(spill_path(tmp_path, position))
+    assert_frame_equal(scan_spill(tmp_path).collect(), frame)
+
+
+def test_spilled_conversion_matches_in_memory(spill, tmp_path):
+    expected = conversion_service.transform_conversion(weights_frame(BREEDINGS), init_frame())
+    result = compute_spilled()
+
+    assert spill["files"] == [3, 2]
+    assert result.out_of_core and result.summary_only and result.data.is_empty()
+    assert result.rows == result.saved.written == expected.height
+    assert_frame_equal(pl.concat(spill["saved"]), expected, check_row_order=False, check_exact=True)
+    assert list(tmp_path.iterdir()) == []
+
+    spill["saved"].clear()
+    aio_result = asyncio.run(
+        conversion_service.aio_compute_spilled(
+            None, "t1", PARTITIONS, init_frame(), {}, {}, "upsert", None
+        )
+    )
+    assert aio_result.out_of_core and aio_result.rows == expected.height
+    assert_frame_equal(pl.concat(spill["saved"]), expected, check_row_order=False, check_exact=True)
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("fail", ["extract", "transform", "save"])
+def test_spill_files_are_removed_on_error(spill, tmp_path, monkeypatch, fail):
+    spill["fail"] = fail
+    if fail == "transform":
+
+        def broken_transform(*args, **kwargs):
+            raise ValueError("bad partition")
+
+        monkeypatch.setattr(conversion_service, "transform_conversion", broken_transform)
+    with pytest.raises((ConnectionError, ValueError)):
+        compute_spilled()
+    assert spill["files"] == [3]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_out_of_core_response_is_an_explicit_summary():
+    result = conversion_service.ConversionResult(
+        data=pl.DataFrame(schema=conversion_schema),
+        saved=SaveSummary(mode="upsert", written=6),
+        rows=6,
+        summary_only=True,
+        out_of_core=True,
+    )
+    ## Aunque se pidan filas en NDJSON, la respuesta es el resumen en JSON
+    response = conversion_response(
+        ConversionRequest(client="t1"), result, "application/x-ndjson", 1.0
+    )
+    body = json.loads(response.body)
+
+    assert response.media_type == "application/json"
+    assert response.headers["X-Out-Of-Core"] == "true"
+    assert body["out_of_core"] and body["rows"] == 6
@@ -0,0 +1,56 @@
+# Standard Library
+import datetime as dt
+import shutil
+
+# Project
+import app.utilities.watermarks as watermarks_module
+from app.services.conversion import get_changed_breedings
+from app.utilities import MemoryWatermarkStore, StandardStore, watermark_generation
+from app.utilities.standards import STANDARD_FILES, STANDARD_FOLDER
+
+
+CHANGED_AT = dt.datetime(2026, 1, 1)
+
+
+def test_watermarks_are_scoped_to_their_generation():
+    store = MemoryWatermarkStore()
+    store.update("t1", "v1", {1: CHANGED_AT, 2: CHANGED_AT})
+
+    assert store.get("t1", "v1") == {1: CHANGED_AT, 2: CHANGED_AT}
+    assert store.get("t1", "v2") == {}
+    assert store.get("t2", "v1") == {}
+
+    ## Escribir en otra generacion descarta las marcas anteriores
+    store.update("t1", "v2", {1: CHANGED_AT}, active=[1, 2])
+    assert store.get("t1", "v1") == {}
+    assert store.get("t1", "v2") == {1: CHANGED_AT}
+
+    store.update("t1", "v2", {}, active=[2])
+    assert store.get("t1", "v2") == {}
+
+
+def test_standard_or_version_change_recomputes_every_breeding(tmp_path, monkeypatch):
+    for name in STANDARD_FILES.values():
+        shutil.copy(STANDARD_FOLDER / name, tmp_path / name)
+    monkeypatch.setattr(watermarks_module, "STANDARDS", StandardStore(folder=tmp_path))
+    store, breedings, changes = MemoryWatermarkStore(), [1, 2, 3], {1: CHANGED_AT, 2: CHANGED_AT}
+
+    generation = watermark_generation()
+    store.update("t1", generation, changes, active=breedings)
+    assert get_changed_breedings(breedings, changes, store.get("t1", watermark_generation())) == [3]
+
+    ## Estandar editado: sin cambios en los datos, todas las crianzas se recalculan
+    standard_csv = tmp_path / STANDARD_FILES[1]
+    standard_csv.write_text(standard_csv.read_text() + "\n")
+    assert watermark_generation() != generation
+    assert (
+        get_changed_breedings(breedings, changes, store.get("t1", watermark_generation()))
+        == breedings
+    )
+
+    store.update("t1", watermark_generation(), changes, active=breedings)
+    monkeypatch.setattr(watermarks_module, "VERSION", "next")
+    assert (
+        get_changed_breedings(breedings, changes, store.get("t1", watermark_generation()))
+        == breedings
+    )